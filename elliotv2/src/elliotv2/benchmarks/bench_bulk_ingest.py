@@ -0,0 +1,69 @@
+"""
+Benchmark Association Cortex bulk ingestion.
+
+Imports a random graph with add_nodes_bulk/add_relationships_bulk and reports
+nodes/s and edges/s, then times a sample of per-item add_relationship calls
+(each with its own log write) for comparison.
+
+Run from src/elliotv2:
+    python -m benchmarks.bench_bulk_ingest --edges 1000000
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import contextlib
+
+from utils.logger import ErrorLogger
+from brain_regions.association_cortex import AssociationCortex
+
+
+def random_edges(num_nodes, num_edges, seed=0):
+    rng = random.Random(seed)
+    return [(f"node_{rng.randrange(num_nodes)}", f"node_{rng.randrange(num_nodes)}") for _ in range(num_edges)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=200000)
+    parser.add_argument("--edges", type=int, default=1000000)
+    parser.add_argument("--backend", choices=["networkx", "csr"], default="networkx")
+    parser.add_argument("--store", action="store_true", help="Persist to a temporary SQLite graph store")
+    parser.add_argument("--single-samples", type=int, default=10000)
+    args = parser.parse_args()
+
+    edges = random_edges(args.nodes, args.edges)
+    with tempfile.TemporaryDirectory() as tmp:
+        logger = ErrorLogger(os.path.join(tmp, "logs", "bench_log.txt"))
+        config = {"graph_backend": args.backend}
+        if args.store:
+            config["graph_db"] = os.path.join(tmp, "graph.db")
+
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            cortex = AssociationCortex(logger=logger, **config)
+            nodes = cortex.add_nodes_bulk((f"node_{i}", {"index": i}) for i in range(args.nodes))
+            relationships = cortex.add_relationships_bulk(edges)
+            cortex.flush_graph()
+        print(f"bulk nodes:  {nodes['added']} added in {nodes['seconds']:.2f}s "
+              f"({nodes['added'] / max(nodes['seconds'], 1e-9):,.0f} nodes/s)")
+        print(f"bulk edges:  {relationships['added']} added, {relationships['skipped']} duplicates skipped "
+              f"in {relationships['seconds']:.2f}s ({args.edges / max(relationships['seconds'], 1e-9):,.0f} edges/s)")
+
+        samples = random_edges(args.nodes, args.single_samples, seed=1)
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            if args.store:
+                config["graph_db"] = os.path.join(tmp, "graph_single.db")
+            cortex = AssociationCortex(logger=logger, **config)
+            start = time.perf_counter()
+            for node1, node2 in samples:
+                cortex.add_relationship(node1, node2)
+            cortex.flush_graph()
+            single_time = time.perf_counter() - start
+        print(f"per-item:    {args.single_samples} add_relationship calls in {single_time:.2f}s "
+              f"({args.single_samples / single_time:,.0f} edges/s)")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+"""
+Benchmark Association Cortex persistence.
+
+Writes a random graph into a GraphStore, then measures a bulk load into a
+networkx graph and lazy single-node loads.
+
+Run from src/elliotv2:
+    python -m benchmarks.bench_graph_store --edges 1000000
+"""
+import os
+import time
+import random
+import argparse
+import tempfile
+import datetime
+
+import networkx as nx
+
+from utils.graph_store import GraphStore
+
+
+def build_store(path, num_nodes, num_edges, seed=0):
+    rng = random.Random(seed)
+    store = GraphStore(path, batch_size=100000)
+    timestamp = datetime.datetime.now().isoformat()
+    start = time.perf_counter()
+    store.put_nodes((f"node_{i}", {"timestamp": timestamp}) for i in range(num_nodes))
+    written = 0
+    while written < num_edges:
+        batch = min(100000, num_edges - written)
+        store.put_edges(
+            (f"node_{rng.randrange(num_nodes)}", f"node_{rng.randrange(num_nodes)}",
+             {"relationship": "related", "timestamp": timestamp})
+            for _ in range(batch)
+        )
+        written += batch
+    store.flush()
+    return store, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=200000)
+    parser.add_argument("--edges", type=int, default=1000000)
+    parser.add_argument("--lazy-samples", type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "graph.db")
+        store, write_time = build_store(path, args.nodes, args.edges)
+        counts = store.counts()
+        print(f"write:      {counts['nodes']} nodes, {counts['edges']} edges in {write_time:.2f}s "
+              f"({counts['edges'] / write_time:,.0f} edges/s)")
+
+        start = time.perf_counter()
+        graph = store.load_into(nx.Graph())
+        load_time = time.perf_counter() - start
+        print(f"bulk load:  {graph.number_of_nodes()} nodes, {graph.number_of_edges()} edges in {load_time:.2f}s "
+              f"({graph.number_of_edges() / load_time:,.0f} edges/s)")
+
+        rng = random.Random(1)
+        start = time.perf_counter()
+        for _ in range(args.lazy_samples):
+            store.load_node(f"node_{rng.randrange(args.nodes)}")
+        lazy_time = time.perf_counter() - start
+        print(f"lazy load:  {lazy_time / args.lazy_samples * 1e6:.0f} us per node (with incident edges)")
+
+        start = time.perf_counter()
+        store.snapshot(os.path.join(tmp, "snapshot.db"))
+        print(f"snapshot:   {time.perf_counter() - start:.2f}s, "
+              f"{os.path.getsize(os.path.join(tmp, 'snapshot.db')) / 1e6:.1f} MB")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Benchmark ErrorLogger call overhead.
+
+Times log_info calls on the queued logger (including the final flush) against
+the synchronous open/append/print path each call used to take.
+
+Run from src/elliotv2:
+    python -m benchmarks.bench_logger --records 200000
+"""
+import os
+import time
+import argparse
+import tempfile
+import contextlib
+
+from utils.logger import ErrorLogger
+
+
+def write_log_sync(log_file, log_entry):
+    """The pre-queue logging path: open, append and echo on every call."""
+    with open(log_file, "a", encoding="utf-8") as file:
+        file.write(log_entry)
+    print(log_entry.strip())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--records", type=int, default=200000)
+    parser.add_argument("--sync-records", type=int, default=20000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp, open(os.devnull, "w") as devnull:
+        logger = ErrorLogger(os.path.join(tmp, "logs", "bench_log.txt"), console_level=None)
+        start = time.perf_counter()
+        for i in range(args.records):
+            logger.log_info("Association Cortex", f"Added node: node_{i} with data: None")
+        enqueued = time.perf_counter() - start
+        logger.close()
+        total = time.perf_counter() - start
+        print(f"queued:  {args.records} records, {enqueued / args.records * 1e6:.2f} us/call in the caller, "
+              f"{total:.2f}s including the final flush")
+
+        sync_file = os.path.join(tmp, "logs", "sync_log.txt")
+        with contextlib.redirect_stdout(devnull):
+            start = time.perf_counter()
+            for i in range(args.sync_records):
+                write_log_sync(sync_file, f"INFO in Association Cortex: Added node: node_{i} with data: None\n")
+            sync = time.perf_counter() - start
+        print(f"sync:    {args.sync_records} records, {sync / args.sync_records * 1e6:.2f} us/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark Orchestrator startup.
+
+Each measurement runs in a fresh interpreter inside a scratch directory (with a
+copy of config/, so databases and logs don't touch the working tree): the time
+to import main, construct the Orchestrator and initialize the agents, with lazy
+regions and with every region built up front, plus the first routed call. Then
+prints a `python -X importtime` breakdown of `import main`.
+
+Run from src/elliotv2:
+    python -m benchmarks.bench_startup --runs 5 --top 15
+"""
+import os
+import sys
+import json
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+SRC = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import sys, time, json
+sys.path.insert(0, {src!r})
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+orchestrator = main.Orchestrator()
+orchestrator.config.setdefault("orchestrator", {{}}).setdefault("metrics", {{}})["export_file"] = None
+constructed = time.perf_counter()
+orchestrator.initialize_agents(lazy={lazy})
+initialized = time.perf_counter()
+orchestrator.route_task("Declarative Memory", "retrieve", "bench-key")
+first_call = time.perf_counter()
+orchestrator.logger.close()
+print(json.dumps({{
+    "import": imported - start, "construct": constructed - imported,
+    "initialize": initialized - constructed, "first_call": first_call - initialized,
+    "total": initialized - start, "regions": sorted(orchestrator.regions),
+}}))
+"""
+
+
+def run_child(workdir, lazy):
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD.format(src=SRC, lazy=lazy)],
+        cwd=workdir, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def import_breakdown(workdir, top):
+    """(cumulative us, self us, module) for the slowest imports under `import main`, plus per-package self time."""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import sys; sys.path.insert(0, {SRC!r}); import main"],
+        cwd=workdir, capture_output=True, text=True, check=True,
+    ).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = (part.strip() for part in line[len("import time:"):].split("|"))
+        rows.append((int(cumulative_us), int(self_us), module))
+    packages = {}
+    for _, self_us, module in rows:
+        package = module.strip().split(".")[0]
+        packages[package] = packages.get(package, 0) + self_us
+    rows.sort(reverse=True)
+    return rows[:top], sorted(packages.items(), key=lambda item: -item[1])[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        shutil.copytree(os.path.join(SRC, "config"), os.path.join(workdir, "config"))
+        for lazy in (True, False):
+            runs = [run_child(workdir, lazy) for _ in range(args.runs)]
+            best = {key: min(run[key] for run in runs) for key in ("import", "construct", "initialize", "first_call", "total")}
+            print(f"{'lazy' if lazy else 'eager'} regions (best of {args.runs}): "
+                  + ", ".join(f"{key} {value * 1000:.1f}ms" for key, value in best.items())
+                  + f"; regions built after the first call: {', '.join(runs[0]['regions'])}")
+
+        modules, packages = import_breakdown(workdir, args.top)
+        print("\nslowest imports under `import main` (cumulative / self):")
+        for cumulative_us, self_us, module in modules:
+            print(f"{cumulative_us / 1000:>9.1f}ms {self_us / 1000:>8.1f}ms  {module}")
+        print("\nself time by top-level package:")
+        for package, self_us in packages:
+            print(f"{self_us / 1000:>9.1f}ms  {package}")
+
+
+if __name__ == "__main__":
+    main()
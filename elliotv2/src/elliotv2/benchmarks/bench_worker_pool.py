@@ -0,0 +1,92 @@
+"""
+Check and time the bulk region APIs through the worker pool.
+
+Runs each bulk call once in-process and once through a worker pool (each
+Orchestrator in its own scratch directory with a copy of config/), checks that
+both return the same result, so arguments and results survive the pipe with
+their types intact, then times the pooled calls.
+
+Run from src/elliotv2:
+    python -m benchmarks.bench_worker_pool --items 10000 --workers 2
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+SRC = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SRC)
+
+
+def bulk_calls(items):
+    """(agent name, method, args) for every bulk API, in dependency order."""
+    nodes = [(f"n{i}", {"value": i}) for i in range(items)] + [f"bare{i}" for i in range(10)]
+    edges = [(f"n{i}", f"n{i + 1}") for i in range(items - 1)] + [("n0", "n2", "causes"), ("n1", "n3", {"weight": 2})]
+    memories = [(f"k{i}", {"value": i}, {"tags": ["bench"], "importance": i % 10}) for i in range(items)]
+    emotions = [(f"e{i}", i, {"intensity": i % 10}, "happy") for i in range(items)]
+    return [
+        ("Contextual Memory", "add_nodes_bulk", (nodes,)),
+        ("Contextual Memory", "add_relationships_bulk", (edges,)),
+        ("Contextual Memory", "find_related_nodes_many", ([f"n{i}" for i in range(0, items, max(items // 100, 1))], 2)),
+        ("Declarative Memory", "store_many", (memories,)),
+        ("Emotional Memory", "store_emotional_memories", (emotions,)),
+    ]
+
+
+def comparable(result):
+    """Result without its timing fields."""
+    if isinstance(result, dict):
+        return {key: comparable(value) for key, value in result.items() if key != "seconds"}
+    if isinstance(result, list):
+        return [comparable(item) for item in result]
+    return result
+
+
+def run(workdir, calls, pooled, workers):
+    import main
+
+    os.chdir(workdir)
+    orchestrator = main.Orchestrator()
+    orchestrator.config["orchestrator"]["metrics"]["export_file"] = None
+    orchestrator.initialize_agents()
+    if pooled:
+        orchestrator.start_worker_pool(workers)
+    results = []
+    for agent_name, method, args in calls:
+        start = time.perf_counter()
+        result = orchestrator.route_task(agent_name, method, *args)
+        results.append((comparable(result), time.perf_counter() - start))
+    orchestrator.shutdown()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=10000)
+    parser.add_argument("--workers", type=int, default=2)
+    args = parser.parse_args()
+
+    calls = bulk_calls(args.items)
+    failed = 0
+    with tempfile.TemporaryDirectory() as local, tempfile.TemporaryDirectory() as pooled:
+        for workdir in (local, pooled):
+            shutil.copytree(os.path.join(SRC, "config"), os.path.join(workdir, "config"))
+        cwd = os.getcwd()
+        try:
+            expected = run(local, calls, False, args.workers)
+            actual = run(pooled, calls, True, args.workers)
+        finally:
+            os.chdir(cwd)
+    for (agent_name, method, _), (want, local_seconds), (got, pool_seconds) in zip(calls, expected, actual):
+        status = "ok" if got == want else "MISMATCH"
+        failed += status != "ok"
+        print(f"{status:<8} {agent_name}.{method}: in-process {local_seconds * 1000:.1f}ms, pool {pool_seconds * 1000:.1f}ms")
+        if status != "ok":
+            print(f"         in-process: {str(want)[:200]}\n         pool:       {str(got)[:200]}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
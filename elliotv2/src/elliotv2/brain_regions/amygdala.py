@@ -3,6 +3,8 @@ import datetime
 import json
 import os
 
+from utils.metrics import connect_timed
+
 class Amygdala:
     def __init__(self, logger=None, db_file="data/amygdala.db", **kwargs):
         self.logger = logger
@@ -14,7 +16,7 @@ class Amygdala:
 
     def initialize_db(self, db_file):
         os.makedirs(os.path.dirname(db_file), exist_ok=True)
-        self.conn = sqlite3.connect(db_file)
+        self.conn = connect_timed(db_file, "Amygdala", check_same_thread=False)  # Orchestrator.recall calls from pool threads, one at a time per region
 
         query = """
         CREATE TABLE IF NOT EXISTS emotional_memory (
@@ -53,6 +55,34 @@ class Amygdala:
             self.logger.log_error("Amygdala.store_emotional_memory", str(e))
             return f"Error storing emotional memory: {e}"
 
+    def store_emotional_memories(self, memories):
+        """
+        Store many (memory_key, value, metadata, sentiment) memories in one transaction.
+        Returns:
+            dict: Count of stored memories.
+        """
+        try:
+            rows = []
+            for memory_key, value, metadata, sentiment in memories:
+                if not memory_key or not isinstance(memory_key, str):
+                    raise ValueError("Memory key must be a non-empty string.")
+                metadata = metadata or {}
+                metadata.setdefault("priority", "normal")
+                metadata.setdefault("timestamp", datetime.datetime.now().isoformat())
+                metadata.setdefault("tags", [])
+                value_str = json.dumps(value) if not isinstance(value, str) else value
+                rows.append((memory_key, value_str, json.dumps(metadata), sentiment or "neutral"))
+
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO emotional_memory (memory_key, value, metadata, sentiment) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            self.conn.commit()
+            return {"stored": len(rows)}
+        except Exception as e:
+            self.logger.log_error("Amygdala.store_emotional_memories", str(e))
+            return f"Error storing emotional memories: {e}"
+
     def retrieve_emotional_memory(self, memory_key):
         try:
             print(f"Attempting to retrieve memory with key: {memory_key}")  # Debug line
@@ -71,6 +101,24 @@ class Amygdala:
         except Exception as e:
             self.logger.log_error("Amygdala.retrieve_emotional_memory", str(e))
             return f"Error retrieving emotional memory: {e}"
+
+    def retrieve_by_sentiment(self, sentiment, limit=None):
+        """Retrieve memories with the given sentiment (case-insensitive), most intense first."""
+        try:
+            query = "SELECT memory_key, value, metadata, sentiment FROM emotional_memory WHERE LOWER(sentiment) = LOWER(?)"
+            memories = []
+            for memory_key, value_str, metadata_str, row_sentiment in self.conn.execute(query, (sentiment,)):
+                try:
+                    value = json.loads(value_str)
+                except ValueError:
+                    value = value_str
+                metadata = json.loads(metadata_str) if metadata_str else {}
+                memories.append({"memory_key": memory_key, "value": value, "metadata": metadata, "sentiment": row_sentiment})
+            memories.sort(key=lambda memory: memory["metadata"].get("intensity", 0), reverse=True)
+            return memories[:limit] if limit else memories
+        except Exception as e:
+            self.logger.log_error("Amygdala.retrieve_by_sentiment", str(e))
+            return f"Error retrieving emotional memories: {e}"
             
 
     def adjust_priorities(self, orchestrator):
@@ -1,7 +1,16 @@
-import networkx as nx
+import time
 import datetime
 
-import networkx as nx
+from utils.graph_store import GraphStore
+from utils.time_index import TimeIndex, to_epoch
+from utils import path_queries
+from utils.attribute_index import AttributeIndexes, scan
+from utils.graph_analytics import GraphAnalytics
+from utils.neighborhood_cache import NeighborhoodCache
+from utils.graph_embeddings import NodeEmbeddings
+from utils.hotness import HotnessTracker
+from utils.metrics import timed
+from utils.graph_import import batched, paused_gc, read_nodes, read_edges
 
 class AssociationCortex:
     def __init__(self, logger=None, **kwargs):
@@ -17,46 +26,410 @@ class AssociationCortex:
         self.max_retry_limit = kwargs.get("max_retry_limit", 2)
         self.logger = logger
 
-        # Initialize as a networkx graph
-        self.graph = nx.Graph()
+        # Initialize the graph backend: a networkx graph, or the compact CSR engine for large graphs
+        self.backend = kwargs.get("graph_backend", "networkx")
+        if self.backend == "csr":
+            from utils import csr_graph
+            self.graph = csr_graph.CSRGraph(compact_threshold=kwargs.get("csr_compact_threshold", 50000))
+            self.algorithms = csr_graph
+        else:
+            import networkx as nx
+            self.graph = nx.Graph()
+            self.algorithms = nx
+
+        # Bounds applied to path queries unless the caller overrides them
+        self.path_max_depth = kwargs.get("path_max_depth", 6)
+        self.path_max_results = kwargs.get("path_max_results", 100)
+        self.path_timeout = kwargs.get("path_timeout", 5.0)
+
+        # Time indexes so purges look up expired nodes/edges by range instead of scanning the graph.
+        # The CSR backend keeps edge timestamps in a NumPy column, so only networkx needs the edge index.
+        self.node_times = TimeIndex(kwargs.get("purge_bucket_seconds", 3600))
+        self.edge_times = TimeIndex(kwargs.get("purge_bucket_seconds", 3600)) if self.backend != "csr" else None
+
+        # Secondary indexes on node data attributes: hash for equality/membership, sorted for ranges
+        index_config = kwargs.get("attribute_indexes") or {}
+        self.attribute_indexes = AttributeIndexes(index_config.get("hash"), index_config.get("sorted"))
+
+        # Degree counters, union-find components and cached centralities, kept current by the change hooks
+        self.analytics = GraphAnalytics()
+        self.betweenness_samples = kwargs.get("betweenness_samples", 256)  # Default pivot sample for betweenness
+
+        # Multi-hop neighbourhood cache for find_related_nodes, invalidated by per-node edge versions
+        self.neighborhood_cache = NeighborhoodCache(kwargs.get("neighborhood_cache_size", 1024))
+
+        # Structural node embeddings for similar_nodes; fitted on first use, then refreshed around changed nodes
+        self.embeddings = NodeEmbeddings(
+            dim=kwargs.get("embedding_dim", 64),
+            hops=kwargs.get("embedding_hops", 2),
+            full_refresh_ratio=kwargs.get("embedding_full_refresh_ratio", 0.2),
+        )
+
+        # Optional on-disk persistence: "bulk" loads the stored graph now, "lazy" faults nodes in on first touch,
+        # "tiered" also pages the coldest nodes back out to disk to keep the in-memory graph under a memory budget.
+        # In lazy/tiered mode attribute queries, clusters, degree centrality and purges run against the store;
+        # betweenness, pagerank and embeddings need the whole graph in memory and are refused.
+        self.store = None
+        self.load_mode = kwargs.get("graph_load", "bulk")
+        self.loaded_nodes = set()  # Lazy/tiered mode: nodes whose relationships have been read from disk
+        if kwargs.get("graph_db"):
+            self.store = GraphStore(
+                kwargs["graph_db"],
+                batch_size=kwargs.get("graph_commit_batch", 1000),
+                commit_interval=kwargs.get("graph_commit_interval", 1.0),
+            )
+            if self.load_mode == "bulk":
+                self.load_graph()
+        self.paging = self.store is not None and self.load_mode in ("lazy", "tiered")
+        # Where the store purge stopped when its time budget ran out: ("nodes" | "edges", ts-index cursor)
+        self.purge_position = ("nodes", None)
+        self.purge_page_size = kwargs.get("purge_page_size", 512)
+
+        # Tiered mode: estimated footprint per node/edge (indexes included) against graph_memory_budget_mb
+        self.hotness = None
+        self.memory_budget = None
+        if self.load_mode == "tiered":
+            if self.store is None:
+                if self.logger:
+                    self.logger.log_warning("Association Cortex", "Tiered graph mode needs graph_db; keeping everything in memory.")
+            elif kwargs.get("graph_memory_budget_mb"):
+                csr = self.backend == "csr"
+                self.memory_budget = kwargs["graph_memory_budget_mb"] * 1024 * 1024
+                self.node_bytes = kwargs.get("graph_node_bytes", 800 if csr else 900)
+                self.edge_bytes = kwargs.get("graph_edge_bytes", 120 if csr else 700)
+                self.evict_watermark = kwargs.get("graph_evict_watermark", 0.8)  # Page out down to this share of the budget
+                self.hotness = HotnessTracker(kwargs.get("graph_hotness_half_life", 600.0))
+        self.tier_stats = {"faults": 0, "evictions": 0, "evicted_nodes": 0}
 
         if self.verbose:
             print(f"Association Cortex initialized with role: {self.role}")
 
+    # Change Hooks
+    # Every graph mutation is reported here so persistence stays in sync with the in-memory graph.
+
+    def _node_added(self, node_id, data):
+        self._index_node(node_id, data)
+        self.analytics.node_added(node_id)
+        self.embeddings.mark_dirty(node_id)
+        if self.store:
+            self.store.put_node(node_id, data)
+            self.loaded_nodes.add(node_id)
+
+    def _node_updated(self, node_id, old_data, new_data):
+        self._index_node(node_id, new_data)
+        if self.store:
+            self.store.put_node(node_id, new_data)
+
+    def _node_removed(self, node_id, data, neighbors):
+        self.node_times.discard(node_id)
+        self.attribute_indexes.discard(node_id)
+        self.analytics.node_removed(node_id, neighbors)
+        self.neighborhood_cache.node_removed(node_id, neighbors)
+        self.embeddings.mark_dirty(node_id, *neighbors)
+        for neighbor in neighbors:
+            self._unindex_edge(node_id, neighbor)
+        if self.store:
+            self.store.delete_node(node_id)
+            self.loaded_nodes.discard(node_id)
+
+    def _edge_added(self, node1, node2, attrs):
+        self._index_edge(node1, node2, attrs)
+        self.analytics.edge_added(node1, node2)
+        self.neighborhood_cache.touch(node1, node2)
+        self.embeddings.mark_dirty(node1, node2)
+        if self.store:
+            self.store.put_edge(node1, node2, attrs)
+
+    def _edge_updated(self, node1, node2, attrs):
+        self._index_edge(node1, node2, attrs)
+        self.neighborhood_cache.touch(node1, node2)  # A relationship change can alter filtered neighbourhoods
+        if self.store:
+            self.store.put_edge(node1, node2, attrs)
+
+    def _edge_removed(self, node1, node2, attrs):
+        self._unindex_edge(node1, node2)
+        self.analytics.edge_removed(node1, node2)
+        self.neighborhood_cache.touch(node1, node2)
+        self.embeddings.mark_dirty(node1, node2)
+        if self.store:
+            self.store.delete_edge(node1, node2)
+
+    # Indexes
+
+    def _index_node(self, node_id, data):
+        self.attribute_indexes.add(node_id, data)
+        timestamp = to_epoch(data.get("timestamp")) if isinstance(data, dict) else None
+        if timestamp is None:
+            self.node_times.discard(node_id)
+        else:
+            self.node_times.add(node_id, timestamp)
+
+    def _index_edge(self, node1, node2, attrs):
+        if self.edge_times is None:
+            return
+        timestamp = to_epoch(attrs.get("timestamp"))
+        if timestamp is None:
+            self.edge_times.discard(frozenset((node1, node2)))
+        else:
+            self.edge_times.add(frozenset((node1, node2)), timestamp)
+
+    def _unindex_edge(self, node1, node2):
+        if self.edge_times is not None:
+            self.edge_times.discard(frozenset((node1, node2)))
+
+    def rebuild_indexes(self):
+        """Re-index every node's attributes and timestamps, and every edge timestamp (after a bulk load)."""
+        self.node_times.clear()
+        self.attribute_indexes.clear()
+        for node_id, attrs in self.graph.nodes(data=True):
+            self._index_node(node_id, attrs.get("data"))
+        if self.edge_times is not None:
+            self.edge_times.clear()
+            for node1, node2, attrs in self.graph.edges(data=True):
+                self._index_edge(node1, node2, attrs)
+
+    def _expired_edges(self, cutoff):
+        if self.edge_times is None:
+            return self.graph.edges_older_than(cutoff)
+        return [tuple(edge) if len(edge) == 2 else (next(iter(edge)),) * 2 for edge in self.edge_times.expired(cutoff)]
+
+    def _nodes_added(self, items):
+        """Bulk form of _node_added: index every (node_id, data) pair, then persist them in one batch."""
+        for node_id, data in items:
+            self._index_node(node_id, data)
+            self.analytics.node_added(node_id)
+        self.embeddings.invalidate()
+        if self.store and items:
+            self.store.put_nodes(items)
+            self.loaded_nodes.update(node_id for node_id, _ in items)
+
+    def _edges_added(self, items):
+        """Bulk form of _edge_added for (node1, node2, attrs) triples."""
+        if self.edge_times is not None:
+            epochs = {}  # Bulk imports usually share a handful of timestamp strings
+            indexed = []
+            for node1, node2, attrs in items:
+                value = attrs.get("timestamp")
+                if value not in epochs:
+                    epochs[value] = to_epoch(value)
+                if epochs[value] is not None:
+                    indexed.append((frozenset((node1, node2)), epochs[value]))
+            self.edge_times.add_many(indexed)
+        # Rebuilding analytics and cached neighbourhoods on demand is cheaper than updating them per edge
+        self.analytics.invalidate()
+        self.neighborhood_cache.clear()
+        self.embeddings.invalidate()
+        if self.store and items:
+            self.store.put_edges(items)
+
+    def _add_edge(self, node1, node2, **attrs):
+        """Add (or update) an edge, reporting any endpoint nodes the graph creates implicitly."""
+        for node in (node1, node2):
+            if not self.graph.has_node(node):
+                self.graph.add_node(node)
+                self._node_added(node, None)
+        existed = self.graph.has_edge(node1, node2)
+        self.graph.add_edge(node1, node2, **attrs)
+        if existed:
+            self._edge_updated(node1, node2, dict(self.graph[node1][node2]))
+        else:
+            self._edge_added(node1, node2, dict(self.graph[node1][node2]))
+
+    def _remove_node(self, node_id):
+        data = self.graph.nodes[node_id].get("data")
+        neighbors = list(self.graph.neighbors(node_id))
+        self.graph.remove_node(node_id)
+        self._node_removed(node_id, data, neighbors)
+
+    def _remove_edge(self, node1, node2):
+        attrs = dict(self.graph[node1][node2])
+        self.graph.remove_edge(node1, node2)
+        self._edge_removed(node1, node2, attrs)
+
+    # Persistence
+
+    def _fault_in(self, node_id, touch=True):
+        """
+        In lazy/tiered mode, load a stored node and its relationships the first time it is touched.
+        `touch` counts the call as an access for tiering (bulk ingestion doesn't).
+        """
+        if touch and self.hotness is not None:
+            self.hotness.touch(node_id)
+        if not self.paging or node_id in self.loaded_nodes:
+            return
+        stored = self.store.load_node(node_id)
+        if stored is None:
+            return
+        self.tier_stats["faults"] += 1
+        data, edges = stored
+        if not self.graph.has_node(node_id):
+            self.graph.add_node(node_id, data=data)
+            self._index_node(node_id, data)
+            self.analytics.node_added(node_id)
+            self.embeddings.mark_dirty(node_id)
+        for neighbor, attrs in edges:
+            if not self.graph.has_node(neighbor):
+                neighbor_data = self.store.load_node_data(neighbor)
+                self.graph.add_node(neighbor, data=neighbor_data)
+                self._index_node(neighbor, neighbor_data)
+                self.analytics.node_added(neighbor)
+            new_edge = not self.graph.has_edge(node_id, neighbor)
+            self.graph.add_edge(node_id, neighbor, **attrs)
+            self._index_edge(node_id, neighbor, attrs)
+            if new_edge:
+                self.analytics.edge_added(node_id, neighbor)
+                self.neighborhood_cache.touch(node_id, neighbor)
+                self.embeddings.mark_dirty(node_id, neighbor)
+        self.loaded_nodes.add(node_id)
+
+    def _fault_in_neighborhood(self, node_id, depth):
+        """In lazy/tiered mode, load every stored node within `depth` hops of `node_id`."""
+        if not self.paging:
+            return
+        frontier, seen = [node_id], {node_id}
+        for _ in range(depth):
+            next_frontier = []
+            for node in frontier:
+                self._fault_in(node)
+                if self.graph.has_node(node):
+                    for neighbor in self.graph.neighbors(node):
+                        if neighbor not in seen:
+                            seen.add(neighbor)
+                            next_frontier.append(neighbor)
+            frontier = next_frontier
+
+    # Memory Tiering
+
+    def memory_usage(self):
+        """Estimated bytes held by the in-memory graph and its indexes."""
+        return self.graph.number_of_nodes() * self.node_bytes + self.graph.number_of_edges() * self.edge_bytes
+
+    def _page_out(self, nodes):
+        """Drop nodes from memory without deleting them; the store keeps them and they fault back in on next touch."""
+        for node_id in nodes:
+            neighbors = list(self.graph.neighbors(node_id))
+            self.graph.remove_node(node_id)
+            self.node_times.discard(node_id)
+            self.attribute_indexes.discard(node_id)
+            for neighbor in neighbors:
+                self._unindex_edge(node_id, neighbor)
+            self.neighborhood_cache.node_removed(node_id, neighbors)
+            self.embeddings.mark_dirty(node_id, *neighbors)
+            self.hotness.discard(node_id)
+            self.loaded_nodes.discard(node_id)
+            self.loaded_nodes.difference_update(neighbors)  # Their in-memory adjacency is now partial
+        self.analytics.invalidate()
+
+    def _enforce_memory_budget(self, keep=()):
+        """In tiered mode, page out the coldest nodes once the estimated footprint exceeds the budget."""
+        if self.memory_budget is None:
+            return
+        usage = self.memory_usage()
+        if usage <= self.memory_budget:
+            return
+        target = self.memory_budget * self.evict_watermark
+        evicted = 0
+        while usage > target:
+            node_count = self.graph.number_of_nodes()
+            per_node = self.node_bytes + self.edge_bytes * 2 * self.graph.number_of_edges() / max(node_count, 1)
+            count = min(node_count, int((usage - target) / per_node) + 1)
+            victims = self.hotness.coldest((node for node in self.graph.nodes if node not in keep), count)
+            if not victims:
+                break
+            self._page_out(victims)
+            evicted += len(victims)
+            usage = self.memory_usage()
+        self.store.flush()
+        self.tier_stats["evictions"] += 1
+        self.tier_stats["evicted_nodes"] += evicted
+        if self.logger:
+            self.logger.log_info(
+                "Association Cortex",
+                f"Paged out {evicted} cold nodes; in-memory graph now ~{usage / 1048576:.1f} MB of {self.memory_budget / 1048576:.1f} MB."
+            )
+
+    def memory_stats(self):
+        """In-memory footprint estimate and page in/out counters."""
+        return dict(
+            self.tier_stats,
+            mode=self.load_mode,
+            nodes=self.graph.number_of_nodes(),
+            edges=self.graph.number_of_edges(),
+            estimated_bytes=self.memory_usage() if self.memory_budget is not None else None,
+            budget_bytes=self.memory_budget,
+        )
+
+    def load_graph(self):
+        """Bulk load the persisted graph into memory."""
+        if self.store is None:
+            return "Graph persistence disabled."
+        self.store.load_into(self.graph)
+        self.rebuild_indexes()
+        self.analytics.rebuild(self.graph)
+        self.neighborhood_cache.clear()
+        self.embeddings.invalidate()
+        if self.logger:
+            self.logger.log_info(
+                "Association Cortex",
+                f"Loaded {self.graph.number_of_nodes()} nodes and {self.graph.number_of_edges()} edges from {self.store.db_file}."
+            )
+        return {"nodes": self.graph.number_of_nodes(), "edges": self.graph.number_of_edges()}
+
+    def snapshot_graph(self, path=None):
+        """Write a compact copy of the persisted graph (or compact it in place)."""
+        if self.store is None:
+            return "Graph persistence disabled."
+        return self.store.snapshot(path)
+
+    def flush_graph(self):
+        """Commit buffered graph mutations to disk."""
+        if self.store:
+            self.store.flush()
+
     # Node Management
 
     def add_node(self, node_id, data=None):
         """Add a node to the graph if it doesn't already exist."""
+        self._fault_in(node_id)
         if not self.graph.has_node(node_id):
             self.graph.add_node(node_id, data=data)
-            self.logger.log_info("Association Cortex", f"Added node: {node_id} with data: {data}")
+            self._node_added(node_id, data)
+            self.logger.log_info("Association Cortex", "Added node: %s with data: %s", node_id, data)
+            self._enforce_memory_budget(keep=(node_id,))
         else:
             self.logger.log_warning("Association Cortex", f"Node {node_id} already exists. Skipping.")
 
     def get_node_data(self, node_id):
         """Retrieve data associated with a node."""
+        self._fault_in(node_id)
         if node_id in self.graph:
-            return self.graph.nodes[node_id].get('data', {})
+            data = self.graph.nodes[node_id].get('data', {})
+            self._enforce_memory_budget(keep=(node_id,))
+            return data
         if self.logger:
-            self.logger.log_error(f"Node {node_id} not found in the graph.")
+            self.logger.log_error("Association Cortex", f"Node {node_id} not found in the graph.")
         return None
     
     def remove_node(self, node_id):
         """Remove a node and its associated relationships."""
+        self._fault_in(node_id)
         if self.graph.has_node(node_id):
-            self.graph.remove_node(node_id)
+            self._remove_node(node_id)
             if self.logger:
-                self.logger.log_info("Association Cortex", f"Removed node: {node_id}")
+                self.logger.log_info("Association Cortex", "Removed node: %s", node_id)
         else:
             if self.logger:
-                self.logger.log_error(f"Node {node_id} not found in the graph.")
+                self.logger.log_error("Association Cortex", f"Node {node_id} not found in the graph.")
 
     def update_node_data(self, node_id, new_data):
         """Update data in an existing node."""
+        self._fault_in(node_id)
         if node_id in self.graph:
+            old_data = self.graph.nodes[node_id].get('data')
             self.graph.nodes[node_id]['data'] = new_data
+            self._node_updated(node_id, old_data, new_data)
             if self.logger:
-                self.logger.log_info("Association Cortex", f"Updated data for node: {node_id} to: {new_data}")
+                self.logger.log_info("Association Cortex", "Updated data for node: %s to: %s", node_id, new_data)
         else:
             if self.logger:
                 self.logger.log_error("Association Cortex", f"Node {node_id} not found.")
@@ -65,35 +438,96 @@ class AssociationCortex:
 
     def add_relationship(self, node1, node2, relationship_type="related"):
         """Add a relationship between two nodes if it doesn't already exist."""
+        self._fault_in(node1)
+        self._fault_in(node2)
         if not self.graph.has_edge(node1, node2):
-            self.graph.add_edge(node1, node2, relationship=relationship_type, timestamp=datetime.datetime.now().isoformat())
-            self.logger.log_info("Association Cortex", f"Added relationship between {node1} and {node2} of type {relationship_type}.")
+            self._add_edge(node1, node2, relationship=relationship_type, timestamp=datetime.datetime.now().isoformat())
+            self.logger.log_info("Association Cortex", "Added relationship between %s and %s of type %s.", node1, node2, relationship_type)
+            self._enforce_memory_budget(keep=(node1, node2))
         else:
             self.logger.log_warning("Association Cortex", f"Relationship between {node1} and {node2} already exists. Skipping.")
 
-    def find_related_nodes(self, node_id, depth=1):
-        """Find related nodes up to a certain depth."""
-        if node_id not in self.graph:
-            if self.logger:
-                self.logger.log_error(f"Node {node_id} not found in the graph.")
-            return []
+    @timed("elliot_graph_traversal_seconds", "Association Cortex", "Graph traversal latency in seconds")
+    def find_related_nodes(self, node_id, depth=1, relationship_types=None):
+        """Find related nodes up to a certain depth (served from the neighbourhood cache when still valid)."""
+        key = self.neighborhood_cache.make_key(node_id, depth, relationship_types)
+        related_nodes = self.neighborhood_cache.get(key)
+        if related_nodes is None:
+            self._fault_in_neighborhood(node_id, depth)
+            if node_id not in self.graph:
+                if self.logger:
+                    self.logger.log_error("Association Cortex", f"Node {node_id} not found in the graph.")
+                return []
 
-        related_nodes = list(nx.single_source_shortest_path_length(self.graph, node_id, cutoff=depth).keys())
+            if relationship_types:
+                distances = path_queries.bfs_distances(self._path_neighbors(relationship_types), node_id, depth)
+            else:
+                distances = self.algorithms.single_source_shortest_path_length(self.graph, node_id, cutoff=depth)
+            related_nodes = list(distances.keys())
+            expanded = [node_id] + [node for node, distance in distances.items() if distance < depth]
+            self.neighborhood_cache.put(key, related_nodes, expanded)
+            self._enforce_memory_budget(keep=(node_id,))
+        elif self.hotness is not None:
+            self.hotness.touch(node_id)
         if self.logger:
-            self.logger.log_info("Association Cortex", f"Found related nodes for {node_id}: {related_nodes}")
-        return related_nodes
+            self.logger.log_info("Association Cortex", "Found related nodes for %s: %s", node_id, related_nodes)
+        return list(related_nodes)
+
+    @timed("elliot_graph_traversal_seconds", "Association Cortex", "Graph traversal latency in seconds")
+    def find_related_nodes_many(self, node_ids, depth=1, relationship_types=None):
+        """
+        Find related nodes for several nodes at once.
+        Cache misses are answered by one batched BFS that expands each node's neighbors once.
+        Returns:
+            dict: node_id -> list of related nodes ([] for unknown nodes).
+        """
+        results = {}
+        pending = []
+        for node_id in node_ids:
+            if node_id in results:
+                continue
+            cached = self.neighborhood_cache.get(self.neighborhood_cache.make_key(node_id, depth, relationship_types))
+            if cached is not None:
+                results[node_id] = list(cached)
+                continue
+            self._fault_in_neighborhood(node_id, depth)
+            if node_id in self.graph:
+                pending.append(node_id)
+            else:
+                results[node_id] = []
+
+        if pending:
+            searched = path_queries.batched_bfs(self._path_neighbors(relationship_types), pending, depth)
+            for node_id, (related_nodes, expanded) in searched.items():
+                key = self.neighborhood_cache.make_key(node_id, depth, relationship_types)
+                self.neighborhood_cache.put(key, related_nodes, [node_id] + expanded)
+                results[node_id] = list(related_nodes)
+            self._enforce_memory_budget(keep=set(pending))
+        if self.logger:
+            self.logger.log_info(
+                "Association Cortex",
+                f"Found related nodes for {len(results)} nodes ({len(pending)} computed, {len(results) - len(pending)} cached or missing)."
+            )
+        return results
+
+    def neighborhood_cache_stats(self):
+        """Hit/miss/invalidation counters for the neighbourhood cache."""
+        return self.neighborhood_cache.get_stats()
 
     def get_relationship_data(self, node1, node2):
         """Retrieve data associated with the relationship between two nodes."""
+        self._fault_in(node1)
         if self.graph.has_edge(node1, node2):
             return self.graph[node1][node2]
         if self.logger:
-            self.logger.log_error(f"Relationship between {node1} and {node2} not found in the graph.")
+            self.logger.log_error("Association Cortex", f"Relationship between {node1} and {node2} not found in the graph.")
         return None
     
     def remove_relationship(self, node1, node2):
         """Remove the relationship between two nodes."""
         # Check if the relationship exists
+        self._fault_in(node1)
+        self._fault_in(node2)
         if not self.graph.has_edge(node1, node2):
             error_reason = f"Relationship between {node1} and {node2} not found."
             if not self.graph.has_node(node1):
@@ -104,46 +538,201 @@ class AssociationCortex:
             return None
 
         # Remove the relationship
-        self.graph.remove_edge(node1, node2)
-        self.logger.log_info("Association Cortex", f"Removed relationship between {node1} and {node2}.")
+        self._remove_edge(node1, node2)
+        self.logger.log_info("Association Cortex", "Removed relationship between %s and %s.", node1, node2)
 
     def update_relationship_data(self, node1, node2, new_data):
         """Update data associated with the relationship between two nodes."""
+        self._fault_in(node1)
+        self._fault_in(node2)
         if self.graph.has_edge(node1, node2):
             self.graph[node1][node2].update(new_data)
+            self._edge_updated(node1, node2, dict(self.graph[node1][node2]))
             if self.logger:
-                self.logger.log_info("Association Cortex", f"Updated relationship data between {node1} and {node2} to: {new_data}")
+                self.logger.log_info("Association Cortex", "Updated relationship data between %s and %s to: %s", node1, node2, new_data)
         else:
             if self.logger:
                 self.logger.log_error("Association Cortex", f"Relationship between {node1} and {node2} not found.")
 
-    def update_relationship_data(self, node1, node2, new_data):
-        """Update data associated with the relationship between two nodes."""
-        if self.graph.has_edge(node1, node2):
-            self.graph[node1][node2].update(new_data)
-            if self.logger:
-                self.logger.log_info("Association Cortex", f"Updated relationship data between {node1} and {node2} to: {new_data}")
-        else:
-            if self.logger:
-                self.logger.log_error("Association Cortex", f"Relationship between {node1} and {node2} not found.")
+    # Bulk Ingestion
+
+    def add_nodes_bulk(self, nodes, batch_size=10000):
+        """
+        Add many nodes in one pass, skipping duplicates and nodes that already exist.
+        Args:
+            nodes: Iterable of node ids or (node_id, data) pairs, or a path to a .csv/.jsonl file.
+            batch_size (int): Number of nodes deduplicated and applied together.
+        Returns:
+            dict: Counts of added and skipped nodes, and the elapsed seconds.
+        """
+        start = time.perf_counter()
+        if isinstance(nodes, str):
+            nodes = read_nodes(nodes)
+        lazy = self.paging
+        added = skipped = 0
+        with paused_gc():
+            for batch in batched(nodes, batch_size):
+                new_nodes = {}
+                for item in batch:
+                    if isinstance(item, tuple) and len(item) == 2 and (item[1] is None or isinstance(item[1], dict)):
+                        node_id, data = item
+                    else:
+                        node_id, data = item, None
+                    if node_id in new_nodes:
+                        skipped += 1
+                        continue
+                    if lazy:
+                        self._fault_in(node_id, touch=False)
+                    if self.graph.has_node(node_id):
+                        skipped += 1
+                        continue
+                    new_nodes[node_id] = data
+                self.graph.add_nodes_from((node_id, {"data": data}) for node_id, data in new_nodes.items())
+                self._nodes_added(list(new_nodes.items()))
+                added += len(new_nodes)
+                self._enforce_memory_budget()
+
+        elapsed = time.perf_counter() - start
+        if self.logger:
+            self.logger.log_info(
+                "Association Cortex", f"Bulk added {added} nodes ({skipped} skipped) in {elapsed:.2f}s.",
+                operation="add_nodes_bulk", duration=round(elapsed, 6), added=added,
+            )
+        return {"added": added, "skipped": skipped, "seconds": round(elapsed, 3)}
+
+    def add_relationships_bulk(self, relationships, relationship_type="related", batch_size=10000):
+        """
+        Add many relationships in one pass, skipping duplicates and relationships that already exist.
+        Missing endpoint nodes are created without data.
+        Args:
+            relationships: Iterable of (node1, node2), (node1, node2, relationship_type) or
+                (node1, node2, attrs) tuples, or a path to a .csv/.jsonl file.
+            relationship_type (str): Type used when an item doesn't name one.
+            batch_size (int): Number of relationships deduplicated and applied together.
+        Returns:
+            dict: Counts of added and skipped relationships, created nodes, and the elapsed seconds.
+        """
+        start = time.perf_counter()
+        if isinstance(relationships, str):
+            relationships = read_edges(relationships)
+        timestamp = datetime.datetime.now().isoformat()
+        lazy = self.paging
+        default_attrs = {"relationship": relationship_type, "timestamp": timestamp}  # Shared, never mutated
+        has_edge, has_node = self.graph.has_edge, self.graph.has_node
+        added = skipped = created = 0
+        with paused_gc():
+            for batch in batched(relationships, batch_size):
+                new_edges = {}
+                for item in batch:
+                    node1, node2 = item[0], item[1]
+                    if (node1, node2) in new_edges or (node2, node1) in new_edges:
+                        skipped += 1
+                        continue
+                    if lazy:
+                        self._fault_in(node1, touch=False)
+                        self._fault_in(node2, touch=False)
+                    if has_edge(node1, node2):
+                        skipped += 1
+                        continue
+                    extra = item[2] if len(item) > 2 else None
+                    if isinstance(extra, dict):
+                        attrs = dict(default_attrs, **extra)
+                    elif extra is not None:
+                        attrs = dict(default_attrs, relationship=extra)
+                    else:
+                        attrs = default_attrs
+                    new_edges[(node1, node2)] = attrs
+
+                new_nodes = {}
+                for edge in new_edges:
+                    for node in edge:
+                        if node not in new_nodes and not has_node(node):
+                            new_nodes[node] = None
+                self.graph.add_nodes_from(new_nodes)
+                self._nodes_added(list(new_nodes.items()))
+                items = [(node1, node2, attrs) for (node1, node2), attrs in new_edges.items()]
+                self.graph.add_edges_from(items)
+                self._edges_added(items)
+                added += len(items)
+                created += len(new_nodes)
+                self._enforce_memory_budget()
+
+        elapsed = time.perf_counter() - start
+        if self.logger:
+            self.logger.log_info(
+                "Association Cortex",
+                f"Bulk added {added} relationships ({skipped} skipped, {created} nodes created) in {elapsed:.2f}s.",
+                operation="add_relationships_bulk", duration=round(elapsed, 6), added=added,
+            )
+        return {"added": added, "skipped": skipped, "created_nodes": created, "seconds": round(elapsed, 3)}
 
     # Advanced Graph Queries
 
-    def find_all_paths(self, node1, node2):
-        """Find all possible paths between two nodes."""
-        if node1 in self.graph and node2 in self.graph:
-            try:
-                paths = list(nx.all_simple_paths(self.graph, source=node1, target=node2))
-                if self.logger:
-                    self.logger.log_info("Association Cortex", f"Found paths between {node1} and {node2}: {paths}")
-                return paths
-            except nx.NetworkXNoPath:
-                if self.logger:
-                    self.logger.log_warning("Association Cortex", f"No paths found between {node1} and {node2}.")
+    def _path_neighbors(self, relationship_types=None):
+        """Neighbor function for path searches: faults nodes in and applies the relationship filter."""
+        if isinstance(relationship_types, str):
+            relationship_types = [relationship_types]
+        allowed = set(relationship_types) if relationship_types else None
+
+        def neighbors(node):
+            self._fault_in(node)
+            if not self.graph.has_node(node):
                 return []
+            if allowed is None:
+                return list(self.graph.neighbors(node))
+            adjacency = self.graph[node]
+            return [n for n in list(self.graph.neighbors(node)) if adjacency[n].get("relationship") in allowed]
+        return neighbors
+
+    def _path_deadline(self, timeout):
+        timeout = self.path_timeout if timeout is None else timeout
+        return time.perf_counter() + timeout if timeout else None
+
+    def iter_paths(self, node1, node2, max_depth=None, relationship_types=None, timeout=None):
+        """
+        Lazily yield simple paths between two nodes.
+        Paths are limited to `max_depth` relationships and the search stops after `timeout` seconds.
+        """
+        self._fault_in(node1)
+        self._fault_in(node2)
+        if node1 not in self.graph or node2 not in self.graph:
+            return iter(())
+        return path_queries.iter_simple_paths(
+            self._path_neighbors(relationship_types),
+            node1,
+            node2,
+            max_depth=self.path_max_depth if max_depth is None else max_depth,
+            deadline=self._path_deadline(timeout),
+        )
+
+    @timed("elliot_graph_traversal_seconds", "Association Cortex", "Graph traversal latency in seconds")
+    def find_all_paths(self, node1, node2, max_depth=None, max_results=None, relationship_types=None, timeout=None):
+        """Find paths between two nodes, bounded by depth, result count and time."""
+        self._fault_in(node1)
+        self._fault_in(node2)
+        if node1 not in self.graph or node2 not in self.graph:
+            if self.logger:
+                self.logger.log_error("Association Cortex", f"One or both nodes {node1} and {node2} do not exist.")
+            return []
+
+        max_results = self.path_max_results if max_results is None else max_results
+        start = time.perf_counter()
+        paths = []
+        for path in self.iter_paths(node1, node2, max_depth, relationship_types, timeout):
+            paths.append(path)
+            if len(paths) >= max_results:
+                break
         if self.logger:
-            self.logger.log_error("Association Cortex", f"One or both nodes {node1} and {node2} do not exist.")
-        return []
+            if not paths:
+                self.logger.log_warning("Association Cortex", f"No paths found between {node1} and {node2}.")
+            else:
+                self.logger.log_info(
+                    "Association Cortex",
+                    f"Found {len(paths)} paths between {node1} and {node2} in {time.perf_counter() - start:.3f}s"
+                    f"{' (result limit reached)' if len(paths) >= max_results else ''}.",
+                    operation="find_all_paths", duration=round(time.perf_counter() - start, 6), results=len(paths),
+                )
+        return paths
 
     def filter_nodes(self, attribute=None, condition=None):
         """
@@ -151,134 +740,312 @@ class AssociationCortex:
         Example:
             attribute='tags', condition=lambda tags: 'critical' in tags
         """
-        filtered_nodes = []
-        for node, data in self.graph.nodes(data=True):
-            if attribute in data.get('data', {}) and condition(data['data'][attribute]):
-                filtered_nodes.append(node)
+        filtered_nodes = self._query({attribute: condition}) if attribute is not None else []
         if self.logger:
-            self.logger.log_info("Association Cortex", f"Filtered nodes based on attribute {attribute}: {filtered_nodes}")
+            self.logger.log_info("Association Cortex", "Filtered nodes based on attribute %s: %s", attribute, filtered_nodes)
         return filtered_nodes
 
+    def query_nodes(self, **predicates):
+        """
+        Find nodes whose data match every predicate, using secondary indexes where possible.
+        Each predicate is a literal (equality, or membership for list values such as tags),
+        a dict of in/min/max/exists operators, or a callable (always evaluated by scanning).
+        Example:
+            query_nodes(tags="critical", timestamp={"min": "2024-01-01T00:00:00"})
+        """
+        return self._query(predicates)
+
+    def _query(self, predicates):
+        if self.paging:  # The indexes only cover nodes in memory
+            return scan(predicates, self.store.iter_nodes())
+        return self.attribute_indexes.query(
+            predicates,
+            lambda: ((node, attrs.get("data")) for node, attrs in self.graph.nodes(data=True)),
+            lambda node: self.graph.nodes[node].get("data"),
+        )
+
+    def create_index(self, attribute, kind="hash"):
+        """Create a secondary index ("hash" or "sorted") on a node data attribute."""
+        try:
+            self.attribute_indexes.create(
+                attribute, kind, ((node, attrs.get("data")) for node, attrs in self.graph.nodes(data=True))
+            )
+        except ValueError as e:
+            if self.logger:
+                self.logger.log_error("Association Cortex", str(e))
+            return f"Error: {e}"
+        if self.logger:
+            self.logger.log_info("Association Cortex", f"Created {kind} index on node attribute '{attribute}'.")
+        return f"Index on '{attribute}' created."
+
+    def drop_index(self, attribute):
+        """Remove the secondary index on a node data attribute."""
+        if self.attribute_indexes.drop(attribute):
+            return f"Index on '{attribute}' dropped."
+        return f"No index on '{attribute}'."
+
     def visualize_graph(self):
         """Optional: Visualize the graph (requires Matplotlib)."""
         import matplotlib.pyplot as plt
+        import networkx as nx
+        graph = self.graph.to_networkx() if self.backend == "csr" else self.graph
         plt.figure(figsize=(10, 6))
-        nx.draw(self.graph, with_labels=True, node_color="lightblue", font_weight="bold")
+        nx.draw(graph, with_labels=True, node_color="lightblue", font_weight="bold")
         plt.show()
     
     #Analytics and Insights
 
-    def measure_centrality(self, centrality_type="degree"):
-        """Compute centrality metrics for the graph."""
+    def _refuse_when_paging(self, operation):
+        """Log and return True for whole-graph computations in lazy/tiered mode, where memory holds part of the graph."""
+        if not self.paging:
+            return False
+        if self.logger:
+            self.logger.log_error(
+                "Association Cortex", f"{operation} needs the whole graph in memory; not available with graph_load: {self.load_mode}."
+            )
+        return True
+
+    def measure_centrality(self, centrality_type="degree", k=None, seed=None):
+        """
+        Compute centrality metrics for the graph.
+        "degree" comes from maintained counters; "betweenness" is estimated from `k` sampled pivots
+        (betweenness_samples by default; k >= node count is exact) and "pagerank" is computed with
+        vectorized sparse operations. Results are cached until the graph changes.
+        """
         try:
-            if centrality_type == "degree":
-                centrality = nx.degree_centrality(self.graph)
+            if centrality_type == "degree" and self.paging:
+                degrees = self.store.degrees()
+                count = len(degrees)
+                centrality = {node: degree / (count - 1) if count > 1 else 1.0 for node, degree in degrees.items()}
+            elif centrality_type == "degree":
+                centrality = self.analytics.degree_centrality(self.graph)
+            elif centrality_type in ("betweenness", "pagerank") and self._refuse_when_paging(f"{centrality_type} centrality"):
+                return None
+            elif centrality_type == "betweenness":
+                if k is None:
+                    k = min(self.graph.number_of_nodes(), self.betweenness_samples)
+                centrality = self.analytics.betweenness(self.graph, k=k, seed=seed)
+            elif centrality_type == "pagerank":
+                centrality = self.analytics.pagerank(self.graph)
             else:
                 raise ValueError(f"Unsupported centrality type: {centrality_type}")
     
             # Log summary
             node_count = len(centrality)
-            self.logger.log_info("Association Cortex", f"Computed {centrality_type} centrality for {node_count} nodes.")
-            # Optionally truncate detailed output
-            truncated_centrality = dict(list(centrality.items())[:10])  # Show first 10 nodes
-            self.logger.log_info("Association Cortex", f"Sample centrality: {truncated_centrality}")
+            self.logger.log_info("Association Cortex", "Computed %s centrality for %d nodes.", centrality_type, node_count)
+            self.logger.log_info("Association Cortex", "Sample centrality: %s", centrality)  # Sampled by the logger
     
             return centrality
         except Exception as e:
             self.logger.log_error("Association Cortex", f"Failed to compute {centrality_type} centrality: {e}")
             return None
-   
+
     def detect_clusters(self, method="connected_components"):
-        """Detect clusters in the graph."""
+        """Detect clusters in the graph (maintained incrementally; cached until the graph changes)."""
         try:
-            if method == "connected_components":
-                clusters = list(nx.connected_components(self.graph))
+            if method == "connected_components" and self.paging:
+                clusters = self.store.connected_components()
+            elif method == "connected_components":
+                clusters = self.analytics.connected_components(self.graph)
             else:
                 raise ValueError(f"Unsupported clustering method: {method}")
 
-            # Assign labels and summarize
-            cluster_summary = {f"Cluster_{i+1}": len(cluster) for i, cluster in enumerate(clusters)}
-            self.logger.log_info("Association Cortex", f"Detected {len(clusters)} clusters: {cluster_summary}")
-
-            return cluster_summary
+            if self.logger:
+                self.logger.log_info("Association Cortex", f"Detected {len(clusters)} clusters using {method}.")
+            return clusters
         except Exception as e:
-            self.logger.log_error("Association Cortex", f"Failed to detect clusters: {e}")
+            if self.logger:
+                self.logger.log_error("Association Cortex", f"Error detecting clusters with {method}: {e}")
+            return []
+
+    def analytics_stats(self):
+        """Cache hit/miss counters for the maintained graph analytics."""
+        return dict(self.analytics.stats)
+
+    def compute_embeddings(self):
+        """Fit node embeddings for the whole graph (an offline job; similar_nodes refreshes incrementally)."""
+        if self._refuse_when_paging("compute_embeddings"):
             return None
-    
-    def detect_clusters(self, method="connected_components"):
-        """Detect clusters in the graph."""
         try:
-            if method == "connected_components":
-                clusters = [set(component) for component in nx.connected_components(self.graph)]
-            else:
-                raise ValueError(f"Unsupported clustering method: {method}")
+            start = time.perf_counter()
+            count = self.embeddings.fit(self.graph)
+            if self.logger:
+                self.logger.log_info(
+                    "Association Cortex",
+                    f"Computed {self.embeddings.dim}-d embeddings for {count} nodes in {time.perf_counter() - start:.2f}s."
+                )
+            return self.embeddings.get_stats()
+        except Exception as e:
+            if self.logger:
+                self.logger.log_error("Association Cortex", f"Failed to compute embeddings: {e}")
+            return None
 
+    def refresh_embeddings(self):
+        """Recompute embeddings around nodes changed since the last refresh; returns the number of rows updated."""
+        if self._refuse_when_paging("refresh_embeddings"):
+            return 0
+        return self.embeddings.refresh(self.graph)
+
+    def similar_nodes(self, node_id, k=10):
+        """Return the `k` nodes whose neighbourhood structure is most similar to `node_id`, as (node_id, score) pairs."""
+        if self._refuse_when_paging("similar_nodes"):
+            return []
+        self._fault_in(node_id)
+        if node_id not in self.graph:
             if self.logger:
-                self.logger.log_info("Association Cortex", f"Detected clusters using {method}: {clusters}")
-            return clusters
+                self.logger.log_error("Association Cortex", f"Node {node_id} does not exist.")
+            return []
+        try:
+            self.embeddings.refresh(self.graph)
+            return self.embeddings.similar(node_id, k)
         except Exception as e:
             if self.logger:
-                self.logger.log_error("Association Cortex", f"Error detecting clusters with {method}: {e}")
+                self.logger.log_error("Association Cortex", f"Error finding nodes similar to {node_id}: {e}")
             return []
 
-    def find_shortest_path(self, node1, node2):
-        """Find the shortest path between two nodes."""
+    def embedding_stats(self):
+        return self.embeddings.get_stats()
+
+    @timed("elliot_graph_traversal_seconds", "Association Cortex", "Graph traversal latency in seconds")
+    def find_shortest_path(self, node1, node2, relationship_types=None, max_depth=None, timeout=None):
+        """Find the shortest path between two nodes (bidirectional BFS)."""
+        self._fault_in(node1)
+        self._fault_in(node2)
         if node1 in self.graph and node2 in self.graph:
-            try:
-                path = nx.shortest_path(self.graph, source=node1, target=node2)
-                if self.logger:
-                    self.logger.log_info("Association Cortex", f"Shortest path between {node1} and {node2}: {path}")
-                return path
-            except nx.NetworkXNoPath:
-                if self.logger:
-                    self.logger.log_warning(f"No path found between {node1} and {node2}.")
-                return None
+            path = path_queries.bidirectional_shortest_path(
+                self._path_neighbors(relationship_types),
+                node1,
+                node2,
+                max_depth=max_depth,
+                deadline=self._path_deadline(timeout),
+            )
+            if self.logger:
+                if path is None:
+                    self.logger.log_warning("Association Cortex", f"No path found between {node1} and {node2}.")
+                else:
+                    self.logger.log_info("Association Cortex", "Shortest path between %s and %s: %s", node1, node2, path)
+            return path
         if self.logger:
-            self.logger.log_error(f"One or both nodes {node1} and {node2} do not exist.")
+            self.logger.log_error("Association Cortex", f"One or both nodes {node1} and {node2} do not exist.")
         return None
-    
+
+    @timed("elliot_graph_traversal_seconds", "Association Cortex", "Graph traversal latency in seconds")
+    def find_k_shortest_paths(self, node1, node2, k=3, relationship_types=None, max_depth=None, timeout=None):
+        """Find up to `k` distinct shortest paths between two nodes, shortest first."""
+        self._fault_in(node1)
+        self._fault_in(node2)
+        if node1 not in self.graph or node2 not in self.graph:
+            if self.logger:
+                self.logger.log_error("Association Cortex", f"One or both nodes {node1} and {node2} do not exist.")
+            return []
+        paths = list(path_queries.iter_k_shortest_paths(
+            self._path_neighbors(relationship_types),
+            node1,
+            node2,
+            k,
+            max_depth=max_depth,
+            deadline=self._path_deadline(timeout),
+        ))
+        if self.logger:
+            self.logger.log_info("Association Cortex", f"Found {len(paths)} of {k} shortest paths between {node1} and {node2}.")
+        return paths
+
     # Purge old data
 
-    def purge_old_data(self, retention_days=30):
-        """Remove old nodes and edges based on the retention period."""
-        cutoff_date = datetime.datetime.now() - datetime.timedelta(days=retention_days)
+    def purge_old_data(self, retention_days=30, time_budget=None):
+        """
+        Remove nodes and edges older than the retention period.
+
+        Expired items come from the time indexes, so the cost scales with what is
+        purged rather than the graph size. With `time_budget` (seconds) the purge
+        stops early and "complete" is False; later calls pick up where it left off.
+        In lazy/tiered mode, expired nodes and edges that are only on disk are then
+        deleted from the store, paging through its timestamp index.
+        """
+        cutoff = (datetime.datetime.now() - datetime.timedelta(days=retention_days)).timestamp()
+        deadline = time.perf_counter() + time_budget if time_budget is not None else None
         removed_nodes = []
         removed_edges = []
+        complete = True
 
         # Remove old nodes
-        for node in list(self.graph.nodes):
-            node_data = self.graph.nodes[node].get("data", {})
-            if "timestamp" in node_data:
-                node_date = datetime.datetime.fromisoformat(node_data["timestamp"])
-                if node_date < cutoff_date:
-                    self.graph.remove_node(node)
-                    removed_nodes.append(node)
+        for count, node in enumerate(self.node_times.expired(cutoff)):
+            if deadline is not None and count % 256 == 0 and time.perf_counter() > deadline:
+                complete = False
+                break
+            if self.graph.has_node(node):
+                self._remove_node(node)
+                removed_nodes.append(node)
+            else:
+                self.node_times.discard(node)
 
         # Remove old edges
-        for edge in list(self.graph.edges):
-            edge_data = self.graph.edges[edge].get("timestamp", None)
-            if edge_data:
-                edge_date = datetime.datetime.fromisoformat(edge_data)
-                if edge_date < cutoff_date:
-                    self.graph.remove_edge(*edge)
-                    removed_edges.append(edge)
+        if complete:
+            for count, (node1, node2) in enumerate(self._expired_edges(cutoff)):
+                if deadline is not None and count % 256 == 0 and time.perf_counter() > deadline:
+                    complete = False
+                    break
+                if self.graph.has_edge(node1, node2):
+                    self._remove_edge(node1, node2)
+                    removed_edges.append((node1, node2))
+
+        # Lazy/tiered mode: expired rows on disk that aren't in memory
+        if complete and self.paging:
+            complete = self._purge_store(cutoff, deadline, removed_nodes, removed_edges)
 
         if self.logger:
             self.logger.log_info(
                 "Association Cortex",
-                f"Purged {len(removed_nodes)} nodes and {len(removed_edges)} edges older than {retention_days} days."
+                f"Purged {len(removed_nodes)} nodes and {len(removed_edges)} edges older than {retention_days} days"
+                f"{'' if complete else ' (time budget reached, purge incomplete)'}."
             )
-        return {"removed_nodes": removed_nodes, "removed_edges": removed_edges}
+        return {"removed_nodes": removed_nodes, "removed_edges": removed_edges, "complete": complete}
 
-    def monitor_and_purge(self, node_limit=10000, edge_limit=50000, retention_days=30):
-        """Monitor graph size and purge data if limits are exceeded."""
-        if len(self.graph.nodes) > node_limit or len(self.graph.edges) > edge_limit:
+    def _purge_store(self, cutoff, deadline, removed_nodes, removed_edges):
+        """
+        Delete expired stored nodes and edges that aren't in memory, a page at a time.
+        Returns False if the time budget ran out; the next call resumes from purge_position.
+        """
+        table, after = self.purge_position
+        while True:
+            if table == "nodes":
+                nodes, after = self.store.expired_nodes(cutoff, after, self.purge_page_size)
+                for node in nodes:
+                    if not self.graph.has_node(node):  # Nodes in memory were handled by the in-memory pass
+                        self.store.delete_node(node)
+                        removed_nodes.append(node)
+            else:
+                edges, after = self.store.expired_edges(cutoff, after, self.purge_page_size)
+                for node1, node2 in edges:
+                    if not self.graph.has_edge(node1, node2):
+                        self.store.delete_edge(node1, node2)
+                        removed_edges.append((node1, node2))
+            if after is None:
+                if table == "edges":
+                    break
+                table = "edges"
+            self.purge_position = (table, after)
+            if deadline is not None and time.perf_counter() > deadline:
+                self.store.flush()
+                return False
+        self.purge_position = ("nodes", None)
+        self.store.flush()
+        return True
+
+    def monitor_and_purge(self, node_limit=10000, edge_limit=50000, retention_days=30, time_budget=None):
+        """Monitor graph size (the stored graph in lazy/tiered mode) and purge data if limits are exceeded."""
+        if self.paging:
+            counts = self.store.counts()
+            nodes, edges = counts["nodes"], counts["edges"]
+        else:
+            nodes, edges = len(self.graph.nodes), len(self.graph.edges)
+        if nodes > node_limit or edges > edge_limit:
             if self.logger:
                 self.logger.log_warning(
                     "Association Cortex",
-                    f"Graph exceeded limits: {len(self.graph.nodes)} nodes, {len(self.graph.edges)} edges. Initiating purge."
+                    f"Graph exceeded limits: {nodes} nodes, {edges} edges. Initiating purge."
                 )
-            return self.purge_old_data(retention_days)
+            return self.purge_old_data(retention_days, time_budget)
         return {"status": "No purge needed."}
 
 
@@ -1,10 +1,11 @@
 import os
 import json
-import logger
 import datetime
 import pickle 
 import re
 
+from utils.metrics import REGISTRY
+
 class Cerebellum:
     @staticmethod
     def sanitize_filename(name):
@@ -34,7 +35,7 @@ class Cerebellum:
     def store_workflow(self, name, workflow, metadata=None):
         try:
             if not name or not isinstance(name, str):
-                self.logger.log_error("store_workflow", "Workflow name must be a non-empty string.")
+                self.logger.log_error("Cerebellum.store_workflow", "Workflow name must be a non-empty string.")
                 raise ValueError("Workflow name must be a non-empty string.")
 
             metadata = metadata or {}
@@ -43,34 +44,34 @@ class Cerebellum:
 
             workflow_data = {"workflow": workflow, "metadata": metadata}
             file_path = os.path.join(self.storage_path, f"{name}.pkl")
-            with open(file_path, "wb") as file:
+            with open(file_path, "wb") as file, REGISTRY.time("elliot_pickle_seconds", "Workflow pickle latency in seconds", region="Cerebellum", operation="dump"):
                 pickle.dump(workflow_data, file)
 
             if self.verbose:
                 print(f"Stored workflow: {name} at {file_path}")
             return f"Workflow '{name}' stored successfully."
         except Exception as e:
-            self.logger.log_error("store_workflow", str(e))
+            self.logger.log_error("Cerebellum.store_workflow", str(e))
             return f"Error storing workflow: {e}"
 
     def retrieve_workflow(self, name):
         try:
             if not name or not isinstance(name, str):
-                self.logger.log_error("retrieve_workflow", "Workflow name must be a non-empty string.")
+                self.logger.log_error("Cerebellum.retrieve_workflow", "Workflow name must be a non-empty string.")
                 raise ValueError("Workflow name must be a non-empty string.")
 
             file_path = os.path.join(self.storage_path, f"{name}.pkl")
             if not os.path.exists(file_path):
                 return f"Workflow '{name}' not found."
 
-            with open(file_path, "rb") as file:
+            with open(file_path, "rb") as file, REGISTRY.time("elliot_pickle_seconds", "Workflow pickle latency in seconds", region="Cerebellum", operation="load"):
                 workflow_data = pickle.load(file)
 
             if self.verbose:
                 print(f"Retrieved workflow: {name}")
             return workflow_data
         except Exception as e:
-            self.logger.log_error("retrieve_workflow", str(e))
+            self.logger.log_error("Cerebellum.retrieve_workflow", str(e))
             return f"Error retrieving workflow: {e}"
 
     def list_workflows(self):
@@ -92,10 +93,10 @@ class Cerebellum:
     def optimize_workflow(self, name, insights):
         try:
             if not name or not isinstance(name, str):
-                self.logger.log_error("optimize_workflow", "Workflow name must be a non-empty string.")
+                self.logger.log_error("Cerebellum.optimize_workflow", "Workflow name must be a non-empty string.")
                 raise ValueError("Workflow name must be a non-empty string.")
             if not isinstance(insights, dict):
-                self.logger.log_error("optimize_workflow", "Insights must be a dictionary.")
+                self.logger.log_error("Cerebellum.optimize_workflow", "Insights must be a dictionary.")
                 raise ValueError("Insights must be a dictionary.")
             
             workflow_data = self.retrieve_workflow(name)
@@ -113,7 +114,7 @@ class Cerebellum:
             metadata["last_optimized"] = datetime.datetime.now().isoformat()
             return self.store_workflow(name, workflow, metadata)
         except Exception as e:
-            self.logger.log_error("optimize_workflow", str(e))
+            self.logger.log_error("Cerebellum.optimize_workflow", str(e))
             return f"Error optimizing workflow: {e}"
 
     def retrieve_workflows_by_metadata(self, tag=None, timestamp=None):
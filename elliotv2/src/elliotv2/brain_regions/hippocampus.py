@@ -2,10 +2,9 @@ import sqlite3
 import json
 import os
 import datetime 
-import yaml
-import logger
-from crewai import Agent
 from pathlib import Path
+from utils.config import load_config
+from utils.metrics import connect_timed
 
 class Hippocampus:
     def __init__(self, logger=None, db_file="data/hippocampus.db", **kwargs):
@@ -24,7 +23,7 @@ class Hippocampus:
 
         # SQLite setup
         os.makedirs(os.path.dirname(db_file), exist_ok=True)
-        self.conn = sqlite3.connect(db_file)
+        self.conn = connect_timed(db_file, "Hippocampus", check_same_thread=False)  # Orchestrator.recall calls from pool threads, one at a time per region
         self.initialize_db()
 
     def initialize_db(self):
@@ -67,7 +66,36 @@ class Hippocampus:
         except Exception as e:
             self.logger.log_error("Hippocampus.store", str(e))
             return f"Error storing memory: {e}"
-        
+
+    def store_many(self, items):
+        """
+        Store many (key, value, metadata) items in one transaction; keys that already exist are skipped, as in store().
+        Returns:
+            dict: Counts of stored and skipped items.
+        """
+        try:
+            rows = []
+            for key, value, metadata in items:
+                if not key or not isinstance(key, str):
+                    raise ValueError("Memory key must be a non-empty string.")
+                if not isinstance(metadata, dict):
+                    metadata = {"priority": "normal", "timestamp": datetime.datetime.now().isoformat()}
+                metadata.setdefault("importance", 5)
+                metadata.setdefault("tags", [])
+                value_str = json.dumps(value) if not isinstance(value, str) else value
+                rows.append((key, value_str, json.dumps(metadata)))
+
+            before = self.conn.total_changes
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO declarative_memory (key, value, metadata) VALUES (?, ?, ?)", rows
+            )
+            self.conn.commit()
+            stored = self.conn.total_changes - before
+            return {"stored": stored, "skipped": len(rows) - stored}
+        except Exception as e:
+            self.logger.log_error("Hippocampus.store_many", str(e))
+            return f"Error storing memories: {e}"
+
     def retrieve(self, key):
         """Retrieve a key-value pair."""
         try:
@@ -262,31 +290,38 @@ class Hippocampus:
     def close(self):
         self.conn.close()
 
-# Load configuration from agents.yaml
+# Load configuration from agents.yaml (parsed once and shared with the Orchestrator)
 def load_agent_config(agent_name):
     config_path = Path("config/agents.yaml")
     if not config_path.exists():
         raise FileNotFoundError(f"Config file {config_path} not found.")
     
-    with open(config_path, "r") as file:
-        config = yaml.safe_load(file)
-    
-    return config.get(agent_name, {})
+    return load_config(config_path).get(agent_name, {})
+
+
+def build_hippocampus_agent(hippocampus_config=None):
+    """Build the crewai Agent for the Hippocampus; crewai is only imported here."""
+    from crewai import Agent
 
+    hippocampus_config = hippocampus_config or load_agent_config("hippocampus")
+    return Agent(
+        role=hippocampus_config["role"],
+        goal=hippocampus_config["goal"],
+        backstory=hippocampus_config["backstory"],
+        tools=hippocampus_config.get("tools", []),
+        verbose=hippocampus_config.get("verbose", False),
+        cache=hippocampus_config.get("cache", False),
+        max_iter=hippocampus_config.get("max_iter", 10),
+        allow_code_execution=hippocampus_config.get("allow_code_execution", False),
+        use_system_prompt=hippocampus_config.get("use_system_prompt", True),
+        respect_context_window=hippocampus_config.get("respect_context_window", True),
+        max_retry_limit=hippocampus_config.get("max_retry_limit", 2),
+    )
 
-# Initialize Hippocampus Agent from YAML
-hippocampus_config = load_agent_config("hippocampus")
 
-hippocampus_agent = Agent(
-    role=hippocampus_config["role"],
-    goal=hippocampus_config["goal"],
-    backstory=hippocampus_config["backstory"],
-    tools=hippocampus_config.get("tools", []),
-    verbose=hippocampus_config.get("verbose", False),
-    cache=hippocampus_config.get("cache", False),
-    max_iter=hippocampus_config.get("max_iter", 10),
-    allow_code_execution=hippocampus_config.get("allow_code_execution", False),
-    use_system_prompt=hippocampus_config.get("use_system_prompt", True),
-    respect_context_window=hippocampus_config.get("respect_context_window", True),
-    max_retry_limit=hippocampus_config.get("max_retry_limit", 2),
-)
+def __getattr__(name):
+    # `hippocampus_agent` used to be built at import time; build it on first access instead
+    if name == "hippocampus_agent":
+        agent = globals()["hippocampus_agent"] = build_hippocampus_agent()
+        return agent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
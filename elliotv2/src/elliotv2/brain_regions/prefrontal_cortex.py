@@ -1,6 +1,10 @@
 import datetime
-import requests
 from config.settings import API_KEYS, LLM_MODELS, LLM_URLS
+from utils.llm_cache import LLMResponseCache
+from utils.state_snapshot import StateSnapshotStore
+from utils.task_archive import TaskArchive
+from utils.routing import MethodRegistry, RoutingTable
+from utils.metrics import REGISTRY
 
 class PrefrontalCortex:
     def __init__(self, orchestrator=None, logger=None, **kwargs):
@@ -14,10 +18,32 @@ class PrefrontalCortex:
         self.working_memory = {}  # Working memory for active contexts
         self.logger = logger
         self.task_queue = []  # Task queue for prioritized execution
+        self.decisions = 0  # Tasks decided from inputs; numbers task ids
         self.cache_size = kwargs.get("cache_size", 50)  # Max cache size
         self.working_memory_size = kwargs.get("working_memory_size", 20)  # Max working memory size
-        self.completed_tasks = []
+        self.task_archive = TaskArchive(
+            db_file=kwargs.get("archive_db", "data/task_archive.db"),
+            recent_size=kwargs.get("archive_recent_size", 100),
+        )
+        self.completed_tasks = self.task_archive.recent  # Recent completions; full history lives in the archive
+        self.routing_table = RoutingTable.from_yaml(kwargs.get("routing_rules", "config/routing.yaml"))
+        self.method_handles = MethodRegistry()  # Cached method handles per memory region instance
         self.cerebellum = kwargs.get("cerebellum_instance")
+        self.llm_cache = None
+        if kwargs.get("llm_cache_enabled", True):
+            self.llm_cache = LLMResponseCache(
+                db_file=kwargs.get("llm_cache_db", "data/llm_cache.db"),
+                memory_size=kwargs.get("llm_cache_memory_size", 256),
+                disk_size=kwargs.get("llm_cache_disk_size", 10000),
+                ttl=kwargs.get("llm_cache_ttl", 7 * 24 * 3600),
+            )
+        self.state_store = None
+        if kwargs.get("state_dir"):
+            self.state_store = StateSnapshotStore(
+                kwargs["state_dir"],
+                snapshot_every=kwargs.get("snapshot_every", 500),
+                snapshot_interval=kwargs.get("snapshot_interval", 300),
+            )
         
     ### WORKING MEMORY FUNCTIONS ###
     def add_to_working_memory(self, key, value, metadata=None):
@@ -25,10 +51,12 @@ class PrefrontalCortex:
         if len(self.working_memory) >= self.working_memory_size:
             oldest_key = next(iter(self.working_memory))
             del self.working_memory[oldest_key]  # Remove the oldest entry to make space
+            self._record("wm_del", oldest_key)
             if self.verbose:
                 print(f"Removed oldest entry from working memory: {oldest_key}")
         metadata = metadata or {"timestamp": datetime.datetime.now().isoformat()}
         self.working_memory[key] = {"value": value, "metadata": metadata}
+        self._record("wm_set", key, self.working_memory[key])
         if self.verbose:
             print(f"Stored in working memory: {key} -> {value}")
         return f"Stored {key} -> {value} in working memory."
@@ -40,6 +68,7 @@ class PrefrontalCortex:
     def clear_working_memory(self):
         """Clear all data from working memory."""
         self.working_memory.clear()
+        self._record("wm_clear")
         if self.verbose:
             print("Cleared all data from working memory.")
         return "Working memory cleared."
@@ -54,7 +83,9 @@ class PrefrontalCortex:
             # Remove the lowest-priority item to make space
             lowest_priority = min(self.cache.items(), key=lambda x: x[1]["metadata"].get("priority", 1))
             del self.cache[lowest_priority[0]]
+            self._record("cache_del", lowest_priority[0])
         self.cache[key] = {"value": value, "metadata": metadata}
+        self._record("cache_set", key, self.cache[key])
 
     def retrieve_from_cache(self, key):
         """Retrieve data from cache."""
@@ -63,10 +94,25 @@ class PrefrontalCortex:
     def clear_cache(self):
         """Clear all data from cache."""
         self.cache.clear()
+        self._record("cache_clear")
         if self.verbose:
             print("Cleared all data from cache.")
 
     ### TASK MANAGEMENT ###
+    def decide_task(self, input_data):
+        """Turn one input ({"type": ..., "data": ...}) into a task for the orchestrator to route."""
+        self.decisions += 1
+        return {
+            "task_id": self.decisions,
+            "type": input_data.get("type", "unknown") if isinstance(input_data, dict) else "unknown",
+            "data": input_data.get("data") if isinstance(input_data, dict) else input_data,
+            "timestamp": datetime.datetime.now().isoformat(),
+        }
+
+    def decide_tasks(self, inputs):
+        """Decide tasks for a batch of inputs, in order."""
+        return [self.decide_task(input_data) for input_data in inputs]
+
     def add_task(self, task_name, priority="normal", metadata=None):
         """Add a task to the queue with priority."""
         try:
@@ -88,8 +134,10 @@ class PrefrontalCortex:
                 else {"low": 1, "normal": 2, "high": 3}.get(metadata["priority"], 2)
             )
 
-            self.task_queue.append({"task_name": task_name, "metadata": metadata, "priority_value": priority_value})
+            task = {"task_name": task_name, "metadata": metadata, "priority_value": priority_value}
+            self.task_queue.append(task)
             self.task_queue.sort(key=lambda x: x["priority_value"], reverse=True)  # Sort by priority
+            self._record("task_add", task)
 
             if self.verbose:
                 print(f"Task added: {task_name} with priority {priority}")
@@ -98,15 +146,20 @@ class PrefrontalCortex:
             self.logger.log_error("PrefrontalCortex.add_task", str(e))
             return f"Error adding task: {e}"
 
-    def view_archived_tasks(self):
-        """View all archived tasks."""
-        return self.completed_tasks
+    def view_archived_tasks(self, page=1, page_size=50, start=None, end=None, status=None):
+        """View archived tasks one page at a time, newest first, optionally within a time range."""
+        return self.task_archive.query(page=page, page_size=page_size, start=start, end=end, status=status)
+
+    def archived_task_stats(self, start=None, end=None):
+        """Summarize archived tasks: success rate, retries and latency."""
+        return self.task_archive.stats(start=start, end=end)
 
     def process_next_task(self):
         """Process the next task in the queue."""
         if not self.task_queue:
             return "No tasks in the queue."
         task = self.task_queue.pop(0)
+        self._record("task_pop")
         if self.verbose:
             print(f"Processing task: {task['task_name']} with metadata: {task['metadata']}")
         # Add task execution logic here (e.g., delegate to other regions)
@@ -122,7 +175,7 @@ class PrefrontalCortex:
             try:
                 time_elapsed = (datetime.datetime.now() - datetime.datetime.fromisoformat(timestamp)).total_seconds()
             except (TypeError, ValueError):
-                self.logger.log_error("adjust_task_priorities", f"Invalid timestamp for task: {task.get('task_name', 'Unknown')}")
+                self.logger.log_error("PrefrontalCortex.adjust_task_priorities", f"Invalid timestamp for task: {task.get('task_name', 'Unknown')}")
                 time_elapsed = float("inf")  # Assign a very high value to deprioritize
 
             # Normalize priority
@@ -132,8 +185,13 @@ class PrefrontalCortex:
             # Adjust priority score
             task["metadata"]["priority_score"] = priority_factor / (1 + time_elapsed)
 
-        # Sort tasks by recalculated priority scores
-        self.task_queue.sort(key=lambda x: x["metadata"].get("priority_score", 0), reverse=True)
+        # Sort tasks by recalculated priority scores; only a changed order is journaled, as queue positions
+        # (scores derive from timestamps, so they are recomputed on the next adjustment after a restore)
+        queue = self.task_queue
+        order = sorted(range(len(queue)), key=lambda i: queue[i]["metadata"].get("priority_score", 0), reverse=True)
+        if order != list(range(len(queue))):
+            queue[:] = [queue[i] for i in order]
+            self._record("queue_order", order)
 
         if self.verbose:
             print("Task priorities adjusted dynamically.")
@@ -146,12 +204,13 @@ class PrefrontalCortex:
         # Find the task
         task = next((t for t in self.task_queue if t["task_name"] == task_name), None)
         if not task:
-            self.logger.log_error("feedback_loop", f"Task '{task_name}' not found in task queue.")
+            self.logger.log_error("PrefrontalCortex.feedback_loop", f"Task '{task_name}' not found in task queue.")
             return f"Task '{task_name}' not found."
 
         if status == "success":
-            self.completed_tasks.append(task)  # Archive successful task
+            self.task_archive.archive(task, "success")  # Archive successful task
             self.task_queue.remove(task)
+            self._record("task_done", task_name)
             if self.verbose:
                 print(f"Task '{task_name}' completed successfully and archived.")
         elif status == "failure":
@@ -160,16 +219,102 @@ class PrefrontalCortex:
 
             if retries > 3:  # Limit retries to 3
                 self.task_queue.remove(task)
-                self.logger.log_error("feedback_loop", f"Task '{task_name}' exceeded retry limit and was removed.")
+                self.task_archive.archive(task, "failure")
+                self._record("task_remove", task_name)
+                self.logger.log_error("PrefrontalCortex.feedback_loop", f"Task '{task_name}' exceeded retry limit and was removed.")
                 if self.verbose:
                     print(f"Task '{task_name}' exceeded retry limit and removed from queue.")
             else:
                 task["metadata"]["priority"] = "low"  # Set priority to low after failure
-                self.logger.log_error("feedback_loop", f"Task '{task_name}' failed and was requeued with retries: {retries}.")
+                self._record("task_update", task_name, task["metadata"])
+                self.logger.log_error("PrefrontalCortex.feedback_loop", f"Task '{task_name}' failed and was requeued with retries: {retries}.")
                 if self.verbose:
                     print(f"Task '{task_name}' failed. Priority reduced and requeued with retry count: {retries}.")
 
 
+    ### STATE PERSISTENCE ###
+    def _record(self, op, *args):
+        """Journal a state change and take a snapshot once one is due."""
+        if self.state_store is None or not self.state_store.active:
+            return
+        self.state_store.append(op, *args)
+        if self.state_store.snapshot_due():
+            self.snapshot_state()
+
+    def _export_state(self):
+        return {
+            "working_memory": self.working_memory,
+            "cache": self.cache,
+            "task_queue": self.task_queue,
+        }
+
+    def _apply_record(self, op, args):
+        """Replay a single journal record onto the in-memory state."""
+        if op == "wm_set":
+            self.working_memory[args[0]] = args[1]
+        elif op == "wm_del":
+            self.working_memory.pop(args[0], None)
+        elif op == "wm_clear":
+            self.working_memory.clear()
+        elif op == "cache_set":
+            self.cache[args[0]] = args[1]
+        elif op == "cache_del":
+            self.cache.pop(args[0], None)
+        elif op == "cache_clear":
+            self.cache.clear()
+        elif op == "task_add":
+            self.task_queue.append(args[0])
+            self.task_queue.sort(key=lambda x: x["priority_value"], reverse=True)
+        elif op == "task_pop":
+            if self.task_queue:
+                self.task_queue.pop(0)
+        elif op == "queue_order":
+            if len(args[0]) == len(self.task_queue):
+                self.task_queue[:] = [self.task_queue[i] for i in args[0]]
+        elif op == "queue_set":  # Journals written before queue_order
+            self.task_queue = list(args[0])
+        else:
+            task = next((t for t in self.task_queue if t["task_name"] == args[0]), None)
+            if task is None:
+                return
+            if op in ("task_done", "task_remove"):
+                self.task_queue.remove(task)  # Already recorded in the task archive
+            elif op == "task_update":
+                task["metadata"] = args[1]
+
+    def snapshot_state(self):
+        """Write a full snapshot of working memory, cache and the task queue, and reset the journal."""
+        if self.state_store is None:
+            return "State persistence disabled."
+        try:
+            self.state_store.write_snapshot(self._export_state())
+            if self.verbose:
+                print(f"Snapshot written to {self.state_store.snapshot_path}")
+            return "State snapshot written."
+        except Exception as e:
+            self.logger.log_error("PrefrontalCortex.snapshot_state", str(e))
+            return f"Error writing state snapshot: {e}"
+
+    def restore_state(self):
+        """Reload state from the last snapshot plus journal, then start journaling new changes."""
+        if self.state_store is None:
+            return "State persistence disabled."
+        try:
+            state, records = self.state_store.load()
+            if state:
+                self.working_memory = state["working_memory"]
+                self.cache = state["cache"]
+                self.task_queue = state["task_queue"]
+            for op, args in records:
+                self._apply_record(op, args)
+            self.state_store.open_journal()
+            if self.verbose:
+                print(f"Restored {len(self.task_queue)} queued tasks and replayed {len(records)} journal records.")
+            return f"Restored state with {len(self.task_queue)} queued tasks."
+        except Exception as e:
+            self.logger.log_error("PrefrontalCortex.restore_state", str(e))
+            return f"Error restoring state: {e}"
+
     ### DELEGATION ###
     def delegate_task(self, orchestrator, task_name, target_region, *args, **kwargs):
         """
@@ -178,6 +323,19 @@ class PrefrontalCortex:
         if self.verbose:
             print(f"Delegating task '{task_name}' to {target_region}")
         return orchestrator.route_task(target_region, task_name, *args, **kwargs)
+
+    def delegate_tasks(self, orchestrator, tasks):
+        """
+        Delegate a batch of tasks at once so regions served by the worker pool process them in parallel.
+        Each task is a dict with "target_region", "task_name" and optional "args"/"kwargs".
+        """
+        calls = [
+            (task["target_region"], task["task_name"], tuple(task.get("args", ())), task.get("kwargs", {}))
+            for task in tasks
+        ]
+        if self.verbose:
+            print(f"Delegating {len(calls)} tasks in parallel")
+        return orchestrator.route_tasks_parallel(calls)
     
     def delegate_to_cerebellum(self, task_name, workflow_name, *args, **kwargs):
         """Delegate a procedural task to the Cerebellum."""
@@ -195,37 +353,66 @@ class PrefrontalCortex:
 
     def route_to_memory_region(self, target_agent, method, *args, **kwargs):
         """Route tasks intelligently to memory regions."""
-        if hasattr(target_agent, "instance"):
-            target_instance = target_agent.instance  # Access the actual instance
-            if hasattr(target_instance, method):
-                return getattr(target_instance, method)(*args, **kwargs)
-            else:
-                return f"Method {method} not found in {target_instance.__class__.__name__}."
-        else:
+        target_instance = getattr(target_agent, "instance", None)  # Access the actual instance
+        if target_instance is None:
             return f"Unknown memory region: {target_agent}"
+        key = id(target_instance)  # Unregistered automatically when the instance is collected
+        if not self.method_handles.is_registered(key):
+            self.method_handles.register(key, target_instance)
+        handle = self.method_handles.resolve(key, method)
+        if handle is None:
+            return f"Method {method} not found in {target_instance.__class__.__name__}."
+        return handle(*args, **kwargs)
         
     def decide_target_region(self, task):
-        """Determine the best memory region for the task."""
-        if "emotion" in task["metadata"].get("tags", []):
-            return "Amygdala"
-        elif "factual" in task["metadata"].get("tags", []):
-            return "Hippocampus"
-        return "Default"
+        """Determine the best memory region for the task using the routing table."""
+        return self.routing_table.resolve(task)
+
+    def routing_stats(self):
+        """Return routing table hit/miss counts and rule evaluation time."""
+        return self.routing_table.get_stats()
 
     ### LLM REASONING ###
-    def llm_reasoning(self, prompt, model_name="prefrontal_cortex"):
+    def llm_reasoning(self, prompt, model_name="prefrontal_cortex", use_cache=True, **params):
+        """
+        Send a prompt to the configured LLM.
+        Successful responses are cached by (model, prompt, params); pass use_cache=False to bypass the cache.
+        """
+        model = LLM_MODELS[model_name]
+        cache_key = None
+        if use_cache and self.llm_cache is not None:
+            cache_key = self.llm_cache.make_key(model, prompt, params)
+            cached = self.llm_cache.get(cache_key)
+            if cached is not None:
+                REGISTRY.counter("elliot_llm_cache_hits_total", "LLM responses served from the cache", model=model).inc()
+                return cached
+
+        import requests  # Deferred: only needed once a prompt misses the cache
+
         headers = {"Authorization": f"Bearer {API_KEYS['openai']}"}
         try:
-            response = requests.post(
-                LLM_URLS[model_name],
-                json={"prompt": prompt, "model": LLM_MODELS[model_name]},
-                headers=headers
-            )
+            with REGISTRY.time("elliot_llm_request_seconds", "LLM request latency in seconds", region="Prefrontal Cortex", model=model):
+                response = requests.post(
+                    LLM_URLS[model_name],
+                    json={"prompt": prompt, "model": model, **params},
+                    headers=headers
+                )
             if response.status_code == 200:
-                return response.json().get("content", "No response content")
+                body = response.json()
+                if "content" not in body:
+                    return "No response content"  # Not cached, so the next call retries the request
+                if cache_key is not None:
+                    self.llm_cache.put(cache_key, body["content"])
+                return body["content"]
             return f"Error: {response.status_code} - {response.text}"
         except requests.exceptions.RequestException as e:
             return f"Request failed: {e}"
+
+    def llm_cache_stats(self):
+        """Return hit/miss metrics for the LLM response cache."""
+        if self.llm_cache is None:
+            return "LLM cache disabled."
+        return self.llm_cache.stats()
         
     def log_error(self, message, exception):
         """Log errors for debugging."""
@@ -1,84 +1,131 @@
 import os
-import yaml
 import datetime
 import time
 import shutil
+import importlib
+import threading
 from pathlib import Path
 
 from agents.agent import Agent
 from config.settings import LLM_URLS, API_KEYS, LLM_MODELS
+from utils.config import load_config
 from utils.logger import ErrorLogger
+from utils.metrics import REGISTRY
+from utils.routing import MethodRegistry
+
+# Region attribute (and config section) -> (agent name, module, class). Region modules are
+# imported, and regions constructed, on first use; see Orchestrator.region.
+REGIONS = {
+    "prefrontal_cortex": ("Task Coordinator", "brain_regions.prefrontal_cortex", "PrefrontalCortex"),
+    "hippocampus": ("Declarative Memory", "brain_regions.hippocampus", "Hippocampus"),
+    "cerebellum": ("Procedural Memory", "brain_regions.cerebellum", "Cerebellum"),
+    "amygdala": ("Emotional Memory", "brain_regions.amygdala", "Amygdala"),
+    "association_cortex": ("Contextual Memory", "brain_regions.association_cortex", "AssociationCortex"),
+}
+
+
+def _region_property(attribute):
+    return property(lambda self: self.region(attribute), doc=f"The {attribute} region, built on first access.")
 
-from brain_regions.hippocampus import Hippocampus
-from brain_regions.prefrontal_cortex import PrefrontalCortex
-from brain_regions.cerebellum import Cerebellum
-from brain_regions.amygdala import Amygdala
-from brain_regions.association_cortex import AssociationCortex
 
 class Orchestrator:
+    prefrontal_cortex = _region_property("prefrontal_cortex")
+    hippocampus = _region_property("hippocampus")
+    cerebellum = _region_property("cerebellum")
+    amygdala = _region_property("amygdala")
+    association_cortex = _region_property("association_cortex")
+
     def __init__(self, config_path="config/agents.yaml"):
-        self.logger = ErrorLogger("logs/system_log.txt")
         self.config = self.load_config(config_path)
+        self.logger = ErrorLogger("logs/system_log.txt", **self.config.get("logging", {}))
         self.agents = {}
+        self.method_registry = MethodRegistry()  # Method handles resolved once per registered agent
+        self.worker_pool = None
+        self.metrics = REGISTRY
+        self.route_metrics = {}  # (agent, task) -> (latency histogram, error counter)
+        self.middleware = None
+        middleware_config = self.config.get("orchestrator", {}).get("middleware") or {}
+        if middleware_config.get("enabled", False):
+            from utils.route_middleware import build_middleware
+            self.middleware = build_middleware(self.logger, middleware_config)
+        self.runtime = None
+        self.regions = {}  # attribute -> constructed region
+        self.region_attributes = {agent_name: attribute for attribute, (agent_name, _, _) in REGIONS.items()}
+        self.region_lock = threading.Lock()
+        self.region_call_locks = {}  # agent name -> lock serializing in-process calls to that region
+        self.recall_fanout = None  # Thread pool for recall() fan-out, created on first use
+        self.feedback_since = datetime.datetime.now().isoformat()  # perform_feedback_loops picks up from here
 
     def load_config(self, path):
-        with open(path, "r") as file:
-            return yaml.safe_load(file)
-
-    def initialize_agents(self):
-        # Shared resources
-        shared_logger = self.logger
-
-        # Initialize agents
-        self.hippocampus = Hippocampus(
-            logger=shared_logger, 
-            db_file=self.config["hippocampus"].get("db_file", "data/hippocampus.db"),
-            **self.config["hippocampus"]
-        )
-
-        self.cerebellum = Cerebellum(
-            logger=shared_logger,
-            **self.config["cerebellum"]
-        )
+        """Parsed config, shared with everything else that reads the same file."""
+        return load_config(path)
 
-        self.prefrontal_cortex = PrefrontalCortex(
-            logger=shared_logger,
-            **self.config["prefrontal_cortex"]
-        )
+    def initialize_agents(self, lazy=None):
+        """
+        Set up the regions. By default (orchestrator.lazy_regions) each region's module is imported and the
+        region constructed the first time it is used; with lazy=False every region is built now.
+        """
+        if lazy is None:
+            lazy = self.config.get("orchestrator", {}).get("lazy_regions", True)
+        pool_config = self.config.get("orchestrator", {}).get("worker_pool", {})
+        if pool_config.get("enabled", False):
+            self.start_worker_pool(
+                pool_config.get("num_workers"), pool_config.get("regions"), pool_config.get("start_method", "spawn")
+            )
+        if not lazy:
+            for attribute, (agent_name, _, _) in REGIONS.items():
+                if not self._served_by_pool(agent_name):
+                    self.region(attribute)
+        self.start_metrics_export()
 
-        self.amygdala = Amygdala(
-            logger=shared_logger,
-            db_file=self.config["amygdala"].get("db_file", "data/amygdala.db"),  
-            **{k: v for k, v in self.config["amygdala"].items() if k != "db_file"} 
+    def region(self, attribute):
+        """
+        The region stored under `attribute` (e.g. "hippocampus"), constructed and registered on first use.
+        A region served by the worker pool is never built in-process; its methods are forwarded to the worker instead.
+        """
+        if self._served_by_pool(REGIONS[attribute][0]):
+            return self.worker_pool.proxy(REGIONS[attribute][0])
+        instance = self.regions.get(attribute)
+        if instance is None:
+            with self.region_lock:
+                instance = self.regions.get(attribute)
+                if instance is None:
+                    instance = self.regions[attribute] = self._build_region(attribute)
+        return instance
+
+    def _served_by_pool(self, agent_name):
+        return self.worker_pool is not None and agent_name in self.worker_pool.regions
+
+    def _build_region(self, attribute):
+        agent_name, module_name, class_name = REGIONS[attribute]
+        start = time.perf_counter()
+        region_class = getattr(importlib.import_module(module_name), class_name)
+        instance = region_class(logger=self.logger, **self.config.get(attribute, {}))
+        if attribute == "prefrontal_cortex":
+            instance.restore_state()  # Reload working memory and in-flight tasks
+        self.register_agent(agent_name, instance)
+        elapsed = time.perf_counter() - start
+        self.logger.log_info(
+            "Orchestrator", "Initialized %s in %.3fs", agent_name, elapsed,
+            operation="initialize_region", duration=round(elapsed, 6),
         )
+        return instance
 
-        self.association_cortex = AssociationCortex(
-            logger=shared_logger,
-            **self.config["association_cortex"]
-        )
-        self.agents["Contextual Memory"] = self.association_cortex
-        print("AssociationCortex initialized successfully.")
+    def register_agent(self, agent_name, instance):
+        """Register an agent and cache its method handles for route_task."""
+        self.agents[agent_name] = instance
+        self.method_registry.register(agent_name, instance)
+        self.region_call_locks.setdefault(agent_name, threading.RLock())
 
     def run_main_tasks(self):
         """
         The central processing loop for the orchestrator, coordinating agents to perform tasks.
         Inspired by the brain's functional flow: Sense → Process → Store → Act.
         """
-        # 1. Sense: Gather inputs
-        inputs = self.gather_inputs()  # External inputs (e.g., data streams, user commands)
+        import asyncio
 
-        # 2. Prefrontal Cortex: Decide what to do based on inputs
-        for input_data in inputs:
-            task = self.prefrontal_cortex.decide_task(input_data)  # Determines the task and assigns agents
-
-            # 3. Process: Route tasks to relevant agents
-            if task["type"] == "update_context":
-                self.agents["Association Cortex"].add_node(task["data"])
-            elif task["type"] == "emotional_analysis":
-                self.agents["Amygdala"].process_emotion(task["data"])
-
-            # 4. Store: Save results or feedback in memory
-            self.hippocampus.store_recent_action(task)
+        # 1-4. Sense → Decide → Process → Store, in micro-batches
+        asyncio.run(self.run_pipeline(self.input_stream()))
 
         # 5. Act: Trigger external-facing actions
         outputs = self.trigger_actions()  # Generate outputs for external systems (e.g., user feedback)
@@ -86,6 +133,81 @@ class Orchestrator:
         # Feedback Loop: Agents update one another based on results
         self.perform_feedback_loops()
 
+    def handle_input(self, input_data):
+        """Decide on, route and record the task for one input."""
+        return self.handle_inputs([input_data])
+
+    def handle_inputs(self, inputs):
+        """Run a batch of inputs through the decide, process and store stages."""
+        return self.store_actions(self.process_tasks(self.decide_tasks(inputs)))
+
+    # Pipeline stages; each takes a batch and makes one bulk call per region
+
+    def decide_tasks(self, inputs):
+        """2. Prefrontal Cortex: Decide what to do for each input."""
+        tasks = self.route_task("Task Coordinator", "decide_tasks", list(inputs))
+        if isinstance(tasks, str):
+            raise RuntimeError(tasks)
+        return tasks
+
+    def process_tasks(self, tasks):
+        """3. Process: Route the batch's tasks to the relevant regions, one bulk call per region."""
+        nodes, emotions = [], []
+        for task in tasks:
+            data = task.get("data")
+            if not isinstance(data, dict):
+                continue
+            if task["type"] == "update_context" and data.get("id") is not None:
+                nodes.append((data["id"], data))
+            elif task["type"] == "emotional_analysis" and (data.get("key") or data.get("id")):
+                emotions.append((str(data.get("key") or data["id"]), data.get("value", data), data.get("metadata"),
+                                 data.get("sentiment", "neutral")))
+        if nodes:
+            self.route_task("Contextual Memory", "add_nodes_bulk", nodes)
+        if emotions:
+            self.route_task("Emotional Memory", "store_emotional_memories", emotions)
+        return tasks
+
+    def store_actions(self, tasks):
+        """4. Store: Record the batch's tasks as recent actions in declarative memory."""
+        items = [
+            (f"action:{task['timestamp']}:{task['task_id']}", task,
+             {"priority": "low", "timestamp": task["timestamp"], "tags": ["action", task["type"]]})
+            for task in tasks
+        ]
+        if items:
+            self.route_task("Declarative Memory", "store_many", items)
+        return tasks
+
+    async def input_stream(self, polls=1, interval=1.0):
+        """gather_inputs() as an async iterator: `polls` polls (None for endless), `interval` seconds apart."""
+        import asyncio
+
+        count = 0
+        while polls is None or count < polls:
+            for input_data in self.gather_inputs():
+                yield input_data
+            count += 1
+            if polls is None or count < polls:
+                await asyncio.sleep(interval)
+
+    async def run_pipeline(self, source=None):
+        """
+        Stream inputs through decide → process → store in micro-batches (orchestrator.pipeline config:
+        batch_size, linger, max_pending). Returns per-stage stats.
+        """
+        from utils.pipeline import BatchPipeline
+
+        config = self.config.get("orchestrator", {}).get("pipeline", {})
+        pipeline = BatchPipeline(
+            [("decide", self.decide_tasks), ("process", self.process_tasks), ("store", self.store_actions)],
+            batch_size=config.get("batch_size", 64),
+            linger=config.get("linger", 0.05),
+            max_pending=config.get("max_pending", 2),
+            logger=self.logger,
+        )
+        return await pipeline.run(self.input_stream() if source is None else source)
+
     def gather_inputs(self):
         """Simulate gathering external inputs (e.g., user commands, sensors, logs)."""
         return [{"type": "update_context", "data": {"id": "node_1", "value": "test"}}]
@@ -95,25 +217,347 @@ class Orchestrator:
         return [{"action": "print", "message": "Action performed!"}]
 
     def perform_feedback_loops(self):
-        """Simulate updating agents based on feedback from their outputs."""
-        # Example: Association Cortex updates the Hippocampus
-        recent_contexts = self.agents["Association Cortex"].get_recent_nodes()
-        self.agents["Hippocampus"].update_context_memory(recent_contexts)    
+        """Update agents based on feedback from their outputs."""
+        # Association Cortex updates the Hippocampus: contexts stamped since the last run become declarative memories
+        since, self.feedback_since = self.feedback_since, datetime.datetime.now().isoformat()
+        recent_contexts = self.route_task("Contextual Memory", "query_nodes", timestamp={"min": since})
+        if isinstance(recent_contexts, str) or not recent_contexts:
+            return recent_contexts
+        items = [
+            (f"context:{node_id}", self.route_task("Contextual Memory", "get_node_data", node_id),
+             {"priority": "low", "timestamp": self.feedback_since, "tags": ["context"]})
+            for node_id in recent_contexts
+        ]
+        return self.route_task("Declarative Memory", "store_many", items)
+
+    ### RUNTIME ###
+
+    def start_runtime(self):
+        """
+        Build the event-driven runtime and schedule the periodic jobs from the orchestrator.runtime config:
+        input polling, feedback loops, time-based and event-based purging, and task priority aging.
+        """
+        from utils.runtime import OrchestratorRuntime
+
+        config = self.config.get("orchestrator", {}).get("runtime", {})
+        runtime = self.runtime = OrchestratorRuntime(self, **config)
+        retention_days = config.get("purge_retention_days", 30)
+        time_budget = config.get("purge_time_budget", 0.05)
+
+        def poll_inputs():
+            for input_data in self.gather_inputs():
+                runtime.submit(input_data)
+
+        def purge():
+            result = self.purge_context_data(retention_days=retention_days, time_budget=time_budget)
+            if isinstance(result, dict) and not result.get("complete", True):
+                return config.get("purge_resume_interval", 0.1)  # Resume the unfinished purge soon
+
+        def monitor():
+            result = self.monitor_and_purge_context_data(
+                node_limit=config.get("node_limit", 10000), edge_limit=config.get("edge_limit", 50000),
+                retention_days=retention_days, time_budget=time_budget,
+            )
+            if isinstance(result, dict) and not result.get("complete", True):
+                return config.get("purge_resume_interval", 0.1)
+
+        def feedback():
+            self.trigger_actions()
+            self.perform_feedback_loops()
+
+        if config.get("input_poll_interval"):
+            runtime.every("gather_inputs", config["input_poll_interval"], poll_inputs, delay=0)
+        if config.get("feedback_interval"):
+            runtime.every("feedback_loops", config["feedback_interval"], feedback)
+        runtime.every("purge", config.get("purge_interval", 3600), purge)
+        if config.get("monitor_interval"):
+            runtime.every("monitor_and_purge", config["monitor_interval"], monitor)
+        if config.get("priority_aging_interval"):
+            runtime.every("adjust_task_priorities", config["priority_aging_interval"], self.adjust_task_priorities)
+        return runtime
+
+    def submit_input(self, input_data):
+        """Hand an input to the running runtime; it is handled right away instead of on the next poll."""
+        if self.runtime is None:
+            return self.handle_input(input_data)
+        self.runtime.submit(input_data)
+        return "Input queued."
+
+    def has_pending_tasks(self):
+        return bool(self.prefrontal_cortex.task_queue)
+
+    def shutdown(self):
+        """Persist state and stop background work; regions that were never used are left alone."""
+        if self.runtime is not None:
+            self.runtime.stop()
+        if "prefrontal_cortex" in self.regions:
+            self.prefrontal_cortex.snapshot_state()
+        self.stop_worker_pool()
+        if self.recall_fanout is not None:
+            self.recall_fanout.shutdown()
+            self.recall_fanout = None
+        if "association_cortex" in self.regions:
+            self.association_cortex.flush_graph()
+        self.logger.close()
+
+    ### WORKER POOL ###
+
+    def worker_region_specs(self, regions=None):
+        """Describe how worker processes should build each memory region."""
+        specs = {
+            "Declarative Memory": {"module": "brain_regions.hippocampus", "class": "Hippocampus", "kwargs": self.config["hippocampus"]},
+            "Procedural Memory": {"module": "brain_regions.cerebellum", "class": "Cerebellum", "kwargs": self.config["cerebellum"]},
+            "Emotional Memory": {"module": "brain_regions.amygdala", "class": "Amygdala", "kwargs": self.config["amygdala"]},
+            "Contextual Memory": {"module": "brain_regions.association_cortex", "class": "AssociationCortex", "kwargs": self.config["association_cortex"]},
+        }
+        if regions is None:
+            return specs
+        return {name: spec for name, spec in specs.items() if name in regions}
+
+    def start_worker_pool(self, num_workers=None, regions=None, start_method="spawn"):
+        """
+        Serve memory regions from worker processes.
+        Args:
+            num_workers (int): Number of processes; defaults to one per CPU core.
+            regions (dict): Agent name -> shard mode ("region" or "key"). Defaults to every memory region, sharded by region.
+                Regions already built in-process stay in-process, so there is only ever one copy of each.
+            start_method (str): multiprocessing start method for the workers.
+        """
+        if self.worker_pool is not None:
+            return "Worker pool already running."
+        from utils.worker_pool import WorkerPool
+
+        regions = dict(regions or {name: "region" for name in self.worker_region_specs()})
+        built = {self.region_attributes.get(name) for name in regions} & set(self.regions)
+        for attribute in built:
+            agent_name = REGIONS[attribute][0]
+            self.logger.log_warning("Orchestrator", "%s is already running in-process; not moving it to the worker pool.", agent_name)
+            regions.pop(agent_name)
+        if not regions:
+            return "No regions left to serve from the worker pool."
+        self.worker_pool = WorkerPool(
+            self.worker_region_specs(regions),
+            num_workers=num_workers,
+            shard_by=regions,
+            log_file=self.logger.log_file,
+            start_method=start_method,
+        )
+        self.worker_pool.start()
+        print(f"Worker pool started with {self.worker_pool.num_workers} workers for: {', '.join(regions)}")
+        return "Worker pool started."
+
+    def stop_worker_pool(self):
+        """Stop worker processes and route every call in-process again."""
+        if self.worker_pool is None:
+            return "Worker pool not running."
+        self.worker_pool.stop()
+        self.worker_pool = None
+        return "Worker pool stopped."
+
+    def route_tasks_parallel(self, calls):
+        """
+        Route several calls at once; calls served by the worker pool run concurrently.
+        Args:
+            calls (list): (agent_name, task_name, args, kwargs) tuples.
+        Returns:
+            list: Results in the same order as `calls`.
+        """
+        pending = []
+        for agent_name, task_name, args, kwargs in calls:
+            if self.worker_pool is not None and agent_name in self.worker_pool.regions:
+                try:
+                    pending.append(self.worker_pool.submit(agent_name, task_name, *args, **kwargs))
+                except Exception as e:
+                    self.logger.log_error(agent_name, "Failed to route task %s: %s", task_name, e, operation=task_name)
+                    pending.append(f"Error routing task: {e}")
+            else:
+                pending.append(self.route_task(agent_name, task_name, *args, **kwargs))
+
+        results = []
+        for (agent_name, task_name, _, _), item in zip(calls, pending):
+            if hasattr(item, "result"):
+                try:
+                    item = item.result()
+                except Exception as e:
+                    self.logger.log_error(agent_name, "Failed to route task %s: %s", task_name, e, operation=task_name)
+                    item = f"Error routing task: {e}"
+            results.append(item)
+        return results
+
+    ### RECALL (cross-region fan-out) ###
+
+    def recall(self, query, deadline=None):
+        """
+        Query the memory regions concurrently and merge their answers into one ranking.
+        Args:
+            query (str | dict): A string searches every region for it (as a tag, node, workflow tag and sentiment).
+                A dict picks the lookups: tags, sentiment, node_id (with depth), workflow_tag; plus limit and regions
+                (agent names to restrict the fan-out to).
+            deadline (float): Seconds each region gets; defaults to the per-region deadlines in orchestrator.recall.
+        Returns:
+            dict: "results" ranked best first ({"key", "score", "sources", "items"}), "regions" with each lookup's
+            status ("ok", "error", "timeout", or "busy" while an earlier timed-out lookup is still running) and seconds,
+            "partial" when any lookup didn't answer, and "seconds" for the whole call, which is about the slowest
+            region rather than the sum. Each lookup holds its region's call lock, like any routed call.
+        """
+        from utils.fanout import FanOut, reciprocal_rank_fusion
+
+        start = time.perf_counter()
+        config = self.config.get("orchestrator", {}).get("recall", {})
+        if isinstance(query, str):
+            query = {"tags": [query], "sentiment": query, "node_id": query, "workflow_tag": query}
+        tags = query.get("tags") or []
+        tags = [tags] if isinstance(tags, str) else list(tags)
+        limit = query.get("limit", config.get("limit", 20))
+
+        lookups = {}
+        if tags:
+            lookups["Declarative Memory"] = lambda: self.route_task("Declarative Memory", "retrieve_by_tags", tags)
+        if query.get("sentiment"):
+            lookups["Emotional Memory"] = lambda: self.route_task("Emotional Memory", "retrieve_by_sentiment", query["sentiment"], limit)
+        if query.get("node_id") is not None:
+            lookups["Contextual Memory"] = lambda: self.route_task("Contextual Memory", "find_related_nodes", query["node_id"], query.get("depth", 1))
+        workflow_tag = query.get("workflow_tag") or (tags[0] if tags else None)
+        if workflow_tag:
+            lookups["Procedural Memory"] = lambda: self.route_task("Procedural Memory", "retrieve_workflows_by_metadata", tag=workflow_tag)
+        if query.get("regions"):
+            lookups = {name: lookup for name, lookup in lookups.items() if name in query["regions"]}
+
+        if self.recall_fanout is None:
+            with self.region_lock:
+                if self.recall_fanout is None:
+                    self.recall_fanout = FanOut(config.get("max_workers", 8), config.get("max_outstanding", 1), "recall")
+        default_deadline = deadline if deadline is not None else config.get("deadline", 0.5)
+        deadlines = {} if deadline is not None else config.get("deadlines", {})
+        outcomes = self.recall_fanout.run(lookups, deadlines, default_deadline)
+
+        ranked = {}
+        for region, outcome in outcomes.items():
+            if outcome["status"] == "ok":
+                ranked[region] = self._recall_hits(region, outcome.pop("value"), query, tags)
+                outcome["count"] = len(ranked[region])
+            else:
+                outcome.pop("value", None)
+                self.logger.log_warning(
+                    "Orchestrator", "recall: %s %s after %.3fs %s", region, outcome["status"], outcome["seconds"],
+                    outcome.get("error", ""), operation="recall",
+                )
+        results = reciprocal_rank_fusion(ranked, config.get("weights"), config.get("rank_constant", 60), limit)
+        elapsed = time.perf_counter() - start
+        self.metrics.histogram("elliot_recall_seconds", "Orchestrator.recall latency in seconds").observe(elapsed)
+        return {
+            "results": results,
+            "regions": outcomes,
+            "partial": any(outcome["status"] != "ok" for outcome in outcomes.values()),
+            "seconds": round(elapsed, 6),
+        }
+
+    def _recall_hits(self, region, value, query, tags):
+        """One region's answer as (key, item) pairs, most relevant first."""
+        if region == "Declarative Memory":
+            wanted = set(tags)
+            value = sorted(value, key=lambda memory: (
+                len(wanted.intersection(memory["metadata"].get("tags", []))), memory["metadata"].get("importance", 0),
+            ), reverse=True)
+            return [(memory["key"], memory) for memory in value]
+        if region == "Emotional Memory":
+            return [(memory["memory_key"], memory) for memory in value]  # Already ordered by intensity
+        if region == "Contextual Memory":
+            return [(node, {"node_id": node}) for node in value if node != query.get("node_id")]  # BFS order, nearest first
+        if region == "Procedural Memory":
+            value = sorted(value, key=lambda workflow: workflow["metadata"].get("timestamp", ""), reverse=True)
+            return [(workflow["name"], workflow) for workflow in value]
+        return []
 
     def route_task(self, agent_name, task_name, *args, **kwargs):
+        start = time.perf_counter()
+        metrics = self.route_metrics.get((agent_name, task_name))
         try:
-            agent = self.agents.get(agent_name)
-            if not agent:
+            if self.middleware is not None and self.middleware.applies(agent_name, task_name):
+                result = self.middleware.run(agent_name, task_name, args, kwargs, self._dispatch)
+            else:
+                result = self._dispatch(agent_name, task_name, args, kwargs)
+
+            duration = time.perf_counter() - start
+            if metrics is None:
+                metrics = self._route_metrics(agent_name, task_name)
+            metrics[0].observe(duration)
+            if self.logger.is_enabled("DEBUG", agent_name):
+                self.logger.log_debug(agent_name, "Completed %s", task_name, operation=task_name, duration=round(duration, 6))
+            return result
+        except Exception as e:
+            if metrics is not None or self.method_registry.resolve(agent_name, task_name) is not None:
+                (metrics or self._route_metrics(agent_name, task_name))[1].inc()
+            self.logger.log_error(agent_name, "Failed to route task %s: %s", task_name, e, operation=task_name)
+            return f"Error routing task: {e}"
+
+    def _dispatch(self, agent_name, task_name, args, kwargs):
+        if self._served_by_pool(agent_name):
+            return self.worker_pool.call(agent_name, task_name, *args, **kwargs)
+        task_method = self.method_registry.resolve(agent_name, task_name)
+        if task_method is None and agent_name in self.region_attributes and agent_name not in self.agents:
+            self.region(self.region_attributes[agent_name])  # First call to a lazily built region
+            task_method = self.method_registry.resolve(agent_name, task_name)
+        if task_method is None:
+            if agent_name not in self.agents:
                 raise ValueError(f"Agent {agent_name} not found.")
+            raise ValueError(f"Task {task_name} not found for Agent {agent_name}.")
+        with self.region_call_locks[agent_name]:  # Regions aren't thread-safe; recall() calls them from pool threads
+            return task_method(*args, **kwargs)
+
+    def _route_metrics(self, agent_name, task_name):
+        metrics = self.route_metrics[(agent_name, task_name)] = (
+            self.metrics.histogram("elliot_route_task_seconds", "route_task latency in seconds", region=agent_name, method=task_name),
+            self.metrics.counter("elliot_route_task_errors_total", "route_task calls that failed", region=agent_name, method=task_name),
+        )
+        return metrics
 
-            task_method = getattr(agent, task_name, None)
-            if not task_method:
-                raise ValueError(f"Task {task_name} not found for Agent {agent_name}.")
+    # Metrics
 
-            return task_method(*args, **kwargs)
-        except Exception as e:
-            self.logger.log_error(f"Failed to route task {task_name} for {agent_name}", str(e))
-            return f"Error routing task: {e}"
+    def start_metrics_export(self):
+        """
+        Register the orchestrator's gauges and start exporting from the orchestrator.metrics config:
+        `export_file` is rewritten every `export_interval` seconds, `port` serves /metrics on 127.0.0.1.
+        """
+        config = self.config.get("orchestrator", {}).get("metrics", {})
+        self.metrics.gauge("elliot_logger_queued_records", "Log records waiting for the writer thread", fn=lambda: len(self.logger.queue))
+        self.metrics.gauge("elliot_logger_dropped_records", "Log records dropped on queue overflow", fn=lambda: self.logger.stats["dropped"])
+        regions = self.regions  # Gauges read built regions only, so exporting never constructs one
+        self.metrics.gauge("elliot_graph_nodes", "Nodes loaded in the context graph",
+                           fn=lambda: regions["association_cortex"].graph.number_of_nodes() if "association_cortex" in regions else 0)
+        self.metrics.gauge("elliot_graph_edges", "Edges loaded in the context graph",
+                           fn=lambda: regions["association_cortex"].graph.number_of_edges() if "association_cortex" in regions else 0)
+        self.metrics.gauge("elliot_task_queue_length", "Tasks waiting in the Prefrontal Cortex queue",
+                           fn=lambda: len(regions["prefrontal_cortex"].task_queue) if "prefrontal_cortex" in regions else 0)
+        if not config.get("enabled", True):
+            return "Metrics export disabled."
+        if config.get("export_file"):
+            self.metrics.start_file_export(config["export_file"], config.get("export_interval", 15))
+        if config.get("port"):
+            self.metrics.serve(config["port"], config.get("host", "127.0.0.1"))
+        return "Metrics export started."
+
+    def slow_call_reports(self, limit=20):
+        """Most recent slow-call reports from the route middleware (region method, argument shape, profile)."""
+        if self.middleware is None:
+            return "Route middleware disabled."
+        return self.middleware.recent_reports(limit)
+
+    def recent_spans(self, limit=100):
+        """Most recent traced spans (trace_id, span_id, parent_id, region, method, duration)."""
+        if self.middleware is None:
+            return "Route middleware disabled."
+        return self.middleware.recent_spans(limit)
+
+    def export_metrics(self, path=None):
+        """Return the Prometheus text snapshot, or write it to `path` and return the path."""
+        if path is None:
+            return self.metrics.to_prometheus()
+        return self.metrics.write_prometheus(path)
+
+    def metrics_snapshot(self):
+        """Per-metric values, including p50/p95/p99 for every region and method."""
+        return self.metrics.snapshot()
 
     def safe_route_task(self, agent_role, method_name, *args, **kwargs):
         try:
@@ -186,9 +630,13 @@ class Orchestrator:
         """Store data in working memory."""
         return self.route_task("Task Coordinator", "add_to_working_memory", key, value, metadata)
     
-    def view_archived_tasks(self):
+    def view_archived_tasks(self, page=1, page_size=50, start=None, end=None, status=None):
         """Expose archived tasks from Prefrontal Cortex."""
-        return self.route_task("Task Coordinator", "view_archived_tasks")
+        return self.route_task("Task Coordinator", "view_archived_tasks", page, page_size, start, end, status)
+
+    def archived_task_stats(self, start=None, end=None):
+        """Expose aggregate stats over archived tasks."""
+        return self.route_task("Task Coordinator", "archived_task_stats", start, end)
 
     def retrieve_from_working_memory(self, key):
         """Retrieve data from working memory."""
@@ -202,9 +650,12 @@ class Orchestrator:
         """Add a task to the Prefrontal Cortex task queue."""
         valid_priorities = {"high", "normal", "low"}
         if priority not in valid_priorities:    
-            self.logger.log_error("add_task", f"Invalid priority: {priority}")  
+            self.logger.log_error("Orchestrator.add_task", f"Invalid priority: {priority}")  
             raise ValueError(f"Invalid priority '{priority}'. Must be one of {valid_priorities}.")  
-        return self.route_task("Task Coordinator", "add_task", task_name, priority, metadata)
+        result = self.route_task("Task Coordinator", "add_task", task_name, priority, metadata)
+        if self.runtime is not None:
+            self.runtime.notify()
+        return result
 
     def process_next_task(self):
         """Process the next task in the Prefrontal Cortex task queue."""
@@ -304,10 +755,22 @@ class Orchestrator:
         """Update data associated with a relationship between two nodes."""
         return self.route_task("Contextual Memory", "update_relationship_data", node1, node2, new_data)
 
+    def add_context_nodes_bulk(self, nodes, batch_size=10000):
+        """Add many nodes (an iterable or a .csv/.jsonl path) to the Association Cortex graph."""
+        return self.route_task("Contextual Memory", "add_nodes_bulk", nodes, batch_size)
+
+    def add_context_relationships_bulk(self, relationships, relationship_type="related", batch_size=10000):
+        """Add many relationships (an iterable or a .csv/.jsonl path) to the Association Cortex graph."""
+        return self.route_task("Contextual Memory", "add_relationships_bulk", relationships, relationship_type, batch_size)
+
     def find_related_contexts(self, node_id, depth=1):
         """Find related nodes to a given node."""
         return self.route_task("Contextual Memory", "find_related_nodes", node_id, depth)
 
+    def find_related_contexts_many(self, node_ids, depth=1):
+        """Find related nodes for several nodes with one shared traversal."""
+        return self.route_task("Contextual Memory", "find_related_nodes_many", node_ids, depth)
+
     def get_context_node_data(self, node_id):
         """Retrieve data associated with a context node."""
         return self.route_task("Contextual Memory", "get_node_data", node_id)
@@ -324,37 +787,57 @@ class Orchestrator:
         """Remove the relationship between two nodes."""
         return self.route_task("Contextual Memory", "remove_relationship", node1, node2)
 
-    def find_shortest_context_path(self, node1, node2):
+    def find_shortest_context_path(self, node1, node2, relationship_types=None):
         """Find the shortest path between two nodes in the graph."""
-        return self.route_task("Contextual Memory", "find_shortest_path", node1, node2)
+        return self.route_task("Contextual Memory", "find_shortest_path", node1, node2, relationship_types)
+
+    def find_all_context_paths(self, node1, node2, max_depth=None, max_results=None, relationship_types=None):
+        """Find paths between two nodes, bounded by depth and result count."""
+        return self.route_task("Contextual Memory", "find_all_paths", node1, node2, max_depth, max_results, relationship_types)
 
-    def find_all_context_paths(self, node1, node2):
-        """Find all possible paths between two nodes."""
-        return self.route_task("Contextual Memory", "find_all_paths", node1, node2)
+    def find_k_shortest_context_paths(self, node1, node2, k=3, relationship_types=None):
+        """Find up to k shortest paths between two nodes."""
+        return self.route_task("Contextual Memory", "find_k_shortest_paths", node1, node2, k, relationship_types)
 
     def filter_context_nodes(self, attribute=None, condition=None):
         """Filter nodes in the Association Cortex graph based on attributes."""
         return self.route_task("Contextual Memory", "filter_nodes", attribute, condition)
 
-    def measure_context_node_centrality(self, centrality_type="degree"):
-        """Compute centrality metrics for nodes."""
-        return self.route_task("Contextual Memory", "measure_centrality", centrality_type)
+    def query_context_nodes(self, **predicates):
+        """Query nodes in the Association Cortex graph by indexed attribute predicates."""
+        return self.route_task("Contextual Memory", "query_nodes", **predicates)
+
+    def measure_context_node_centrality(self, centrality_type="degree", k=None):
+        """Compute centrality metrics for nodes ("degree", "betweenness" over k sampled pivots, default betweenness_samples, or "pagerank")."""
+        return self.route_task("Contextual Memory", "measure_centrality", centrality_type, k)
 
     def detect_context_clusters(self, method="connected_components"):
         """Detect clusters in the graph."""
         return self.route_task("Contextual Memory", "detect_clusters", method)
 
+    def find_similar_context_nodes(self, node_id, k=10):
+        """Find the k context nodes most structurally similar to node_id (embedding cosine similarity)."""
+        return self.route_task("Contextual Memory", "similar_nodes", node_id, k)
+
+    def compute_context_embeddings(self):
+        """Fit node embeddings for the whole context graph."""
+        return self.route_task("Contextual Memory", "compute_embeddings")
+
+    def get_context_memory_stats(self):
+        """In-memory footprint and page in/out counters of the context graph."""
+        return self.route_task("Contextual Memory", "memory_stats")
+
     def visualize_context_graph(self):
         """Visualize the Association Cortex graph."""
         return self.route_task("Contextual Memory", "visualize_graph")
     
-    def purge_context_data(self, retention_days=30):
-        """Manually trigger purging of old data."""
-        return self.route_task("Contextual Memory", "purge_old_data", retention_days)
+    def purge_context_data(self, retention_days=30, time_budget=None):
+        """Manually trigger purging of old data (optionally limited to `time_budget` seconds)."""
+        return self.route_task("Contextual Memory", "purge_old_data", retention_days, time_budget)
 
-    def monitor_and_purge_context_data(self, node_limit=10000, edge_limit=50000, retention_days=30):
+    def monitor_and_purge_context_data(self, node_limit=10000, edge_limit=50000, retention_days=30, time_budget=None):
         """Monitor graph size and trigger purging if needed."""
-        return self.route_task("Contextual Memory", "monitor_and_purge", node_limit, edge_limit, retention_days)
+        return self.route_task("Contextual Memory", "monitor_and_purge", node_limit, edge_limit, retention_days, time_budget)
 
     ### CEREBELLUM AGENT (Procedural Memory) ###
 
@@ -365,7 +848,7 @@ class Orchestrator:
     def retrieve_workflow(self, name):
         """Retrieve a workflow from the Cerebellum."""
         if not name or not isinstance(name, str):
-            self.logger.log_error("retrieve_workflow", "Workflow name must be a non-empty string.")
+            self.logger.log_error("Orchestrator.retrieve_workflow", "Workflow name must be a non-empty string.")
             raise ValueError("Workflow name must be a non-empty string.")
         return self.route_task("Procedural Memory", "retrieve_workflow", name)
 
@@ -378,7 +861,7 @@ class Orchestrator:
     def delete_workflow(self, name):
         """Delete a workflow in the Cerebellum."""
         if not isinstance(insights, dict):
-            self.logger.log_error("optimize_workflow", "Invalid insights. Must be a dictionary.")
+            self.logger.log_error("Orchestrator.optimize_workflow", "Invalid insights. Must be a dictionary.")
             return "Workflow optimization failed: Insights must be a dictionary."
         return self.route_task("Procedural Memory", "delete_workflow", name)
         
@@ -425,29 +908,15 @@ def test_purging(orchestrator):
 
 
 if __name__ == "__main__":
+    import asyncio
+
     orchestrator = Orchestrator()
     orchestrator.initialize_agents()
-
-    # Configurable purge interval (default: 1 hour)
-    purge_interval_seconds = 3600  
-    last_purge_time = time.time()
+    runtime = orchestrator.start_runtime()
 
     try:
-        while True:
-            orchestrator.run_main_tasks()  # Orchestrator's primary logic
-
-            # Time-based purging
-            if time.time() - last_purge_time > purge_interval_seconds:
-                print("[INFO] Initiating time-based purging.")
-                orchestrator.purge_context_data(retention_days=30)
-                last_purge_time = time.time()
-
-            # Event-based purging
-            orchestrator.monitor_and_purge_context_data(
-                node_limit=10000, edge_limit=50000, retention_days=30
-            )
-
-            time.sleep(1)  # Loop throttle
-
+        asyncio.run(runtime.run())  # Returns on SIGINT/SIGTERM
     except KeyboardInterrupt:
-        print("[INFO] Graceful shutdown initiated.")
\ No newline at end of file
+        pass
+    print("[INFO] Graceful shutdown initiated.")
+    orchestrator.shutdown()
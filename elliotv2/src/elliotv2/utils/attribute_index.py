@@ -0,0 +1,238 @@
+import bisect
+import datetime
+
+from utils.time_index import to_epoch
+
+_MISSING = object()
+
+
+def _members(value):
+    """Values an attribute matches on: each element of a collection, or the value itself."""
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return list(value)
+    return [value]
+
+
+def _hashable(value):
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+
+def sort_key(value):
+    """Comparable float for a number, datetime or ISO timestamp string; None if it has no order."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, (str, datetime.datetime)):
+        return to_epoch(value)
+    return None
+
+
+def matches(value, expected):
+    """
+    Evaluate one predicate against an attribute value (`_MISSING` if absent).
+    `expected` is a literal (equality, or membership for collection values), a
+    dict of in/min/max/exists operators, or an arbitrary callable.
+    """
+    if callable(expected):
+        return value is not _MISSING and bool(expected(value))
+    if not isinstance(expected, dict):
+        return value is not _MISSING and expected in _members(value)  # Compared by equality, so unhashable members are fine
+    if "exists" in expected and (value is not _MISSING) != expected["exists"]:
+        return False
+    if value is _MISSING:
+        return "exists" in expected and set(expected) == {"exists"}
+    if "in" in expected:
+        members = _members(value)
+        if not any(option in members for option in expected["in"]):
+            return False
+    if "min" in expected or "max" in expected:
+        key = sort_key(value)
+        if key is None:
+            return False
+        if "min" in expected and key < sort_key(expected["min"]):
+            return False
+        if "max" in expected and key > sort_key(expected["max"]):
+            return False
+    return True
+
+
+def scan(predicates, pairs):
+    """Nodes among (node_id, data) pairs whose data satisfy every predicate."""
+    results = []
+    for node_id, data in pairs:
+        if not isinstance(data, dict):
+            data = {}
+        if all(matches(data.get(attribute, _MISSING), expected) for attribute, expected in predicates.items()):
+            results.append(node_id)
+    return results
+
+
+class HashIndex:
+    """Equality/membership index: value -> nodes. Collection values are indexed per element (e.g. tags)."""
+
+    kind = "hash"
+
+    def __init__(self, attribute):
+        self.attribute = attribute
+        self.entries = {}  # value -> set of nodes
+        self.node_values = {}  # node -> values it is indexed under
+
+    def add(self, node_id, value):
+        self.discard(node_id)
+        values = {member for member in _members(value) if _hashable(member)}  # Unhashable members are left to scans
+        for member in values:
+            self.entries.setdefault(member, set()).add(node_id)
+        self.node_values[node_id] = values
+
+    def discard(self, node_id):
+        for member in self.node_values.pop(node_id, ()):
+            nodes = self.entries[member]
+            nodes.discard(node_id)
+            if not nodes:
+                del self.entries[member]
+
+    def lookup(self, expected):
+        """Nodes matching a literal or {"in": [...]} predicate; None if the index can't answer it."""
+        if isinstance(expected, dict):
+            if set(expected) != {"in"} or not all(_hashable(member) for member in expected["in"]):
+                return None
+            found = set()
+            for member in expected["in"]:
+                found.update(self.entries.get(member, ()))
+            return found
+        if not _hashable(expected):
+            return None
+        return set(self.entries.get(expected, ()))
+
+
+class SortedIndex:
+    """Range index over orderable values (numbers, datetimes, ISO timestamps) kept in sorted parallel lists."""
+
+    kind = "sorted"
+
+    def __init__(self, attribute):
+        self.attribute = attribute
+        self.keys = []
+        self.nodes = []
+        self.node_keys = {}  # node -> its sort key
+
+    def add(self, node_id, value):
+        self.discard(node_id)
+        key = sort_key(value)
+        if key is None:
+            return
+        position = bisect.bisect_right(self.keys, key)
+        self.keys.insert(position, key)
+        self.nodes.insert(position, node_id)
+        self.node_keys[node_id] = key
+
+    def discard(self, node_id):
+        key = self.node_keys.pop(node_id, None)
+        if key is None:
+            return
+        position = bisect.bisect_left(self.keys, key)
+        while self.nodes[position] != node_id:
+            position += 1
+        del self.keys[position]
+        del self.nodes[position]
+
+    def range(self, low=None, high=None):
+        start = 0 if low is None else bisect.bisect_left(self.keys, low)
+        end = len(self.keys) if high is None else bisect.bisect_right(self.keys, high)
+        return set(self.nodes[start:end])
+
+    def lookup(self, expected):
+        """Nodes matching a literal, {"in": [...]} or {"min"/"max"} predicate; None if the index can't answer it."""
+        if not isinstance(expected, dict):
+            key = sort_key(expected)
+            return None if key is None else self.range(key, key)
+        if set(expected) == {"in"}:
+            keys = [sort_key(value) for value in expected["in"]]
+            if None in keys:
+                return None
+            found = set()
+            for key in keys:
+                found.update(self.range(key, key))
+            return found
+        if not expected or not set(expected) <= {"min", "max"}:
+            return None
+        low, high = sort_key(expected.get("min")), sort_key(expected.get("max"))
+        if (low is None and "min" in expected) or (high is None and "max" in expected):
+            return None
+        return self.range(low, high)
+
+
+class AttributeIndexes:
+    """
+    Secondary indexes over node data attributes.
+
+    Indexed predicates are answered from the indexes (smallest candidate set first);
+    everything else, including arbitrary callables, is checked against the candidates
+    or, with no indexed predicate, a scan of every node.
+    """
+
+    index_types = {"hash": HashIndex, "sorted": SortedIndex}
+
+    def __init__(self, hash_attributes=None, sorted_attributes=None):
+        self.indexes = {}
+        for attribute in hash_attributes or []:
+            self.indexes[attribute] = HashIndex(attribute)
+        for attribute in sorted_attributes or []:
+            self.indexes[attribute] = SortedIndex(attribute)
+
+    def create(self, attribute, kind, nodes=()):
+        """Create (or replace) an index and fill it from (node_id, data) pairs."""
+        if kind not in self.index_types:
+            raise ValueError(f"Unsupported index type: {kind}")
+        index = self.indexes[attribute] = self.index_types[kind](attribute)
+        for node_id, data in nodes:
+            if isinstance(data, dict) and attribute in data:
+                index.add(node_id, data[attribute])
+        return index
+
+    def drop(self, attribute):
+        return self.indexes.pop(attribute, None) is not None
+
+    def add(self, node_id, data):
+        """Index (or re-index) a node's data."""
+        for attribute, index in self.indexes.items():
+            if isinstance(data, dict) and attribute in data:
+                index.add(node_id, data[attribute])
+            else:
+                index.discard(node_id)
+
+    def discard(self, node_id):
+        for index in self.indexes.values():
+            index.discard(node_id)
+
+    def clear(self):
+        for attribute, index in list(self.indexes.items()):
+            self.indexes[attribute] = type(index)(attribute)
+
+    def query(self, predicates, iter_nodes, node_data):
+        """
+        Return the nodes whose data satisfy every predicate.
+        `iter_nodes()` yields all (node_id, data) pairs for scans; `node_data(node_id)` fetches one node's data.
+        """
+        candidates = None
+        residual = {}
+        for attribute, expected in predicates.items():
+            index = self.indexes.get(attribute)
+            found = None if index is None or callable(expected) else index.lookup(expected)
+            if found is None:
+                residual[attribute] = expected
+            elif candidates is None or len(found) < len(candidates):
+                candidates, found = found, candidates
+                if found is not None:
+                    candidates &= found
+            else:
+                candidates &= found
+
+        if candidates is None:
+            pairs = iter_nodes()
+        else:
+            pairs = ((node_id, node_data(node_id)) for node_id in candidates)
+        return scan(residual, pairs)
@@ -0,0 +1,23 @@
+import os
+import threading
+
+_cache = {}  # absolute path -> (mtime_ns, parsed config)
+_lock = threading.Lock()
+
+
+def load_config(path="config/agents.yaml"):
+    """
+    Parse a YAML config file once and share the result; the file is parsed again only when it changes.
+    Callers get the same dict, so treat it as read-only. Uses libyaml's loader when PyYAML was built with it.
+    """
+    path = os.path.abspath(path)
+    mtime = os.stat(path).st_mtime_ns
+    cached = _cache.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    import yaml
+
+    with _lock, open(path, "r") as file:
+        config = yaml.load(file, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+    _cache[path] = (mtime, config)
+    return config
@@ -0,0 +1,550 @@
+import datetime
+from collections.abc import MutableMapping
+
+import numpy as np
+
+NO_TIMESTAMP = np.iinfo(np.int64).min  # Marks an edge without a timestamp in the int64 column
+NO_RELATIONSHIP = -1
+
+
+def _to_micros(value):
+    """Convert an ISO timestamp (or datetime / epoch seconds) to int64 epoch microseconds."""
+    if value is None:
+        return NO_TIMESTAMP
+    if isinstance(value, str):
+        value = datetime.datetime.fromisoformat(value)
+    if isinstance(value, datetime.datetime):
+        value = value.timestamp()
+    return int(round(value * 1_000_000))
+
+
+def _from_micros(value):
+    if value == NO_TIMESTAMP:
+        return None
+    return datetime.datetime.fromtimestamp(value / 1_000_000).isoformat()
+
+
+class _Column:
+    """Append-only NumPy column with amortized O(1) growth."""
+
+    def __init__(self, dtype, capacity=1024):
+        self.data = np.empty(capacity, dtype=dtype)
+        self.size = 0
+
+    def append(self, value):
+        if self.size == len(self.data):
+            self.data = np.resize(self.data, max(1024, 2 * len(self.data)))
+        self.data[self.size] = value
+        self.size += 1
+        return self.size - 1
+
+    def extend(self, values):
+        """Append an array of values; returns the index of the first one."""
+        start, end = self.size, self.size + len(values)
+        if end > len(self.data):
+            self.data = np.resize(self.data, max(1024, 2 * len(self.data), end))
+        self.data[start:end] = values
+        self.size = end
+        return start
+
+    def view(self):
+        return self.data[:self.size]
+
+    def replace(self, values):
+        self.data = np.array(values, dtype=self.data.dtype)
+        self.size = len(self.data)
+        if not len(self.data):
+            self.data = np.empty(1024, dtype=self.data.dtype)
+
+    def __getitem__(self, index):
+        return self.data[index]
+
+    def __setitem__(self, index, value):
+        self.data[index] = value
+
+
+class EdgeAttrView(MutableMapping):
+    """Dict-like view over one edge's columnar attributes; writes go straight to the columns."""
+
+    def __init__(self, graph, edge_id):
+        self._graph = graph
+        self._edge_id = edge_id
+
+    def __getitem__(self, key):
+        graph, edge_id = self._graph, self._edge_id
+        if key == "relationship":
+            code = graph.edge_rel[edge_id]
+            if code != NO_RELATIONSHIP:
+                return graph.rel_names[code]
+        elif key == "timestamp":
+            value = _from_micros(graph.edge_ts[edge_id])
+            if value is not None:
+                return value
+        else:
+            extra = graph.edge_extra.get(edge_id)
+            if extra is not None and key in extra:
+                return extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        graph, edge_id = self._graph, self._edge_id
+        if key == "relationship":
+            graph.edge_rel[edge_id] = graph.relationship_code(value)
+        elif key == "timestamp":
+            graph.edge_ts[edge_id] = _to_micros(value)
+        else:
+            graph.edge_extra.setdefault(edge_id, {})[key] = value
+
+    def __delitem__(self, key):
+        graph, edge_id = self._graph, self._edge_id
+        if key not in self:
+            raise KeyError(key)
+        if key == "relationship":
+            graph.edge_rel[edge_id] = NO_RELATIONSHIP
+        elif key == "timestamp":
+            graph.edge_ts[edge_id] = NO_TIMESTAMP
+        else:
+            del graph.edge_extra[edge_id][key]
+
+    def __iter__(self):
+        graph, edge_id = self._graph, self._edge_id
+        if graph.edge_rel[edge_id] != NO_RELATIONSHIP:
+            yield "relationship"
+        if graph.edge_ts[edge_id] != NO_TIMESTAMP:
+            yield "timestamp"
+        yield from graph.edge_extra.get(edge_id, {})
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class NodeView:
+    """networkx-style node view: iterable, sized, subscriptable and callable with data=True."""
+
+    def __init__(self, graph):
+        self._graph = graph
+
+    def __call__(self, data=False):
+        if data:
+            return ((node_id, self._graph.node_attrs[index]) for node_id, index in self._graph.node_index.items())
+        return iter(self)
+
+    def __getitem__(self, node_id):
+        return self._graph.node_attrs[self._graph.node_index[node_id]]
+
+    def __iter__(self):
+        return iter(list(self._graph.node_index))
+
+    def __len__(self):
+        return len(self._graph.node_index)
+
+    def __contains__(self, node_id):
+        return node_id in self._graph.node_index
+
+
+class EdgeView:
+    """networkx-style edge view over live edges, each undirected edge reported once."""
+
+    def __init__(self, graph):
+        self._graph = graph
+
+    def __call__(self, data=False):
+        graph = self._graph
+        for edge_id in graph.live_edge_ids():
+            u, v = graph.node_ids[graph.edge_u[edge_id]], graph.node_ids[graph.edge_v[edge_id]]
+            yield (u, v, EdgeAttrView(graph, edge_id)) if data else (u, v)
+
+    def __getitem__(self, edge):
+        edge_id = self._graph.edge_id(*edge)
+        if edge_id is None:
+            raise KeyError(edge)
+        return EdgeAttrView(self._graph, edge_id)
+
+    def __iter__(self):
+        return iter(list(self()))
+
+    def __len__(self):
+        return self._graph.num_edges
+
+
+class AdjacencyView:
+    def __init__(self, graph, node_id):
+        self._graph = graph
+        self._node_id = node_id
+
+    def __getitem__(self, neighbor):
+        edge_id = self._graph.edge_id(self._node_id, neighbor)
+        if edge_id is None:
+            raise KeyError(neighbor)
+        return EdgeAttrView(self._graph, edge_id)
+
+    def __contains__(self, neighbor):
+        return self._graph.edge_id(self._node_id, neighbor) is not None
+
+    def __iter__(self):
+        return iter(self._graph.neighbors(self._node_id))
+
+    def __len__(self):
+        return len(self._graph.neighbors(self._node_id))
+
+
+class CSRGraph:
+    """
+    Compact undirected graph backend for the Association Cortex.
+
+    Node ids are interned to dense integers. Adjacency lives in NumPy CSR arrays
+    (indptr/indices, each slot pointing at an edge id), with a dict-based delta
+    buffer for recent insertions that is folded into the CSR arrays once it grows
+    past `compact_threshold`. Edge attributes are columnar: relationship type as a
+    categorical int32 code, timestamp as int64 epoch microseconds, and anything
+    else in a sparse per-edge dict. The mutation and lookup surface mirrors the
+    subset of networkx.Graph that AssociationCortex uses.
+    """
+
+    def __init__(self, compact_threshold=50000):
+        self.compact_threshold = compact_threshold
+        # Nodes
+        self.node_index = {}  # node_id -> int
+        self.node_ids = []  # int -> node_id
+        self.node_attrs = []  # int -> attribute dict (None once removed)
+        # CSR adjacency (both directions of every edge)
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.indices = np.zeros(0, dtype=np.int32)
+        self.slot_edges = np.zeros(0, dtype=np.int64)
+        self.row_keys = np.zeros(0, dtype=np.int64)  # (row << 32) | column for each CSR slot, globally sorted
+        self.dead_slots = 0
+        # Delta buffer: int -> {neighbor int: edge id}
+        self.delta = {}
+        self.delta_edges = 0
+        # Edge columns
+        self.edge_u = _Column(np.int32)
+        self.edge_v = _Column(np.int32)
+        self.edge_rel = _Column(np.int32)
+        self.edge_ts = _Column(np.int64)
+        self.edge_alive = _Column(np.bool_)
+        self.edge_extra = {}  # edge id -> dict of non-columnar attributes
+        self.rel_codes = {}  # relationship type -> code
+        self.rel_names = []  # code -> relationship type
+        self.num_edges = 0
+
+    # networkx-compatible surface
+
+    @property
+    def nodes(self):
+        return NodeView(self)
+
+    @property
+    def edges(self):
+        return EdgeView(self)
+
+    def __contains__(self, node_id):
+        return node_id in self.node_index
+
+    def __len__(self):
+        return len(self.node_index)
+
+    def __iter__(self):
+        return iter(list(self.node_index))
+
+    def __getitem__(self, node_id):
+        if node_id not in self.node_index:
+            raise KeyError(node_id)
+        return AdjacencyView(self, node_id)
+
+    def has_node(self, node_id):
+        return node_id in self.node_index
+
+    def number_of_nodes(self):
+        return len(self.node_index)
+
+    def number_of_edges(self):
+        return self.num_edges
+
+    def relationship_code(self, relationship):
+        code = self.rel_codes.get(relationship)
+        if code is None:
+            code = self.rel_codes[relationship] = len(self.rel_names)
+            self.rel_names.append(relationship)
+        return code
+
+    def _intern(self, node_id):
+        index = self.node_index.get(node_id)
+        if index is None:
+            index = self.node_index[node_id] = len(self.node_ids)
+            self.node_ids.append(node_id)
+            self.node_attrs.append({})
+        return index
+
+    def add_node(self, node_id, **attrs):
+        index = self._intern(node_id)
+        self.node_attrs[index].update(attrs)
+
+    def add_nodes_from(self, nodes):
+        for item in nodes:
+            if isinstance(item, tuple) and len(item) == 2 and isinstance(item[1], dict):
+                self.add_node(item[0], **item[1])
+            else:
+                self.add_node(item)
+
+    def add_edge(self, node1, node2, **attrs):
+        u, v = self._intern(node1), self._intern(node2)
+        edge_id = self._edge_id(u, v)
+        if edge_id is None:
+            edge_id = self.edge_u.append(u)
+            self.edge_v.append(v)
+            self.edge_rel.append(NO_RELATIONSHIP)
+            self.edge_ts.append(NO_TIMESTAMP)
+            self.edge_alive.append(True)
+            self.delta.setdefault(u, {})[v] = edge_id
+            self.delta.setdefault(v, {})[u] = edge_id
+            self.delta_edges += 1
+            self.num_edges += 1
+        view = EdgeAttrView(self, edge_id)
+        for key, value in attrs.items():
+            view[key] = value
+        if self.delta_edges + self.dead_slots > self.compact_threshold:
+            self.compact()
+
+    def add_edges_from(self, edges):
+        """
+        Add many edges. Existence checks against the CSR arrays are vectorized and new
+        edges are appended to the columns in one step; existing edges are updated in place.
+        """
+        batch = [(self._intern(edge[0]), self._intern(edge[1]), edge[2] if len(edge) > 2 else {}) for edge in edges]
+        if not batch:
+            return
+        in_csr = self._csr_contains(
+            np.fromiter((u for u, _, _ in batch), dtype=np.int64, count=len(batch)),
+            np.fromiter((v for _, v, _ in batch), dtype=np.int64, count=len(batch)),
+        )
+        fresh = {}  # (u, v) -> attrs for edges not yet in the graph
+        for position, (u, v, attrs) in enumerate(batch):
+            if (u, v) in fresh or (v, u) in fresh:
+                fresh[(u, v) if (u, v) in fresh else (v, u)].update(attrs)
+            elif in_csr[position] or v in self.delta.get(u, ()):
+                view = EdgeAttrView(self, self._edge_id(u, v))  # Update in place; no compaction mid-batch
+                for key, value in attrs.items():
+                    view[key] = value
+            else:
+                fresh[(u, v)] = dict(attrs)
+        if fresh:
+            self._append_edges(fresh)
+
+    def _append_edges(self, fresh):
+        """Append new edges (a {(u, v): attrs} dict) to the columns and the delta buffer."""
+        count = len(fresh)
+        micros = {}
+        rel_codes = np.full(count, NO_RELATIONSHIP, dtype=np.int32)
+        timestamps = np.full(count, NO_TIMESTAMP, dtype=np.int64)
+        extras = {}
+        for position, attrs in enumerate(fresh.values()):
+            for key, value in attrs.items():
+                if key == "relationship":
+                    rel_codes[position] = self.relationship_code(value)
+                elif key == "timestamp":
+                    if value not in micros:
+                        micros[value] = _to_micros(value)
+                    timestamps[position] = micros[value]
+                else:
+                    extras.setdefault(position, {})[key] = value
+        first = self.edge_u.extend(np.fromiter((u for u, _ in fresh), dtype=np.int32, count=count))
+        self.edge_v.extend(np.fromiter((v for _, v in fresh), dtype=np.int32, count=count))
+        self.edge_rel.extend(rel_codes)
+        self.edge_ts.extend(timestamps)
+        self.edge_alive.extend(np.ones(count, dtype=np.bool_))
+        for position, attrs in extras.items():
+            self.edge_extra[first + position] = attrs
+        delta = self.delta
+        for edge_id, (u, v) in enumerate(fresh, start=first):
+            delta.setdefault(u, {})[v] = edge_id
+            delta.setdefault(v, {})[u] = edge_id
+        self.delta_edges += count
+        self.num_edges += count
+        if self.delta_edges + self.dead_slots > self.compact_threshold:
+            self.compact()
+
+    def _csr_contains(self, us, vs):
+        """Vectorized check for which (u, v) pairs are live edges in the CSR arrays."""
+        found = np.zeros(len(us), dtype=np.bool_)
+        if not len(self.row_keys):
+            return found
+        keys = (us << 32) | vs
+        positions = np.minimum(np.searchsorted(self.row_keys, keys), len(self.row_keys) - 1)
+        hits = self.row_keys[positions] == keys
+        found[hits] = self.edge_alive.view()[self.slot_edges[positions[hits]]]
+        return found
+
+    def _csr_slot(self, u, v):
+        """Return the CSR slot holding (u, v), or None."""
+        if u >= len(self.indptr) - 1:
+            return None
+        start, end = self.indptr[u], self.indptr[u + 1]
+        position = start + np.searchsorted(self.indices[start:end], v)
+        if position < end and self.indices[position] == v:
+            return position
+        return None
+
+    def _edge_id(self, u, v):
+        edge_id = self.delta.get(u, {}).get(v)
+        if edge_id is not None:
+            return edge_id
+        slot = self._csr_slot(u, v)
+        if slot is not None:
+            edge_id = int(self.slot_edges[slot])
+            if self.edge_alive[edge_id]:
+                return edge_id
+        return None
+
+    def edge_id(self, node1, node2):
+        u, v = self.node_index.get(node1), self.node_index.get(node2)
+        if u is None or v is None:
+            return None
+        return self._edge_id(u, v)
+
+    def has_edge(self, node1, node2):
+        return self.edge_id(node1, node2) is not None
+
+    def _neighbor_indices(self, u):
+        """Neighbor ints of `u` as a NumPy array (CSR part filtered by liveness, plus the delta buffer)."""
+        parts = []
+        if u < len(self.indptr) - 1:
+            start, end = self.indptr[u], self.indptr[u + 1]
+            if end > start:
+                row = self.indices[start:end]
+                alive = self.edge_alive.view()[self.slot_edges[start:end]]
+                parts.append(row[alive])
+        extra = self.delta.get(u)
+        if extra:
+            parts.append(np.fromiter(extra.keys(), dtype=np.int32, count=len(extra)))
+        if not parts:
+            return np.zeros(0, dtype=np.int32)
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+    def neighbors(self, node_id):
+        index = self.node_index.get(node_id)
+        if index is None:
+            raise KeyError(node_id)
+        return [self.node_ids[i] for i in self._neighbor_indices(index)]
+
+    def degree(self, node_id):
+        neighbors = self._neighbor_indices(self.node_index[node_id])
+        return len(neighbors) + int(np.count_nonzero(neighbors == self.node_index[node_id]))
+
+    def _kill_edge(self, u, v, edge_id):
+        self.edge_alive[edge_id] = False
+        self.edge_extra.pop(edge_id, None)
+        self.num_edges -= 1
+        in_delta = False
+        for a, b in ((u, v), (v, u)):
+            row = self.delta.get(a)
+            if row is not None and row.pop(b, None) is not None:
+                in_delta = True
+                if not row:
+                    del self.delta[a]
+        if in_delta:
+            self.delta_edges -= 1
+        else:
+            self.dead_slots += 1 if u == v else 2
+
+    def remove_edge(self, node1, node2):
+        u, v = self.node_index.get(node1), self.node_index.get(node2)
+        edge_id = self._edge_id(u, v) if u is not None and v is not None else None
+        if edge_id is None:
+            from networkx import NetworkXError
+            raise NetworkXError(f"The edge {node1}-{node2} is not in the graph")
+        self._kill_edge(u, v, edge_id)
+
+    def remove_node(self, node_id):
+        u = self.node_index.get(node_id)
+        if u is None:
+            from networkx import NetworkXError
+            raise NetworkXError(f"The node {node_id} is not in the graph.")
+        for v in set(self._neighbor_indices(u).tolist()):
+            self._kill_edge(u, v, self._edge_id(u, v))
+        del self.node_index[node_id]
+        self.node_attrs[u] = None
+
+    def live_edge_ids(self):
+        return np.flatnonzero(self.edge_alive.view())
+
+    def compact(self):
+        """Fold the delta buffer into the CSR arrays and drop removed edges."""
+        live = self.live_edge_ids()
+        u, v = self.edge_u.view()[live], self.edge_v.view()[live]
+        rel, ts = self.edge_rel.view()[live], self.edge_ts.view()[live]
+        remap = {int(old): new for new, old in enumerate(live) if int(old) in self.edge_extra}
+        self.edge_extra = {remap[old]: attrs for old, attrs in self.edge_extra.items() if old in remap}
+        for column, values in ((self.edge_u, u), (self.edge_v, v), (self.edge_rel, rel), (self.edge_ts, ts)):
+            column.replace(values)
+        self.edge_alive.replace(np.ones(len(live), dtype=np.bool_))
+
+        edge_ids = np.arange(len(live), dtype=np.int64)
+        loops = u == v
+        rows = np.concatenate([u, v[~loops]])
+        cols = np.concatenate([v, u[~loops]])
+        slots = np.concatenate([edge_ids, edge_ids[~loops]])
+        order = np.lexsort((cols, rows))
+        num_nodes = len(self.node_ids)
+        self.indices = cols[order].astype(np.int32)
+        self.slot_edges = slots[order]
+        self.row_keys = (rows[order].astype(np.int64) << 32) | self.indices
+        self.indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=num_nodes), out=self.indptr[1:])
+        self.delta = {}
+        self.delta_edges = 0
+        self.dead_slots = 0
+
+    def edges_older_than(self, cutoff):
+        """Vectorized scan of the timestamp column for live edges older than `cutoff` (epoch seconds)."""
+        timestamps = self.edge_ts.view()
+        expired = self.edge_alive.view() & (timestamps != NO_TIMESTAMP) & (timestamps < _to_micros(cutoff))
+        edge_ids = np.flatnonzero(expired)
+        return [
+            (self.node_ids[u], self.node_ids[v])
+            for u, v in zip(self.edge_u.view()[edge_ids].tolist(), self.edge_v.view()[edge_ids].tolist())
+        ]
+
+    def degrees(self):
+        """Degree of every interned node id as an int64 array (removed nodes report 0)."""
+        live = self.live_edge_ids()
+        size = len(self.node_ids)
+        u, v = self.edge_u.view()[live], self.edge_v.view()[live]
+        return np.bincount(u, minlength=size) + np.bincount(v, minlength=size)
+
+    def to_networkx(self):
+        import networkx as nx
+        graph = nx.Graph()
+        graph.add_nodes_from(self.nodes(data=True))
+        graph.add_edges_from((u, v, dict(attrs)) for u, v, attrs in self.edges(data=True))
+        return graph
+
+    def memory_usage(self):
+        """Approximate bytes held by the NumPy structures."""
+        arrays = [self.indptr, self.indices, self.slot_edges] + [
+            column.data for column in (self.edge_u, self.edge_v, self.edge_rel, self.edge_ts, self.edge_alive)
+        ]
+        return sum(array.nbytes for array in arrays)
+
+
+# networkx-style algorithms used by AssociationCortex, implemented over CSRGraph
+
+def single_source_shortest_path_length(graph, source, cutoff=None):
+    """Level-synchronous BFS; each level expands the whole frontier with vectorized NumPy ops."""
+    start = graph.node_index[source]
+    distances = {start: 0}
+    seen = np.zeros(len(graph.node_ids), dtype=np.bool_)
+    seen[start] = True
+    frontier = np.array([start], dtype=np.int32)
+    level = 0
+    while len(frontier) and (cutoff is None or level < cutoff):
+        level += 1
+        expanded = np.concatenate([graph._neighbor_indices(int(u)) for u in frontier])
+        expanded = np.unique(expanded)
+        frontier = expanded[~seen[expanded]]
+        seen[frontier] = True
+        for index in frontier.tolist():
+            distances[index] = level
+    return {graph.node_ids[index]: distance for index, distance in distances.items()}
@@ -0,0 +1,102 @@
+import time
+import threading
+import concurrent.futures
+
+
+class FanOut:
+    """
+    Run independent lookups concurrently on a thread pool and collect whatever finishes in time.
+
+    A lookup past its deadline can't be interrupted and keeps its thread until it
+    returns; while a source has `max_outstanding` such stragglers, further lookups
+    for it are not started and report "busy", so one stuck source can't take
+    over the pool.
+    """
+
+    def __init__(self, max_workers=8, max_outstanding=1, thread_name_prefix="fanout"):
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers, thread_name_prefix=thread_name_prefix)
+        self.max_outstanding = max_outstanding
+        self.outstanding = {}  # name -> lookups still running after their deadline
+        self.lock = threading.Lock()
+
+    def run(self, lookups, deadlines=None, default_deadline=1.0):
+        """
+        Args:
+            lookups (dict): name -> zero-argument callable.
+            deadlines (dict): name -> seconds allowed (from submission); others get `default_deadline`.
+        Returns:
+            dict: name -> {"status": "ok" | "error" | "timeout" | "busy", "value", "error", "seconds"}.
+        """
+        deadlines = deadlines or {}
+        start = time.monotonic()
+        futures, results = {}, {}
+        with self.lock:
+            for name, lookup in lookups.items():
+                if self.outstanding.get(name, 0) >= self.max_outstanding:
+                    results[name] = {"status": "busy", "value": None, "seconds": 0.0}
+                else:
+                    futures[name] = self.executor.submit(_timed, lookup)
+        for name in sorted(futures, key=lambda name: deadlines.get(name, default_deadline)):
+            remaining = start + deadlines.get(name, default_deadline) - time.monotonic()
+            try:
+                value, seconds = futures[name].result(timeout=max(remaining, 0.0))
+            except concurrent.futures.TimeoutError:
+                if not futures[name].cancel():  # Already running: count it until it returns
+                    self._straggler(name, futures[name])
+                results[name] = {"status": "timeout", "value": None, "seconds": round(time.monotonic() - start, 6)}
+                continue
+            except Exception as e:
+                results[name] = {"status": "error", "value": None, "error": str(e), "seconds": round(time.monotonic() - start, 6)}
+                continue
+            if isinstance(value, str) and value.startswith("Error"):  # Regions report failures as error strings
+                results[name] = {"status": "error", "value": None, "error": value, "seconds": seconds}
+            else:
+                results[name] = {"status": "ok", "value": value, "seconds": seconds}
+        return results
+
+    def _straggler(self, name, future):
+        with self.lock:
+            self.outstanding[name] = self.outstanding.get(name, 0) + 1
+
+        def finished(_):
+            with self.lock:
+                self.outstanding[name] -= 1
+
+        future.add_done_callback(finished)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _timed(lookup):
+    start = time.monotonic()
+    value = lookup()
+    return value, round(time.monotonic() - start, 6)
+
+
+def reciprocal_rank_fusion(ranked, weights=None, k=60, limit=None):
+    """
+    Merge ranked hit lists from different sources into one ranking.
+    Args:
+        ranked (dict): source -> list of (key, item), best first.
+        weights (dict): source -> weight (default 1.0).
+        k (int): Rank damping; larger values flatten the difference between top and lower ranks.
+    Returns:
+        list: {"key", "score", "sources", "items": {source: item}} dicts, best first. A key found by several
+        sources sums their contributions, w / (k + rank), so agreement between regions ranks higher.
+    """
+    weights = weights or {}
+    merged = {}
+    for source, hits in ranked.items():
+        weight = weights.get(source, 1.0)
+        for rank, (key, item) in enumerate(hits, start=1):
+            entry = merged.get(key)
+            if entry is None:
+                entry = merged[key] = {"key": key, "score": 0.0, "sources": [], "items": {}}
+            if source in entry["items"]:
+                continue
+            entry["score"] += weight / (k + rank)
+            entry["sources"].append(source)
+            entry["items"][source] = item
+    results = sorted(merged.values(), key=lambda entry: entry["score"], reverse=True)
+    return results[:limit] if limit else results
@@ -0,0 +1,304 @@
+import numpy as np
+
+
+def edge_arrays(graph):
+    """
+    Return (nodes, src, dst) where src/dst are int64 positions into `nodes` for every edge.
+    Works for networkx graphs and CSRGraph (whose edge columns are remapped without Python loops).
+    """
+    if hasattr(graph, "live_edge_ids"):
+        nodes = list(graph.node_index)
+        ints = np.fromiter(graph.node_index.values(), dtype=np.int64, count=len(nodes))
+        remap = np.full(len(graph.node_ids), -1, dtype=np.int64)
+        remap[ints] = np.arange(len(nodes), dtype=np.int64)
+        live = graph.live_edge_ids()
+        return nodes, remap[graph.edge_u.view()[live]], remap[graph.edge_v.view()[live]]
+    nodes = list(graph.nodes)
+    index = {node: position for position, node in enumerate(nodes)}
+    pairs = np.fromiter(
+        (index[node] for edge in graph.edges() for node in edge), dtype=np.int64, count=2 * graph.number_of_edges()
+    ).reshape(-1, 2)
+    return nodes, pairs[:, 0], pairs[:, 1]
+
+
+def pagerank(nodes, src, dst, alpha=0.85, tol=1.0e-6, max_iter=100):
+    """Power-iteration PageRank; each step is one sparse mat-vec done with np.bincount."""
+    count = len(nodes)
+    if count == 0:
+        return {}
+    loops = src == dst
+    sources = np.concatenate([src, dst[~loops]])
+    targets = np.concatenate([dst, src[~loops]])
+    out_degree = np.bincount(sources, minlength=count).astype(np.float64)
+    dangling = out_degree == 0
+    weights = 1.0 / out_degree[sources]
+    rank = np.full(count, 1.0 / count)
+    for _ in range(max_iter):
+        previous = rank
+        rank = alpha * np.bincount(targets, weights=previous[sources] * weights, minlength=count)
+        rank += (alpha * previous[dangling].sum() + 1.0 - alpha) / count
+        if np.abs(rank - previous).sum() < count * tol:
+            break
+    return dict(zip(nodes, rank.tolist()))
+
+
+_WIDE_LEVEL = 256  # Edges out of a BFS level above which it is expanded with array operations
+
+
+def _adjacency(count, src, dst):
+    """CSR adjacency (indptr, indices) of the undirected edge arrays, self-loops dropped."""
+    keep = src != dst
+    sources = np.concatenate([src[keep], dst[keep]])
+    targets = np.concatenate([dst[keep], src[keep]])
+    indptr = np.zeros(count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=count), out=indptr[1:])
+    return indptr, targets[np.argsort(sources, kind="stable")]
+
+
+def betweenness(nodes, src, dst, k=None, seed=None):
+    """
+    Brandes betweenness centrality (normalized, undirected), estimated from `k` sampled
+    pivots when k < len(nodes). Each BFS level expands only its frontier's adjacency
+    slices: narrow levels in plain Python, wide ones vectorized, so a pivot costs O(E)
+    whatever the graph's diameter.
+    """
+    count = len(nodes)
+    if count <= 2:
+        return {node: 0.0 for node in nodes}
+    indptr, indices = _adjacency(count, src, dst)
+    degree = np.diff(indptr)
+    bounds, flat = indptr.tolist(), indices.tolist()
+    neighbors = [flat[bounds[i]:bounds[i + 1]] for i in range(count)]
+    degrees = degree.tolist()
+    if k is None or k >= count:
+        pivots = np.arange(count)
+    else:
+        pivots = np.random.default_rng(seed).choice(count, size=k, replace=False)
+
+    scores = np.zeros(count)
+    for pivot in pivots.tolist():
+        # Lists while the frontier is narrow; switched to arrays once a level gets wide
+        distance = [-1] * count
+        sigma = [0.0] * count
+        distance[pivot], sigma[pivot] = 0, 1.0
+        frontier = [pivot]
+        levels = []  # (parents, children) of each level's shortest-path edges
+        level = 0
+        wide = False
+        while len(frontier):
+            if not wide and sum(degrees[node] for node in frontier) >= _WIDE_LEVEL:
+                distance, sigma = np.array(distance, dtype=np.int64), np.array(sigma)
+                wide = True
+            if wide:
+                frontier = np.asarray(frontier, dtype=np.int64)
+                lengths = degree[frontier]
+                ends = np.cumsum(lengths)
+                positions = np.arange(ends[-1]) + np.repeat(indptr[frontier] - (ends - lengths), lengths)
+                parents, children = np.repeat(frontier, lengths), indices[positions]
+                distance[children[distance[children] == -1]] = level + 1
+                tree = distance[children] == level + 1
+                parents, children = parents[tree], children[tree]
+                np.add.at(sigma, children, sigma[parents])
+                frontier = np.unique(children)
+            else:
+                parents, children = [], []
+                for parent in frontier:
+                    for child in neighbors[parent]:
+                        if distance[child] == -1:
+                            distance[child] = level + 1
+                        if distance[child] == level + 1:
+                            sigma[child] += sigma[parent]
+                            parents.append(parent)
+                            children.append(child)
+                frontier = list(dict.fromkeys(children))
+            if len(children):
+                levels.append((parents, children))
+            level += 1
+
+        # Dependency accumulation, deepest level first
+        if wide:
+            delta = np.zeros(count)
+            for parents, children in reversed(levels):
+                parents, children = np.asarray(parents, dtype=np.int64), np.asarray(children, dtype=np.int64)
+                np.add.at(delta, parents, sigma[parents] / sigma[children] * (1.0 + delta[children]))
+        else:
+            delta = [0.0] * count
+            for parents, children in reversed(levels):
+                for parent, child in zip(parents, children):
+                    delta[parent] += sigma[parent] / sigma[child] * (1.0 + delta[child])
+            delta = np.array(delta)
+        delta[pivot] = 0.0
+        scores += delta
+
+    scale = 1.0 / ((count - 1) * (count - 2))
+    if len(pivots) < count:
+        scale *= count / len(pivots)
+    return dict(zip(nodes, (scores * scale).tolist()))
+
+
+class UnionFind:
+    """Disjoint sets with path halving and union by size."""
+
+    def __init__(self):
+        self.parent = {}
+        self.size = {}
+
+    def add(self, item):
+        if item not in self.parent:
+            self.parent[item] = item
+            self.size[item] = 1
+
+    def find(self, item):
+        parent = self.parent
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, a, b):
+        """Merge the sets of `a` and `b`; returns True if they were separate."""
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return False
+        if self.size[root_a] < self.size[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        self.size[root_a] += self.size.pop(root_b)
+        return True
+
+    def groups(self):
+        groups = {}
+        for item in self.parent:
+            groups.setdefault(self.find(item), set()).add(item)
+        return list(groups.values())
+
+
+class GraphAnalytics:
+    """
+    Incrementally maintained graph analytics.
+
+    Degrees are kept as counters and components in a union-find that absorbs edge
+    insertions directly; deletions (and bulk imports) only mark them stale so they
+    are rebuilt on the next query. Every result is cached against the version of what it depends
+    on, so repeated calls on an unchanged graph return in O(1).
+    """
+
+    def __init__(self):
+        self.degrees = {}
+        self.components = UnionFind()
+        self.components_stale = False
+        self.degrees_stale = False
+        self.version = 0  # any structural change
+        self.degree_version = 0
+        self.component_version = 0
+        self.cache = {}  # name -> (version, params, result)
+        self.stats = {"hits": 0, "misses": 0, "component_rebuilds": 0}
+
+    # Mutations
+
+    def node_added(self, node_id):
+        if node_id in self.degrees:
+            return
+        self.degrees[node_id] = 0
+        self.components.add(node_id)
+        self.version += 1
+        self.degree_version += 1
+        self.component_version += 1
+
+    def node_removed(self, node_id, neighbors):
+        self.degrees.pop(node_id, None)
+        for neighbor in neighbors:
+            if neighbor != node_id and neighbor in self.degrees:
+                self.degrees[neighbor] -= 1
+        self.components_stale = True
+        self.version += 1
+        self.degree_version += 1
+        self.component_version += 1
+
+    def edge_added(self, node1, node2):
+        for node in (node1, node2):
+            if node not in self.degrees:
+                self.node_added(node)
+        self.degrees[node1] += 1
+        self.degrees[node2] += 1
+        self.version += 1
+        self.degree_version += 1
+        if not self.components_stale and self.components.union(node1, node2):
+            self.component_version += 1
+
+    def invalidate(self):
+        """Mark degrees and components stale after a bulk change; both are rebuilt on the next query."""
+        self.degrees_stale = True
+        self.components_stale = True
+        self.version += 1
+        self.degree_version += 1
+        self.component_version += 1
+
+    def edge_removed(self, node1, node2):
+        if node1 in self.degrees:
+            self.degrees[node1] -= 1
+        if node2 in self.degrees:
+            self.degrees[node2] -= 1
+        self.components_stale = True
+        self.version += 1
+        self.degree_version += 1
+        self.component_version += 1
+
+    def rebuild(self, graph):
+        """Recompute degree counters and components from scratch (after a bulk load)."""
+        self.degrees = {node: 0 for node in graph.nodes}
+        self.components = UnionFind()
+        for node in self.degrees:
+            self.components.add(node)
+        for node1, node2 in graph.edges():
+            self.degrees[node1] += 1
+            self.degrees[node2] += 1
+            self.components.union(node1, node2)
+        self.components_stale = False
+        self.degrees_stale = False
+        self.version += 1
+        self.degree_version += 1
+        self.component_version += 1
+
+    # Cached queries
+
+    def _cached(self, name, version, params, compute):
+        entry = self.cache.get(name)
+        if entry is not None and entry[0] == version and entry[1] == params:
+            self.stats["hits"] += 1
+            return entry[2]
+        self.stats["misses"] += 1
+        result = compute()
+        self.cache[name] = (version, params, result)
+        return result
+
+    def connected_components(self, graph):
+        """Connected components as a list of sets (the cached list is shared; don't mutate it)."""
+        if self.components_stale:
+            self.rebuild(graph)
+            self.stats["component_rebuilds"] += 1
+        return self._cached("components", self.component_version, None, self.components.groups)
+
+    def degree_centrality(self, graph):
+        if self.degrees_stale:
+            self.rebuild(graph)
+
+        def compute():
+            count = len(self.degrees)
+            if count <= 1:
+                return {node: 1.0 for node in self.degrees}
+            scale = 1.0 / (count - 1)
+            return {node: degree * scale for node, degree in self.degrees.items()}
+        return self._cached("degree", self.degree_version, None, compute)
+
+    def pagerank(self, graph, alpha=0.85, tol=1.0e-6, max_iter=100):
+        return self._cached(
+            "pagerank", self.version, (alpha, tol, max_iter),
+            lambda: pagerank(*edge_arrays(graph), alpha=alpha, tol=tol, max_iter=max_iter),
+        )
+
+    def betweenness(self, graph, k=None, seed=None):
+        return self._cached(
+            "betweenness", self.version, (k, seed),
+            lambda: betweenness(*edge_arrays(graph), k=k, seed=seed),
+        )
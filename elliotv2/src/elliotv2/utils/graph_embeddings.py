@@ -0,0 +1,199 @@
+import numpy as np
+
+from utils.graph_analytics import edge_arrays
+
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+
+
+def _mix(values):
+    """splitmix64 finalizer over a uint64 array."""
+    values = values ^ (values >> np.uint64(30))
+    values = values * np.uint64(0xBF58476D1CE4E5B9)
+    values = values ^ (values >> np.uint64(27))
+    values = values * np.uint64(0x94D049BB133111EB)
+    return values ^ (values >> np.uint64(31))
+
+
+def projection_rows(rows, dim, seed=0):
+    """
+    Very sparse random projection rows (Achlioptas): +-sqrt(3) with probability 1/6 each, else 0.
+    Rows are derived from a hash of (row id, column), so any row can be regenerated on demand
+    instead of keeping the projection matrix in memory.
+    """
+    rows = np.asarray(rows, dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        keys = (rows[:, None] * np.uint64(dim) + np.arange(dim, dtype=np.uint64)) * _GOLDEN + np.uint64(seed)
+        buckets = _mix(keys) % np.uint64(6)
+    values = np.zeros(buckets.shape, dtype=np.float32)
+    values[buckets == 0] = np.sqrt(3.0)
+    values[buckets == 1] = -np.sqrt(3.0)
+    return values
+
+
+class NodeEmbeddings:
+    """
+    Structural node embeddings from sparse random projection (FastRP-style).
+
+    Level k is the neighbor-average of level k-1, starting from a random projection
+    of each node, and the embedding is the normalized weighted sum of the levels. All
+    levels are kept as float32 matrices, so after edge changes only the rows within
+    `hops` of a touched node need recomputing; a full fit runs each level as `dim`
+    np.bincount passes over the edge arrays.
+    """
+
+    def __init__(self, dim=64, hops=2, weights=None, seed=0, full_refresh_ratio=0.2):
+        self.dim = dim
+        self.hops = hops
+        self.weights = list(weights or [1.0] * hops)
+        self.seed = seed
+        self.full_refresh_ratio = full_refresh_ratio
+        self.nodes = []  # row -> node_id
+        self.index = {}  # node_id -> row
+        self.alive = np.zeros(0, dtype=np.bool_)
+        self.levels = []  # hops matrices of shape (rows, dim)
+        self.matrix = np.zeros((0, dim), dtype=np.float32)  # normalized embeddings
+        self.dirty = set()
+        self.fitted = False
+
+    def __len__(self):
+        return int(self.alive.sum())
+
+    def mark_dirty(self, *nodes):
+        if self.fitted:
+            self.dirty.update(nodes)
+
+    def invalidate(self):
+        """Force a full fit on the next refresh (after bulk changes)."""
+        self.fitted = False
+        self.dirty.clear()
+
+    # Fitting
+
+    def fit(self, graph):
+        """Compute embeddings for the whole graph."""
+        nodes, src, dst = edge_arrays(graph)
+        count = len(nodes)
+        self.nodes = list(nodes)
+        self.index = {node: row for row, node in enumerate(self.nodes)}
+        self.alive = np.ones(count, dtype=np.bool_)
+        loops = src == dst
+        sources = np.concatenate([src, dst[~loops]])
+        targets = np.concatenate([dst, src[~loops]])
+        degree = np.bincount(targets, minlength=count).astype(np.float32)
+        scale = np.divide(1.0, degree, out=np.zeros_like(degree), where=degree > 0)
+
+        current = projection_rows(np.arange(count), self.dim, self.seed)
+        self.levels = []
+        for _ in range(self.hops):
+            columns = np.ascontiguousarray(current.T)  # Column-major so each gather is contiguous
+            averaged = np.empty((count, self.dim), dtype=np.float32)
+            for column in range(self.dim):
+                averaged[:, column] = np.bincount(targets, weights=columns[column][sources], minlength=count) * scale
+            self.levels.append(averaged)
+            current = averaged
+        self.matrix = self._combine(np.arange(count))
+        self.dirty.clear()
+        self.fitted = True
+        return count
+
+    def _combine(self, rows):
+        combined = sum(weight * level[rows] for weight, level in zip(self.weights, self.levels))
+        norms = np.linalg.norm(combined, axis=1, keepdims=True)
+        return np.divide(combined, norms, out=np.zeros_like(combined), where=norms > 0).astype(np.float32)
+
+    def _grow(self, count):
+        """Make room for `count` more rows."""
+        self.alive = np.concatenate([self.alive, np.zeros(count, dtype=np.bool_)])
+        padding = np.zeros((count, self.dim), dtype=np.float32)
+        self.levels = [np.vstack([level, padding]) for level in self.levels]
+        self.matrix = np.vstack([self.matrix, padding])
+
+    def refresh(self, graph):
+        """
+        Bring embeddings up to date with the graph. Only rows within `hops` of a changed
+        node are recomputed, unless so much changed that a full fit is cheaper.
+        Returns the number of rows recomputed.
+        """
+        if not self.fitted or len(self.dirty) > self.full_refresh_ratio * max(len(self.index), 1):
+            return self.fit(graph)
+        if not self.dirty:
+            return 0
+
+        dirty = self.dirty
+        self.dirty = set()
+        removed = [node for node in dirty if node in self.index and not graph.has_node(node)]
+        for node in removed:
+            row = self.index.pop(node)
+            self.alive[row] = False
+            self.matrix[row] = 0.0
+        new_nodes = [node for node in dirty if node not in self.index and graph.has_node(node)]
+        if new_nodes:
+            first = len(self.nodes)
+            self._grow(len(new_nodes))
+            for offset, node in enumerate(new_nodes):
+                self.index[node] = first + offset
+                self.nodes.append(node)
+                self.alive[first + offset] = True
+
+        # Level k changes for nodes within k hops of a touched node
+        affected = {node for node in dirty if node in self.index}
+        neighbors = {}
+
+        def neighbor_rows(node):
+            rows = neighbors.get(node)
+            if rows is None:
+                rows = neighbors[node] = np.fromiter(
+                    (self.index[n] for n in graph.neighbors(node) if n in self.index), dtype=np.int64
+                )
+            return rows
+
+        previous = None
+        for level in self.levels:
+            rows = list(affected)
+            for node in rows:
+                adjacent = neighbor_rows(node)
+                if not len(adjacent):
+                    level[self.index[node]] = 0.0
+                elif previous is None:
+                    level[self.index[node]] = projection_rows(adjacent, self.dim, self.seed).mean(axis=0)
+                else:
+                    level[self.index[node]] = previous[adjacent].mean(axis=0)
+            previous = level
+            expanded = set(affected)
+            for node in rows:
+                expanded.update(self.nodes[row] for row in neighbor_rows(node))
+            affected = expanded
+        rows = np.fromiter((self.index[node] for node in affected), dtype=np.int64)
+        if len(rows):
+            self.matrix[rows] = self._combine(rows)
+        return len(rows)
+
+    # Queries
+
+    def similar(self, node_id, k=10):
+        """Return up to `k` (node_id, cosine similarity) pairs, most similar first."""
+        row = self.index.get(node_id)
+        if row is None:
+            return []
+        scores = self.matrix @ self.matrix[row]
+        scores[~self.alive] = -np.inf
+        scores[row] = -np.inf
+        k = min(k, int(self.alive.sum()) - 1)
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self.nodes[i], float(scores[i])) for i in top.tolist()]
+
+    def vector(self, node_id):
+        row = self.index.get(node_id)
+        return None if row is None else self.matrix[row].copy()
+
+    def get_stats(self):
+        return {
+            "nodes": len(self),
+            "rows": len(self.nodes),
+            "dim": self.dim,
+            "dirty": len(self.dirty),
+            "bytes": sum(level.nbytes for level in self.levels) + self.matrix.nbytes,
+        }
@@ -0,0 +1,70 @@
+import gc
+import csv
+import json
+import itertools
+import contextlib
+
+
+def batched(iterable, size):
+    """Yield lists of up to `size` items."""
+    iterator = iter(iterable)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+@contextlib.contextmanager
+def paused_gc():
+    """
+    Pause the cyclic garbage collector around a bulk import. Ingestion allocates
+    millions of acyclic containers, and each full collection rescans the whole graph.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _records(path):
+    """Yield dict records from a .csv (header row) or .jsonl file."""
+    with open(path, "r", newline="", encoding="utf-8") as file:
+        if path.endswith(".csv"):
+            yield from csv.DictReader(file)
+        else:
+            for line in file:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+
+
+def read_nodes(path):
+    """
+    Yield (node_id, data) pairs from a CSV or JSONL file.
+    Each record needs a `node_id`; a `data` object is used as-is, otherwise the
+    remaining non-empty fields become the node data.
+    """
+    for record in _records(path):
+        node_id = record.pop("node_id")
+        if "data" in record:
+            data = record["data"]
+            if isinstance(data, str):
+                data = json.loads(data) if data else None
+        else:
+            data = {key: value for key, value in record.items() if value not in (None, "")} or None
+        yield node_id, data
+
+
+def read_edges(path):
+    """
+    Yield (node1, node2, attrs) triples from a CSV or JSONL file.
+    Each record needs `node1` and `node2`; remaining non-empty fields (e.g.
+    `relationship`, `timestamp`) become relationship attributes.
+    """
+    for record in _records(path):
+        node1, node2 = record.pop("node1"), record.pop("node2")
+        yield node1, node2, {key: value for key, value in record.items() if value not in (None, "")}
@@ -0,0 +1,264 @@
+import os
+import json
+import time
+
+from utils.metrics import connect_timed
+from utils.time_index import to_epoch
+
+
+def encode_node(node_id):
+    """Encode a node id as JSON text so ints and strings survive the round trip."""
+    return json.dumps(node_id)
+
+
+def decode_node(key):
+    value = json.loads(key)
+    return tuple(value) if isinstance(value, list) else value
+
+
+def _timestamp(data):
+    """Epoch seconds of a node data/edge attrs "timestamp", stored in the indexed ts column."""
+    return to_epoch(data.get("timestamp")) if isinstance(data, dict) else None
+
+
+class GraphStore:
+    """
+    SQLite adjacency-table persistence for the Association Cortex graph.
+
+    Mutations are written through as they happen and committed in batches
+    (every `batch_size` operations or `commit_interval` seconds). Edges are
+    undirected and stored once under a canonical (node1, node2) ordering.
+    Each row's "timestamp" is also kept in an indexed ts column for purges.
+    """
+
+    def __init__(self, db_file="data/association_cortex.db", batch_size=1000, commit_interval=1.0):
+        self.db_file = db_file
+        self.batch_size = batch_size
+        self.commit_interval = commit_interval
+        self.uncommitted = 0
+        self.last_commit = time.time()
+        directory = os.path.dirname(db_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = connect_timed(db_file, "Association Cortex", check_same_thread=False)
+        self.initialize_db()
+
+    def initialize_db(self):
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA cache_size=-65536")  # 64 MB page cache keeps bulk index inserts off the disk
+        self.conn.execute("""
+        CREATE TABLE IF NOT EXISTS nodes (
+            node_id TEXT PRIMARY KEY,
+            data TEXT,
+            ts REAL
+        )
+        """)
+        self.conn.execute("""
+        CREATE TABLE IF NOT EXISTS edges (
+            node1 TEXT NOT NULL,
+            node2 TEXT NOT NULL,
+            attrs TEXT,
+            ts REAL,
+            PRIMARY KEY (node1, node2)
+        )
+        """)
+        self._add_ts_column("nodes", "node_id", "data")
+        self._add_ts_column("edges", "node1, node2", "attrs")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_edges_node2 ON edges (node2)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_nodes_ts ON nodes (ts, node_id)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_edges_ts ON edges (ts, node1, node2)")
+        self.conn.commit()
+
+    def _add_ts_column(self, table, key_columns, data_column):
+        """Migrate a database written before the ts column existed, backfilling it from the stored JSON."""
+        columns = [row[1] for row in self.conn.execute(f"PRAGMA table_info({table})")]
+        if "ts" in columns:
+            return
+        self.conn.execute(f"ALTER TABLE {table} ADD COLUMN ts REAL")
+        keys = key_columns.split(", ")
+        query = f"SELECT {key_columns}, json_extract({data_column}, '$.timestamp') FROM {table} WHERE json_extract({data_column}, '$.timestamp') IS NOT NULL"
+        rows = [(to_epoch(row[-1]), *row[:-1]) for row in self.conn.execute(query).fetchall()]
+        where = " AND ".join(f"{key} = ?" for key in keys)
+        self.conn.executemany(f"UPDATE {table} SET ts = ? WHERE {where}", rows)
+
+    @staticmethod
+    def _edge_key(node1, node2):
+        key1, key2 = encode_node(node1), encode_node(node2)
+        return (key1, key2) if key1 <= key2 else (key2, key1)
+
+    def _changed(self, count=1):
+        self.uncommitted += count
+        if self.uncommitted >= self.batch_size or time.time() - self.last_commit >= self.commit_interval:
+            self.flush()
+
+    def flush(self):
+        """Commit any buffered mutations."""
+        if self.uncommitted:
+            self.conn.commit()
+            self.uncommitted = 0
+        self.last_commit = time.time()
+
+    # Mutations
+
+    def put_node(self, node_id, data):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO nodes (node_id, data, ts) VALUES (?, ?, ?)",
+            (encode_node(node_id), json.dumps(data, default=str), _timestamp(data)),
+        )
+        self._changed()
+
+    def put_nodes(self, nodes):
+        """Bulk insert (node_id, data) pairs."""
+        rows = [(encode_node(node_id), json.dumps(data, default=str), _timestamp(data)) for node_id, data in nodes]
+        self.conn.executemany("INSERT OR REPLACE INTO nodes (node_id, data, ts) VALUES (?, ?, ?)", rows)
+        self._changed(len(rows))
+
+    def delete_node(self, node_id):
+        """Delete a node and every edge touching it."""
+        key = encode_node(node_id)
+        self.conn.execute("DELETE FROM nodes WHERE node_id = ?", (key,))
+        self.conn.execute("DELETE FROM edges WHERE node1 = ? OR node2 = ?", (key, key))
+        self._changed()
+
+    def put_edge(self, node1, node2, attrs):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO edges (node1, node2, attrs, ts) VALUES (?, ?, ?, ?)",
+            (*self._edge_key(node1, node2), json.dumps(attrs, default=str), _timestamp(attrs)),
+        )
+        self._changed()
+
+    def put_edges(self, edges):
+        """Bulk insert (node1, node2, attrs) triples."""
+        encoded = {}  # id(attrs) -> (attrs, JSON, ts); bulk imports often share one attrs dict across many edges
+        rows = []
+        for node1, node2, attrs in edges:
+            entry = encoded.get(id(attrs))
+            if entry is None:
+                # Holding a reference keeps the id from being reused by another dict during this call
+                entry = encoded[id(attrs)] = (attrs, json.dumps(attrs, default=str), _timestamp(attrs))
+            rows.append((*self._edge_key(node1, node2), entry[1], entry[2]))
+        self.conn.executemany("INSERT OR REPLACE INTO edges (node1, node2, attrs, ts) VALUES (?, ?, ?, ?)", rows)
+        self._changed(len(rows))
+
+    def delete_edge(self, node1, node2):
+        self.conn.execute("DELETE FROM edges WHERE node1 = ? AND node2 = ?", self._edge_key(node1, node2))
+        self._changed()
+
+    # Loading
+
+    def has_node(self, node_id):
+        row = self.conn.execute("SELECT 1 FROM nodes WHERE node_id = ?", (encode_node(node_id),)).fetchone()
+        return row is not None
+
+    def load_node_data(self, node_id):
+        """Load only a node's data, without its edges."""
+        row = self.conn.execute("SELECT data FROM nodes WHERE node_id = ?", (encode_node(node_id),)).fetchone()
+        return json.loads(row[0]) if row and row[0] else None
+
+    def load_node(self, node_id):
+        """
+        Load a single node and its incident edges.
+        Returns:
+            tuple: (data, [(neighbor, attrs), ...]) or None if the node is not stored.
+        """
+        key = encode_node(node_id)
+        row = self.conn.execute("SELECT data FROM nodes WHERE node_id = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        edges = []
+        query = "SELECT node1, node2, attrs FROM edges WHERE node1 = ? UNION ALL SELECT node1, node2, attrs FROM edges WHERE node2 = ? AND node1 != ?"
+        for node1, node2, attrs in self.conn.execute(query, (key, key, key)):
+            neighbor = node2 if node1 == key else node1
+            edges.append((decode_node(neighbor), json.loads(attrs) if attrs else {}))
+        return (json.loads(row[0]) if row[0] else None), edges
+
+    def iter_nodes(self):
+        for key, data in self.conn.execute("SELECT node_id, data FROM nodes"):
+            yield decode_node(key), (json.loads(data) if data else None)
+
+    def iter_edges(self):
+        for node1, node2, attrs in self.conn.execute("SELECT node1, node2, attrs FROM edges"):
+            yield decode_node(node1), decode_node(node2), (json.loads(attrs) if attrs else {})
+
+    def load_into(self, graph):
+        """Bulk load every stored node and edge into a graph exposing add_nodes_from/add_edges_from."""
+        self.flush()
+        graph.add_nodes_from((node_id, {"data": data}) for node_id, data in self.iter_nodes())
+        graph.add_edges_from(self.iter_edges())
+        return graph
+
+    def counts(self):
+        nodes = self.conn.execute("SELECT COUNT(*) FROM nodes").fetchone()[0]
+        edges = self.conn.execute("SELECT COUNT(*) FROM edges").fetchone()[0]
+        return {"nodes": nodes, "edges": edges}
+
+    # Whole-graph queries, for lazy/tiered mode where memory holds only part of the graph
+
+    def expired_nodes(self, cutoff, after=None, limit=512):
+        """
+        One page of nodes whose timestamp is older than `cutoff` (epoch seconds), read off the ts index.
+        Returns:
+            tuple: ([node_id, ...], cursor) where cursor is passed back as `after` for the next page,
+            or None once the expired range is exhausted.
+        """
+        if after is None:
+            query, params = "SELECT ts, node_id FROM nodes WHERE ts < ? ORDER BY ts, node_id LIMIT ?", (cutoff, limit)
+        else:
+            query = "SELECT ts, node_id FROM nodes WHERE ts < ? AND (ts, node_id) > (?, ?) ORDER BY ts, node_id LIMIT ?"
+            params = (cutoff, *after, limit)
+        rows = self.conn.execute(query, params).fetchall()
+        cursor = tuple(rows[-1]) if len(rows) == limit else None
+        return [decode_node(key) for _, key in rows], cursor
+
+    def expired_edges(self, cutoff, after=None, limit=512):
+        """One page of (node1, node2) pairs older than `cutoff`; paged like expired_nodes."""
+        if after is None:
+            query, params = "SELECT ts, node1, node2 FROM edges WHERE ts < ? ORDER BY ts, node1, node2 LIMIT ?", (cutoff, limit)
+        else:
+            query = "SELECT ts, node1, node2 FROM edges WHERE ts < ? AND (ts, node1, node2) > (?, ?, ?) ORDER BY ts, node1, node2 LIMIT ?"
+            params = (cutoff, *after, limit)
+        rows = self.conn.execute(query, params).fetchall()
+        cursor = tuple(rows[-1]) if len(rows) == limit else None
+        return [(decode_node(node1), decode_node(node2)) for _, node1, node2 in rows], cursor
+
+    def degrees(self):
+        """Degree of every stored node (self-loops count twice)."""
+        degrees = {decode_node(key): 0 for (key,) in self.conn.execute("SELECT node_id FROM nodes")}
+        query = "SELECT node, COUNT(*) FROM (SELECT node1 AS node FROM edges UNION ALL SELECT node2 FROM edges) GROUP BY node"
+        for key, degree in self.conn.execute(query):
+            degrees[decode_node(key)] = degree
+        return degrees
+
+    def connected_components(self):
+        """Connected components of the stored graph as a list of sets."""
+        from utils.graph_analytics import UnionFind
+
+        components = UnionFind()
+        for (key,) in self.conn.execute("SELECT node_id FROM nodes"):
+            components.add(key)
+        for node1, node2 in self.conn.execute("SELECT node1, node2 FROM edges"):
+            components.add(node1)
+            components.add(node2)
+            components.union(node1, node2)
+        return [{decode_node(key) for key in group} for group in components.groups()]
+
+    # Maintenance
+
+    def snapshot(self, path=None):
+        """Write a compacted copy of the store to `path`, or compact it in place when no path is given."""
+        self.flush()
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            if os.path.exists(path):
+                os.remove(path)
+            self.conn.execute("VACUUM INTO ?", (path,))
+            return path
+        self.conn.execute("VACUUM")
+        return self.db_file
+
+    def close(self):
+        self.flush()
+        self.conn.close()
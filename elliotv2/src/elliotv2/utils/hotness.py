@@ -0,0 +1,46 @@
+import math
+import time
+import heapq
+from operator import itemgetter
+
+
+class HotnessTracker:
+    """
+    Access hotness combining frequency and recency: every access adds 1 to a score that
+    halves every `half_life` seconds.
+
+    Scores are stored as log(score) + decay * last_access, which orders nodes exactly
+    like their current decayed scores without touching every entry as time passes.
+    """
+
+    def __init__(self, half_life=600.0):
+        self.decay = math.log(2) / half_life
+        self.keys = {}  # node -> log-domain score
+        self.origin = time.monotonic()
+
+    def __len__(self):
+        return len(self.keys)
+
+    def touch(self, node, now=None):
+        now = (time.monotonic() if now is None else now) - self.origin
+        stamp = self.decay * now
+        key = self.keys.get(node)
+        self.keys[node] = stamp if key is None else max(key, stamp) + math.log1p(math.exp(-abs(key - stamp)))
+
+    def score(self, node, now=None):
+        """Current decayed access count (0 for nodes never touched)."""
+        key = self.keys.get(node)
+        if key is None:
+            return 0.0
+        now = (time.monotonic() if now is None else now) - self.origin
+        return math.exp(key - self.decay * now)
+
+    def discard(self, node):
+        self.keys.pop(node, None)
+
+    def coldest(self, nodes, count):
+        """Return the `count` coldest of `nodes`; untouched nodes come first."""
+        keys = self.keys
+        return [node for node, _ in heapq.nsmallest(
+            count, ((node, keys.get(node, -math.inf)) for node in nodes), key=itemgetter(1)
+        )]
@@ -0,0 +1,154 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+class LLMResponseCache:
+    """
+    Two-tier cache for LLM responses.
+
+    An in-memory LRU tier answers repeated prompts without touching disk, and a
+    SQLite tier keeps responses across restarts. Entries expire after `ttl`
+    seconds and each tier is trimmed to its own size limit.
+    """
+
+    def __init__(self, db_file="data/llm_cache.db", memory_size=256, disk_size=10000, ttl=7 * 24 * 3600):
+        self.db_file = db_file
+        self.memory_size = memory_size
+        self.disk_size = disk_size
+        self.ttl = ttl
+        self.memory = OrderedDict()  # key -> (response, created_at)
+        self.metrics = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0, "evictions": 0, "expired": 0}
+        self.lock = threading.Lock()
+        self.conn = self.initialize_db(db_file) if db_file else None
+
+    def initialize_db(self, db_file):
+        directory = os.path.dirname(db_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(db_file, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        query = """
+        CREATE TABLE IF NOT EXISTS llm_cache (
+            cache_key TEXT PRIMARY KEY,
+            response TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            last_access REAL NOT NULL
+        )
+        """
+        conn.execute(query)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_last_access ON llm_cache (last_access)")
+        conn.commit()
+        return conn
+
+    @staticmethod
+    def make_key(model, prompt, params=None):
+        """Hash (model, prompt, parameters) into a stable cache key."""
+        payload = json.dumps([model, prompt, params or {}], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _is_expired(self, created_at, now):
+        return self.ttl is not None and now - created_at > self.ttl
+
+    def get(self, key):
+        """Return the cached response for `key`, or None on a miss."""
+        now = time.time()
+        with self.lock:
+            entry = self.memory.get(key)
+            if entry is not None:
+                if not self._is_expired(entry[1], now):
+                    self.memory.move_to_end(key)
+                    self.metrics["memory_hits"] += 1
+                    return entry[0]
+                del self.memory[key]
+                self.metrics["expired"] += 1
+
+            if self.conn is not None:
+                row = self.conn.execute(
+                    "SELECT response, created_at FROM llm_cache WHERE cache_key = ?", (key,)
+                ).fetchone()
+                if row:
+                    response, created_at = row
+                    if not self._is_expired(created_at, now):
+                        response = json.loads(response)
+                        self.conn.execute("UPDATE llm_cache SET last_access = ? WHERE cache_key = ?", (now, key))
+                        self.conn.commit()
+                        self._remember(key, response, created_at)
+                        self.metrics["disk_hits"] += 1
+                        return response
+                    self.conn.execute("DELETE FROM llm_cache WHERE cache_key = ?", (key,))
+                    self.conn.commit()
+                    self.metrics["expired"] += 1
+
+            self.metrics["misses"] += 1
+            return None
+
+    def put(self, key, response):
+        """Store a response in both tiers."""
+        now = time.time()
+        with self.lock:
+            self._remember(key, response, now)
+            if self.conn is not None:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO llm_cache (cache_key, response, created_at, last_access) VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(response), now, now),
+                )
+                self._trim_disk()
+                self.conn.commit()
+            self.metrics["stores"] += 1
+
+    def _remember(self, key, response, created_at):
+        self.memory[key] = (response, created_at)
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.memory_size:
+            self.memory.popitem(last=False)
+            self.metrics["evictions"] += 1
+
+    def _trim_disk(self):
+        if self.ttl is not None:
+            self.conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (time.time() - self.ttl,))
+        count = self.conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        overflow = count - self.disk_size
+        if overflow > 0:
+            self.conn.execute(
+                "DELETE FROM llm_cache WHERE cache_key IN "
+                "(SELECT cache_key FROM llm_cache ORDER BY last_access ASC LIMIT ?)",
+                (overflow,),
+            )
+            self.metrics["evictions"] += overflow
+
+    def invalidate(self, key):
+        """Drop a single entry from both tiers."""
+        with self.lock:
+            self.memory.pop(key, None)
+            if self.conn is not None:
+                self.conn.execute("DELETE FROM llm_cache WHERE cache_key = ?", (key,))
+                self.conn.commit()
+
+    def clear(self):
+        """Drop every cached response."""
+        with self.lock:
+            self.memory.clear()
+            if self.conn is not None:
+                self.conn.execute("DELETE FROM llm_cache")
+                self.conn.commit()
+
+    def stats(self):
+        """Return hit/miss counters and the current size of each tier."""
+        with self.lock:
+            stats = dict(self.metrics)
+            stats["memory_entries"] = len(self.memory)
+            if self.conn is not None:
+                stats["disk_entries"] = self.conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["memory_hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+        return stats
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
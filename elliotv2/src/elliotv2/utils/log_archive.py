@@ -0,0 +1,175 @@
+import os
+import gzip
+import json
+import time
+import bisect
+import datetime
+import threading
+
+from utils.time_index import to_epoch
+
+
+_JSON_PREFIX = '{"timestamp": "'
+
+
+def line_timestamp(line):
+    """
+    Epoch seconds of a log line, either text ("{iso timestamp} - LEVEL in context: message")
+    or JSONL (timestamp is always the first key); None if unparseable.
+    """
+    if line.startswith(_JSON_PREFIX):
+        return to_epoch(line[len(_JSON_PREFIX):line.find('"', len(_JSON_PREFIX))])
+    return to_epoch(line.split(" - ", 1)[0])
+
+
+class LogArchive:
+    """
+    Rotated log segments, gzip-compressed, with an index of their time ranges.
+
+    Each segment is written as a series of independent gzip members of about
+    `chunk_bytes` uncompressed bytes (still one valid .gz file). The index keeps
+    every segment's first/last timestamp and the offset and first timestamp of each
+    member, so a time-range read skips whole segments and seeks straight to the
+    member holding the range start instead of decompressing from the top.
+    """
+
+    def __init__(self, log_file, archive_dir=None, backup_count=20, chunk_bytes=1024 * 1024):
+        self.log_file = log_file
+        self.stem, self.ext = os.path.splitext(os.path.basename(log_file))
+        self.archive_dir = archive_dir or os.path.join(os.path.dirname(log_file) or ".", "archive")
+        self.backup_count = backup_count
+        self.chunk_bytes = chunk_bytes
+        self.index_file = os.path.join(self.archive_dir, f"{self.stem}{self.ext}.index.json")
+        self.lock = threading.Lock()
+        os.makedirs(self.archive_dir, exist_ok=True)
+
+    # Index
+
+    def segments(self):
+        """Archived segments, oldest first: dicts with file, start, end, records and chunks."""
+        try:
+            with open(self.index_file, "r", encoding="utf-8") as file:
+                return json.load(file)
+        except (FileNotFoundError, ValueError):
+            return []
+
+    def _save(self, segments):
+        temp_file = f"{self.index_file}.tmp"
+        with open(temp_file, "w", encoding="utf-8") as file:
+            json.dump(segments, file)
+        os.replace(temp_file, self.index_file)
+
+    # Rotation
+
+    def segment_path(self):
+        """A fresh path for the next rotated segment, named after the log file."""
+        stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+        path = os.path.join(self.archive_dir, f"{self.stem}.{stamp}{self.ext}")
+        counter = 1
+        while os.path.exists(path) or os.path.exists(f"{path}.gz"):
+            path = os.path.join(self.archive_dir, f"{self.stem}.{stamp}-{counter}{self.ext}")
+            counter += 1
+        return path
+
+    def pending_segments(self):
+        """Rotated segments that were never compressed (e.g. the process stopped mid-rotation)."""
+        prefix = f"{self.stem}."
+        return sorted(
+            os.path.join(self.archive_dir, name) for name in os.listdir(self.archive_dir)
+            if name.startswith(prefix) and name.endswith(self.ext) and not name.endswith((".gz", ".json", ".tmp"))
+        )
+
+    def compress(self, raw_path, delay=0.0):
+        """Compress a rotated segment into chunked gzip, index it, delete the original and apply retention."""
+        time.sleep(delay)  # Let other processes notice the rotation before the segment is read
+        gz_path = f"{raw_path}.gz"
+        chunks = []
+        start = end = None
+        records = 0
+        with open(raw_path, "r", encoding="utf-8", errors="replace") as source, open(gz_path, "wb") as target:
+            buffer, size = [], 0
+            for line in source:
+                buffer.append(line)
+                size += len(line)
+                records += 1
+                if size >= self.chunk_bytes:
+                    start, end = self._write_chunk(target, buffer, chunks, start, end)
+                    buffer, size = [], 0
+            if buffer:
+                start, end = self._write_chunk(target, buffer, chunks, start, end)
+        with self.lock:
+            segments = self.segments()
+            segments.append({
+                "file": os.path.basename(gz_path), "start": start, "end": end, "records": records, "chunks": chunks,
+            })
+            segments.sort(key=lambda segment: segment["start"] if segment["start"] is not None else 0.0)
+            while self.backup_count is not None and len(segments) > self.backup_count:
+                self._delete(segments.pop(0))
+            self._save(segments)
+        os.remove(raw_path)
+        return gz_path
+
+    def _write_chunk(self, target, lines, chunks, start, end):
+        first = next((ts for ts in map(line_timestamp, lines[:10]) if ts is not None), None)
+        last = next((ts for ts in map(line_timestamp, reversed(lines[-10:])) if ts is not None), None)
+        chunks.append([target.tell(), first])
+        target.write(gzip.compress("".join(lines).encode("utf-8"), compresslevel=6))
+        if first is not None and (start is None or first < start):
+            start = first
+        if last is not None and (end is None or last > end):
+            end = last
+        return start, end
+
+    def _delete(self, segment):
+        try:
+            os.remove(os.path.join(self.archive_dir, segment["file"]))
+        except FileNotFoundError:
+            pass
+
+    def expire(self, retention_days):
+        """Delete archived segments whose newest record is older than `retention_days`."""
+        cutoff = time.time() - retention_days * 86400
+        with self.lock:
+            segments = self.segments()
+            kept = [segment for segment in segments if segment["end"] is None or segment["end"] >= cutoff]
+            for segment in segments:
+                if segment not in kept:
+                    self._delete(segment)
+            self._save(kept)
+        return len(segments) - len(kept)
+
+    # Reading
+
+    def read(self, start=None, end=None):
+        """Yield archived lines with start <= timestamp <= end (either bound may be None), oldest segment first."""
+        start, end = to_epoch(start), to_epoch(end)
+        for segment in self.segments():
+            if start is not None and segment["end"] is not None and segment["end"] < start:
+                continue
+            if end is not None and segment["start"] is not None and segment["start"] > end:
+                continue
+            offset = 0
+            if start is not None:
+                firsts = [first if first is not None else float("-inf") for _, first in segment["chunks"]]
+                position = bisect.bisect_right(firsts, start) - 1
+                offset = segment["chunks"][max(position, 0)][0] if segment["chunks"] else 0
+            path = os.path.join(self.archive_dir, segment["file"])
+            with open(path, "rb") as raw:
+                raw.seek(offset)
+                with gzip.GzipFile(fileobj=raw) as file:
+                    yield from filter_lines((line.decode("utf-8", errors="replace") for line in file), start, end)
+
+
+def filter_lines(lines, start=None, end=None):
+    """Yield lines inside [start, end]; stops at the first line past `end` (files are in time order)."""
+    for line in lines:
+        if start is None and end is None:
+            yield line
+            continue
+        timestamp = line_timestamp(line)
+        if timestamp is None:
+            continue
+        if end is not None and timestamp > end:
+            return
+        if start is None or timestamp >= start:
+            yield line
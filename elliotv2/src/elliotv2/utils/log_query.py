@@ -0,0 +1,180 @@
+"""
+Stream and aggregate ErrorLogger files.
+
+Reads JSONL logs (logging.format: jsonl) as well as classic text logs, plain or
+gzip-compressed, one record at a time; aggregations keep only their counters,
+so memory doesn't grow with the size of the log.
+
+Run from src/elliotv2:
+    python -m utils.log_query logs/system_log.jsonl --archive --region "Association Cortex" --count-by operation
+    python -m utils.log_query logs/system_log.jsonl --since 2024-06-01T10:00 --error-rate --slowest 10
+"""
+import re
+import sys
+import gzip
+import json
+import heapq
+import argparse
+from collections import Counter
+
+from utils.time_index import to_epoch
+from utils.logger import region_of
+from utils.log_archive import LogArchive, filter_lines
+
+LEVELS = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40}
+_TEXT_LINE = re.compile(r"^(\S+) - (\w+) in (.*?): (.*)$")
+
+
+def parse_line(line):
+    """
+    Parse one log line (JSONL or text) into a record dict; None for blank or malformed lines.
+    "region" is always the normalized region and "context" the full log context, so older
+    JSONL logs that wrote the raw context as "region" group the same way as new ones.
+    """
+    line = line.strip()
+    if not line:
+        return None
+    if line.startswith("{"):
+        try:
+            record = json.loads(line)
+        except ValueError:
+            return None
+        if not isinstance(record, dict):
+            return None
+        if "region" in record:
+            record.setdefault("context", record["region"])
+            record["region"] = region_of(record["region"])
+        return record
+    match = _TEXT_LINE.match(line)
+    if match is None:
+        return None
+    timestamp, level, context, message = match.groups()
+    record = {"timestamp": timestamp, "level": level, "region": region_of(context), "context": context, "message": message}
+    head, separator, tail = message.rpartition(" | ")
+    if separator and all("=" in token for token in tail.split()):
+        record["message"] = head
+        for token in tail.split():
+            key, value = token.split("=", 1)
+            try:
+                record[key] = float(value) if key == "duration" else value
+            except ValueError:
+                record[key] = value
+    return record
+
+
+def _lines(path):
+    if path.endswith(".gz"):
+        with gzip.open(path, "rt", encoding="utf-8", errors="replace") as file:
+            yield from file
+    else:
+        with open(path, "r", encoding="utf-8", errors="replace") as file:
+            yield from file
+
+
+def iter_records(paths, start=None, end=None, level=None, region=None, operation=None, contains=None, archive=False):
+    """
+    Yield records from `paths` matching every given filter.
+    Args:
+        start, end: Time bounds (epoch seconds, datetimes or ISO strings).
+        level (str): Minimum level, e.g. "WARNING" keeps warnings and errors.
+        region (str): Region name, aliases included ("Declarative Memory" matches "Hippocampus").
+        operation (str): Exact operation name.
+        contains (str): Substring of the message.
+        archive (bool): Also read each log's rotated segments, using the archive index for the time range.
+    """
+    start, end = to_epoch(start), to_epoch(end)
+    min_level = LEVELS.get(level, 0) if level else 0
+    region = region_of(region) if region is not None else None
+    for path in paths:
+        sources = []
+        if archive:
+            sources.append(LogArchive(path).read(start, end))
+        sources.append(filter_lines(_lines(path), start, end))
+        for lines in sources:
+            for line in lines:
+                record = parse_line(line)
+                if record is None:
+                    continue
+                if min_level and LEVELS.get(record.get("level"), 0) < min_level:
+                    continue
+                if region is not None and record.get("region") != region:
+                    continue
+                if operation is not None and record.get("operation") != operation:
+                    continue
+                if contains is not None and contains not in str(record.get("message", "")):
+                    continue
+                yield record
+
+
+def count_by(records, field):
+    """Count records per value of `field`, most common first."""
+    return Counter(record.get(field) for record in records).most_common()
+
+
+def error_rate_per_minute(records):
+    """Return (minute, errors, total, error rate) tuples in time order; one counter pair per minute seen."""
+    minutes = {}
+    for record in records:
+        minute = str(record.get("timestamp", ""))[:16]
+        counts = minutes.setdefault(minute, [0, 0])
+        counts[1] += 1
+        if record.get("level") == "ERROR":
+            counts[0] += 1
+    return [(minute, errors, total, errors / total) for minute, (errors, total) in sorted(minutes.items())]
+
+
+def slowest_operations(records, n=10):
+    """The `n` records with the largest duration, slowest first (keeps an n-sized heap)."""
+    heap = []
+    for position, record in enumerate(records):
+        duration = record.get("duration")
+        if not isinstance(duration, (int, float)):
+            continue
+        item = (duration, position, record)
+        if len(heap) < n:
+            heapq.heappush(heap, item)
+        elif item > heap[0]:
+            heapq.heapreplace(heap, item)
+    return [record for _, _, record in sorted(heap, reverse=True)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("paths", nargs="+", help="Log files (.txt, .jsonl, or .gz segments)")
+    parser.add_argument("--archive", action="store_true", help="Include rotated segments of each log")
+    parser.add_argument("--since", help="Start time (ISO timestamp)")
+    parser.add_argument("--until", help="End time (ISO timestamp)")
+    parser.add_argument("--level", choices=list(LEVELS), help="Minimum level")
+    parser.add_argument("--region")
+    parser.add_argument("--operation")
+    parser.add_argument("--contains")
+    parser.add_argument("--count-by", metavar="FIELD", help="Count records per field value (e.g. region, level, operation)")
+    parser.add_argument("--error-rate", action="store_true", help="Errors per minute")
+    parser.add_argument("--slowest", type=int, metavar="N", help="N slowest operations by duration")
+    parser.add_argument("--limit", type=int, default=None, help="Print at most this many matching records")
+    args = parser.parse_args(argv)
+
+    def records():
+        return iter_records(
+            args.paths, args.since, args.until, args.level, args.region, args.operation, args.contains, args.archive
+        )
+
+    if args.count_by:
+        for value, count in count_by(records(), args.count_by):
+            print(f"{count:>10}  {value}")
+    if args.error_rate:
+        for minute, errors, total, rate in error_rate_per_minute(records()):
+            print(f"{minute}  {errors:>6}/{total:<8} {rate:.2%}")
+    if args.slowest:
+        for record in slowest_operations(records(), args.slowest):
+            print(f"{record['duration']:>10.4f}s  {record.get('region')}  {record.get('operation')}  {record.get('timestamp')}")
+    if not (args.count_by or args.error_rate or args.slowest):
+        for count, record in enumerate(records()):
+            if args.limit is not None and count >= args.limit:
+                break
+            print(json.dumps(record, default=str))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
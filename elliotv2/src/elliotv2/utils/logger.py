@@ -1,86 +1,352 @@
 import os
+import sys
+import time
+import json
+import atexit
 import datetime
-import shutil
+import threading
+import itertools
+from collections import deque
+
+from utils.time_index import to_epoch
+from utils.log_archive import LogArchive, line_timestamp, filter_lines
+
+LEVELS = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40}
+
+# Agent and class names that contexts use for each region, mapped to the region name region_levels are keyed by
+REGION_ALIASES = {
+    "Task Coordinator": "Prefrontal Cortex",
+    "PrefrontalCortex": "Prefrontal Cortex",
+    "Declarative Memory": "Hippocampus",
+    "Procedural Memory": "Cerebellum",
+    "Emotional Memory": "Amygdala",
+    "Contextual Memory": "Association Cortex",
+    "AssociationCortex": "Association Cortex",
+}
+
+
+def region_of(context):
+    """Region a log context belongs to: "Hippocampus.store" -> "Hippocampus", "Contextual Memory" -> "Association Cortex"."""
+    prefix = str(context).split(".", 1)[0]
+    return REGION_ALIASES.get(prefix, prefix)
+
 
 class ErrorLogger:
-    def __init__(self, log_file="logs/error_log.txt"):
+    """
+    Queue-based logger shared by every region.
+
+    log_* calls only append a (time, level, context, message) record to an in-memory
+    queue; a background thread formats queued records and writes them in batches
+    through one long-lived file handle, flushing when `flush_size` records are waiting,
+    every `flush_interval` seconds, and at shutdown. Console echo happens on the writer
+    thread too, for records at or above `console_level`.
+
+    When the queue holds `queue_size` records the overflow policy applies:
+    "drop_oldest" discards the oldest queued record, "drop_new" discards the incoming
+    one, and "block" makes the caller flush the queue itself before continuing.
+
+    Records below the threshold for their context are dropped before anything is
+    formatted. The threshold is `region_levels` for the exact context, else for its
+    region (see region_of, so "Hippocampus.store" and "Declarative Memory" both
+    follow "Hippocampus"), else `level`. Messages may be %-style
+    templates with extra arguments, which are only rendered for emitted records;
+    collections longer than `max_items` are sampled and messages are cut at
+    `max_message_length` characters.
+
+    The writer thread rotates the file once it reaches `max_bytes` or is
+    `rotate_interval` seconds old. Rotated segments are gzip-compressed into the
+    archive on a separate thread, keeping the newest `backup_count`; read_logs
+    uses the archive index to read a time range.
+
+    With `format: jsonl` each record is written as one JSON object with timestamp,
+    level, region, message and any keyword fields the caller passed (operation,
+    duration, ids...); utils.log_query streams and aggregates those files.
+    """
+
+    def __init__(self, log_file="logs/error_log.txt", **kwargs):
         self.log_file = log_file
         os.makedirs(os.path.dirname(self.log_file), exist_ok=True)
+        self.console_level = kwargs.get("console_level", "INFO")  # None disables console echo
+        self.level = LEVELS[kwargs.get("level", "INFO")]
+        self.region_levels = {}
+        self.thresholds = {}  # context -> resolved threshold
+        for context, level in (kwargs.get("region_levels") or {}).items():
+            self.set_level(level, context)
+        self.max_items = kwargs.get("max_items", 20)
+        self.max_message_length = kwargs.get("max_message_length", 2000)
+        self.flush_interval = kwargs.get("flush_interval", 0.5)
+        self.flush_size = kwargs.get("flush_size", 256)
+        self.queue_size = kwargs.get("queue_size", 100000)
+        self.overflow = kwargs.get("overflow", "drop_oldest")
+        self.max_bytes = kwargs.get("max_bytes", 50 * 1024 * 1024)  # None disables size-based rotation
+        self.rotate_interval = kwargs.get("rotate_interval", 86400)  # None disables time-based rotation
+        self.archive = LogArchive(log_file, kwargs.get("archive_dir"), kwargs.get("backup_count", 20))
+        self.compressors = []
+        self.format = kwargs.get("format", "text")  # "text" or "jsonl"
+        self.stats = {"written": 0, "dropped": 0, "flushes": 0, "rotations": 0, "writer_errors": 0}
 
-    def _log(self, level, context, message):
+        self.queue = deque()
+        self.wakeup = threading.Event()
+        self.write_lock = threading.Lock()
+        self.file = open(self.log_file, "a", encoding="utf-8")
+        self.segment_started = self._first_timestamp() or time.time()
+        if self.max_bytes is not None or self.rotate_interval is not None:
+            for raw_path in self.archive.pending_segments():  # Left behind by a process that stopped mid-rotation
+                self._compress(raw_path)
+        self.closed = False
+        self.writer = threading.Thread(target=self._run_writer, name="error-logger", daemon=True)
+        self.writer.start()
+        atexit.register(self.close)
+
+    # Filtering and formatting
+
+    def set_level(self, level, context=None):
+        """Set the threshold for one context or region (any alias), or the default threshold when context is None."""
+        if context is None:
+            self.level = LEVELS[level]
+        else:
+            self.region_levels[REGION_ALIASES.get(context, context)] = LEVELS[level]
+        self.thresholds = {}
+
+    def threshold(self, context):
+        """Minimum level written for `context`."""
+        try:
+            return self.thresholds[context]
+        except KeyError:
+            pass
+        threshold = self.region_levels.get(context)
+        if threshold is None:
+            threshold = self.region_levels.get(region_of(context), self.level)
+        self.thresholds[context] = threshold
+        return threshold
+
+    def is_enabled(self, level, context):
+        """Whether a record at `level` for `context` would be written; lets callers skip expensive work."""
+        return LEVELS[level] >= self.threshold(context)
+
+    def _summarize(self, value):
+        """Sample long collections so formatting cost and record size stay bounded."""
+        if isinstance(value, (list, tuple, set, frozenset, dict)) and len(value) > self.max_items:
+            if isinstance(value, dict):
+                sample = dict(itertools.islice(value.items(), self.max_items))
+            else:
+                sample = list(itertools.islice(value, self.max_items))
+            return f"{sample!r}... (+{len(value) - self.max_items} more)"
+        return value
+
+    def _render(self, message, args):
+        if args:
+            args = tuple(self._summarize(arg) for arg in args)
+            try:
+                message = message % args
+            except (TypeError, ValueError):
+                message = " ".join([str(message)] + [str(arg) for arg in args])
+        else:
+            message = str(self._summarize(message))
+        if len(message) > self.max_message_length:
+            message = f"{message[:self.max_message_length]}... ({len(message) - self.max_message_length} chars truncated)"
+        return message
+
+    # Queue
+
+    def _log(self, level, context, message, *args, **fields):
         """
         Internal logging method to handle all types of log entries.
         Args:
             level (str): Log level (e.g., ERROR, WARNING, INFO).
             context (str): Context of the log entry.
-            message (str): Log message.
+            message (str): Log message, or a %-style template rendered with `args`.
+            **fields: Structured fields such as operation and duration (seconds).
         """
-        timestamp = datetime.datetime.now().isoformat()
-        log_entry = f"{timestamp} - {level} in {context}: {message}\n"
-
-        with open(self.log_file, "a") as file:
-            file.write(log_entry)
-        print(f"Logged {level.lower()}: {log_entry.strip()}")
+        if LEVELS[level] < self.threshold(context):
+            return
+        message = self._render(message, args)
+        if self.closed:
+            with open(self.log_file, "a", encoding="utf-8") as file:  # Late records after shutdown
+                file.write(self._format((time.time(), level, context, message, fields)))
+            return
+        queue = self.queue
+        if len(queue) >= self.queue_size:
+            if self.overflow == "drop_new":
+                self.stats["dropped"] += 1
+                return
+            if self.overflow == "block":
+                self.flush()
+            else:
+                try:
+                    queue.popleft()
+                    self.stats["dropped"] += 1
+                except IndexError:
+                    pass
+        queue.append((time.time(), level, context, message, fields))
+        if len(queue) >= self.flush_size:
+            self.wakeup.set()
 
-    def log_error(self, context, error_message):
-        timestamp = datetime.datetime.now().isoformat()
-        log_entry = f"{timestamp} - ERROR in {context}: {error_message}\n"
-        with open(self.log_file, "a") as file:
-            file.write(log_entry)
-        print(f"Logged error: {log_entry.strip()}")
+    def log_error(self, context, error_message, *args, **fields):
+        self._log("ERROR", context, error_message, *args, **fields)
 
-    def log_info(self, context, info_message):
+    def log_info(self, context, info_message, *args, **fields):
         """
         Log general informational messages.
         Args:
             context (str): Context of the info message (e.g., Association Cortex).
-            info_message (str): Detailed information message.
+            info_message (str): Detailed information message, or a %-style template.
+            *args: Template arguments, only rendered if the record is emitted.
+            **fields: Structured fields (e.g. operation="add_node", duration=0.002).
         """
-        timestamp = datetime.datetime.now().isoformat()
-        log_entry = f"{timestamp} - INFO in {context}: {info_message}\n"
-
-        with open(self.log_file, "a") as file:
-            file.write(log_entry)
-        print(f"Logged info: {log_entry.strip()}")
+        if LEVELS["INFO"] < self.threshold(context):
+            return
+        self._log("INFO", context, info_message, *args, **fields)
 
-    def log_warning(self, context, warning_message):
+    def log_warning(self, context, warning_message, *args, **fields):
         """Log warnings."""
-        timestamp = datetime.datetime.now().isoformat()
-        log_entry = f"{timestamp} - WARNING in {context}: {warning_message}\n"
-        with open(self.log_file, "a") as file:
-            file.write(log_entry)
-        print(f"Logged warning: {log_entry.strip()}")
+        self._log("WARNING", context, warning_message, *args, **fields)
+
+    def log_debug(self, context, debug_message, *args, **fields):
+        """Log diagnostic detail (off unless the context's threshold is DEBUG)."""
+        if LEVELS["DEBUG"] < self.threshold(context):
+            return
+        self._log("DEBUG", context, debug_message, *args, **fields)
+
+    # Writer
+
+    def _run_writer(self):
+        while not self.closed:
+            self.wakeup.wait(self.flush_interval)
+            self.wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:  # Keep the writer alive; a dead writer would silently drop every later record
+                self.stats["writer_errors"] += 1
+                print(f"ErrorLogger writer failed to flush {self.log_file}: {type(e).__name__}: {e}", file=sys.stderr)
+
+    def _format(self, record):
+        timestamp, level, context, message, fields = record
+        timestamp = datetime.datetime.fromtimestamp(timestamp).isoformat()
+        if self.format == "jsonl":
+            event = {"timestamp": timestamp, "level": level, "region": region_of(context), "context": context, "message": message}
+            if fields:
+                event.update(fields)
+            return json.dumps(event, default=str) + "\n"
+        if fields:
+            message = f"{message} | " + " ".join(f"{key}={value}" for key, value in fields.items())
+        return f"{timestamp} - {level} in {context}: {message}\n"
+
+    def flush(self):
+        """Write every queued record now (called by the writer thread, at shutdown, or by blocked callers)."""
+        with self.write_lock:
+            if self.file is None:
+                return
+            queue = self.queue
+            echo_level = LEVELS.get(self.console_level, 100) if self.console_level else 100
+            while queue:
+                lines = []
+                echoed = []
+                while queue and len(lines) < 4096:
+                    try:
+                        record = queue.popleft()
+                    except IndexError:  # drop_oldest overflow pops without the write lock
+                        break
+                    line = self._format(record)
+                    lines.append(line)
+                    if LEVELS.get(record[1], 0) >= echo_level:
+                        echoed.append(f"Logged {record[1].lower()}: {line.strip()}")
+                self.file.write("".join(lines))
+                self.stats["written"] += len(lines)
+                if echoed:
+                    print("\n".join(echoed), file=sys.stdout)
+            self.file.flush()
+            self.stats["flushes"] += 1
+            if self._rotation_due():
+                self._rotate()
+            elif self._moved():
+                self.file.close()
+                self.file = open(self.log_file, "a", encoding="utf-8")
+
+    # Rotation
+
+    def _first_timestamp(self):
+        try:
+            with open(self.log_file, "r", encoding="utf-8", errors="replace") as file:
+                return line_timestamp(file.readline())
+        except OSError:
+            return None
+
+    def _rotation_due(self):
+        if self.max_bytes is not None and self.file.tell() >= self.max_bytes:
+            return True
+        return self.rotate_interval is not None and self.file.tell() > 0 and \
+            time.time() - self.segment_started >= self.rotate_interval
+
+    def _moved(self):
+        """Whether another process rotated the file out from under our handle."""
+        try:
+            return os.stat(self.log_file).st_ino != os.fstat(self.file.fileno()).st_ino
+        except FileNotFoundError:
+            return True
+
+    def _rotate(self):
+        """Move the live file into the archive and start a new one; called with write_lock held."""
+        self.file.close()
+        raw_path = self.archive.segment_path()
+        os.replace(self.log_file, raw_path)
+        self.file = open(self.log_file, "a", encoding="utf-8")
+        self.segment_started = time.time()
+        self.stats["rotations"] += 1
+        self._compress(raw_path, delay=2 * self.flush_interval)
+
+    def _compress(self, raw_path, delay=0.0):
+        self.compressors = [thread for thread in self.compressors if thread.is_alive()]
+        thread = threading.Thread(target=self.archive.compress, args=(raw_path, delay), name="log-compressor", daemon=True)
+        thread.start()
+        self.compressors.append(thread)
+
+    def rotate(self):
+        """Rotate now if the live file has any records."""
+        self.flush()
+        with self.write_lock:
+            if self.file is not None and self.file.tell() > 0:
+                self._rotate()
+                return True
+        return False
+
+    def read_logs(self, start=None, end=None):
+        """
+        Yield log lines between `start` and `end` (epoch seconds, datetimes or ISO strings; either may be None),
+        from the indexed archive first and then the live file.
+        """
+        self.flush()
+        for thread in list(self.compressors):
+            thread.join()
+        yield from self.archive.read(start, end)
+        with open(self.log_file, "r", encoding="utf-8", errors="replace") as file:
+            yield from filter_lines(file, to_epoch(start), to_epoch(end))
+
+    def close(self):
+        """Flush outstanding records, stop the writer thread and close the file."""
+        if self.closed:
+            return
+        self.closed = True
+        self.wakeup.set()
+        if self.writer.is_alive() and self.writer is not threading.current_thread():
+            self.writer.join(timeout=5)
+        self.flush()
+        with self.write_lock:
+            self.file.close()
+            self.file = None
+        for thread in self.compressors:
+            thread.join()
+        atexit.unregister(self.close)
+
+    def get_stats(self):
+        return dict(self.stats, queued=len(self.queue))
 
     def archive_old_logs(self, retention_days=7):
-        """Archive logs older than the specified retention period."""
+        """Rotate the live log into the archive and delete archived segments older than the retention period."""
         try:
-            # Ensure archive directory exists
-            archive_dir = "logs/archive/"
-            os.makedirs(archive_dir, exist_ok=True)
-
-            # Check log file modification time
-            if not os.path.exists(self.log_file):
-                return "No logs to archive."
-
-            modified_time = datetime.datetime.fromtimestamp(os.path.getmtime(self.log_file))
-            current_time = datetime.datetime.now()
-            retention_period = datetime.timedelta(days=retention_days)
-
-            if current_time - modified_time > retention_period:
-                archive_path = os.path.join(
-                    archive_dir, f"error_log_{modified_time.strftime('%Y%m%d')}.txt"
-                )
-                shutil.move(self.log_file, archive_path)
-                return f"Archived log to {archive_path}."
-            else:
-                return "No logs older than the retention period to archive."
+            rotated = self.rotate()
+            expired = self.archive.expire(retention_days)
+            return f"Archived live log: {rotated}; removed {expired} segments older than {retention_days} days."
         except Exception as e:
-            self.log_error("Failed to archive logs", str(e))
+            self.log_error("Logger", "Failed to archive logs: %s", e)
             return f"Error during log archival: {e}"
-    
-    def _write_log(self, log_entry):
-        with open(self.log_file, "a") as file:
-            file.write(log_entry)
-        print(log_entry.strip())
-
-    
@@ -0,0 +1,304 @@
+import os
+import math
+import time
+import sqlite3
+import functools
+import threading
+import contextlib
+
+
+class Counter:
+    def __init__(self):
+        self.value = 0
+        self.lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self.lock:
+            self.value += amount
+
+
+class Gauge:
+    """A value that goes up and down; with `fn`, the value is read from it at export time."""
+
+    def __init__(self, fn=None):
+        self.fn = fn
+        self._value = 0.0
+
+    def set(self, value):
+        self._value = value
+
+    def inc(self, amount=1):
+        self._value += amount
+
+    def dec(self, amount=1):
+        self._value -= amount
+
+    @property
+    def value(self):
+        if self.fn is None:
+            return self._value
+        try:
+            return self.fn()
+        except Exception:
+            return float("nan")
+
+
+class Histogram:
+    """
+    Log-bucketed latency histogram: `per_octave` buckets per doubling from `min_value`
+    upwards, so quantiles are within about 9% (for 4 per octave) at any scale with a
+    fixed, small array of counts.
+    """
+
+    def __init__(self, min_value=1e-6, max_value=1e4, per_octave=4):
+        self.min_value = min_value
+        self.per_octave = per_octave
+        self.offset = math.log2(min_value)
+        self.counts = [0] * (int(math.log2(max_value / min_value) * per_octave) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        self.lock = threading.Lock()
+
+    def observe(self, value):
+        index = int((math.log2(value) - self.offset) * self.per_octave) if value > self.min_value else 0
+        with self.lock:
+            self.counts[min(index, len(self.counts) - 1)] += 1
+            self.count += 1
+            self.sum += value
+            if value < self.min:
+                self.min = value
+            if value > self.max:
+                self.max = value
+
+    def quantile(self, q):
+        """Estimated value at quantile q (0..1); the bucket's geometric midpoint, clamped to the observed range."""
+        with self.lock:
+            if not self.count:
+                return 0.0
+            target = q * self.count
+            seen = 0
+            for index, count in enumerate(self.counts):
+                seen += count
+                if count and seen >= target:
+                    estimate = self.min_value * 2 ** ((index + 0.5) / self.per_octave)
+                    return min(max(estimate, self.min), self.max)
+            return self.max
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class MetricsRegistry:
+    """
+    Named counters, gauges and histograms, each keyed by name and labels.
+
+    Lookups take a lock only when a metric is created, so hot paths can hold on
+    to the metric objects. Histograms are exported in Prometheus text format as
+    summaries with p50/p95/p99 plus _sum and _count.
+    """
+
+    QUANTILES = (0.5, 0.95, 0.99)
+
+    def __init__(self):
+        self.metrics = {}  # (name, labels) -> metric
+        self.help = {}  # name -> (type, help text)
+        self.lock = threading.Lock()
+        self.server = None
+        self.exporter = None
+
+    def _get(self, kind, name, help_text, labels, factory):
+        key = (name, tuple(sorted(labels.items())))
+        metric = self.metrics.get(key)
+        if metric is None:
+            with self.lock:
+                metric = self.metrics.get(key)
+                if metric is None:
+                    metric = self.metrics[key] = factory()
+                    self.help.setdefault(name, (kind, help_text or name))
+        return metric
+
+    def counter(self, name, help_text=None, **labels):
+        return self._get("counter", name, help_text, labels, Counter)
+
+    def gauge(self, name, help_text=None, fn=None, **labels):
+        return self._get("gauge", name, help_text, labels, lambda: Gauge(fn))
+
+    def histogram(self, name, help_text=None, bounds=None, **labels):
+        """Latency histogram in seconds by default; `bounds` (min, max) suits other units such as bytes."""
+        return self._get("summary", name, help_text, labels, lambda: Histogram(*bounds) if bounds else Histogram())
+
+    @contextlib.contextmanager
+    def time(self, name, help_text=None, **labels):
+        """Time a block into a histogram (seconds)."""
+        histogram = self.histogram(name, help_text, **labels)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            histogram.observe(time.perf_counter() - start)
+
+    # Export
+
+    def snapshot(self):
+        """Current values: {name: [(labels, value or {count, sum, p50, p95, p99, max})]}."""
+        result = {}
+        for (name, labels), metric in list(self.metrics.items()):
+            if isinstance(metric, Histogram):
+                value = {"count": metric.count, "sum": metric.sum, "max": metric.max}
+                value.update({f"p{int(q * 100)}": metric.quantile(q) for q in self.QUANTILES})
+            else:
+                value = metric.value
+            result.setdefault(name, []).append((dict(labels), value))
+        return result
+
+    def to_prometheus(self):
+        """Render every metric in the Prometheus text exposition format."""
+        lines = []
+        by_name = {}
+        for (name, labels), metric in sorted(self.metrics.items(), key=lambda item: item[0]):
+            by_name.setdefault(name, []).append((labels, metric))
+        for name, series in by_name.items():
+            kind, help_text = self.help[name]
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, metric in series:
+                label_text = ",".join(f'{key}="{_escape(value)}"' for key, value in labels)
+                if isinstance(metric, Histogram):
+                    prefix = f"{label_text}," if label_text else ""
+                    for q in self.QUANTILES:
+                        lines.append(f'{name}{{{prefix}quantile="{q}"}} {metric.quantile(q):.9g}')
+                    suffix = f"{{{label_text}}}" if label_text else ""
+                    lines.append(f"{name}_sum{suffix} {metric.sum:.9g}")
+                    lines.append(f"{name}_count{suffix} {metric.count}")
+                else:
+                    suffix = f"{{{label_text}}}" if label_text else ""
+                    lines.append(f"{name}{suffix} {metric.value:.9g}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        """Write a snapshot atomically (e.g. for the node_exporter textfile collector)."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            file.write(self.to_prometheus())
+        os.replace(temp_path, path)
+        return path
+
+    def start_file_export(self, path, interval=15.0):
+        """Rewrite the snapshot file every `interval` seconds from a daemon thread."""
+        if self.exporter is not None:
+            return self.exporter
+
+        def export():
+            while True:
+                try:
+                    self.write_prometheus(path)
+                except OSError:
+                    pass
+                time.sleep(interval)
+        self.exporter = threading.Thread(target=export, name="metrics-exporter", daemon=True)
+        self.exporter.start()
+        return self.exporter
+
+    def serve(self, port=9464, host="127.0.0.1"):
+        """Serve /metrics over HTTP on a local-only address from a daemon thread."""
+        if self.server is not None:
+            return self.server
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = registry.to_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self.server.serve_forever, name="metrics-server", daemon=True).start()
+        return self.server
+
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+
+# Process-wide registry the Orchestrator and regions report into
+REGISTRY = MetricsRegistry()
+
+
+def timed(name, region, help_text=None):
+    """Decorator timing every call of a method into `name`{region, method}."""
+    def decorator(func):
+        histogram = REGISTRY.histogram(name, help_text, region=region, method=func.__name__)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+class TimedConnection(sqlite3.Connection):
+    """sqlite3 connection that times execute/executemany/commit into elliot_sqlite_query_seconds{region, statement}."""
+
+    def _timer(self, sql):
+        timer = self.timers.get(sql)
+        if timer is None:
+            if len(self.timers) >= 1024:  # Dynamic SQL; keep the cache bounded
+                self.timers.clear()
+            statement = sql.split(None, 1)[0].upper() if sql.strip() else "EMPTY"
+            timer = self.timers[sql] = REGISTRY.histogram(
+                "elliot_sqlite_query_seconds", "SQLite statement latency in seconds",
+                region=self.region, statement=statement,
+            )
+        return timer
+
+    def execute(self, sql, parameters=()):
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._timer(sql).observe(time.perf_counter() - start)
+
+    def executemany(self, sql, parameters):
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, parameters)
+        finally:
+            self._timer(sql).observe(time.perf_counter() - start)
+
+    def commit(self):
+        start = time.perf_counter()
+        try:
+            return super().commit()
+        finally:
+            self._timer("COMMIT").observe(time.perf_counter() - start)
+
+
+def connect_timed(db_file, region, **kwargs):
+    """sqlite3.connect returning a TimedConnection labelled with `region`."""
+    conn = sqlite3.connect(db_file, factory=TimedConnection, **kwargs)
+    conn.region = region
+    conn.timers = {}
+    return conn
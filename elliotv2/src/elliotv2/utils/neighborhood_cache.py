@@ -0,0 +1,76 @@
+import itertools
+from collections import OrderedDict
+
+
+class NeighborhoodCache:
+    """
+    LRU cache of multi-hop neighbourhoods keyed by (node, depth, relationship filter).
+
+    Every node carries a version that is bumped whenever one of its edges changes.
+    An entry remembers the versions of the nodes its BFS expanded (the source and
+    everything closer than `depth`), which are the only nodes whose edge changes can
+    alter the result; the entry is valid while none of those versions has moved.
+    Versions of removed nodes are dropped, so the table only covers nodes in the graph.
+    """
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # key -> (result, ((node, version), ...))
+        self.versions = {}  # node -> version; absent means never touched or cached (or removed)
+        self.counter = itertools.count(1)
+        self.stats = {"hits": 0, "misses": 0, "invalidations": 0, "evictions": 0}
+
+    @staticmethod
+    def make_key(node_id, depth, relationship_types=None):
+        if isinstance(relationship_types, str):
+            relationship_types = [relationship_types]
+        return node_id, depth, frozenset(relationship_types) if relationship_types else None
+
+    def touch(self, *nodes):
+        """Record that the edges of `nodes` changed (one new version is enough for all of them)."""
+        version = next(self.counter)
+        versions = self.versions
+        for node in nodes:
+            versions[node] = version
+
+    def node_removed(self, node, neighbors):
+        """Invalidate entries that reached `node` and forget its version."""
+        self.touch(*neighbors)
+        self.versions.pop(node, None)  # Entries depending on it recorded a version, which no longer matches
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.stats["misses"] += 1
+            return None
+        result, dependencies = entry
+        versions = self.versions
+        for node, version in dependencies:
+            if versions.get(node, 0) != version:
+                del self.entries[key]
+                self.stats["invalidations"] += 1
+                self.stats["misses"] += 1
+                return None
+        self.entries.move_to_end(key)
+        self.stats["hits"] += 1
+        return result
+
+    def put(self, key, result, expanded):
+        """Cache `result`, valid until an edge of any node in `expanded` changes."""
+        versions = self.versions
+        for node in expanded:
+            if node not in versions:  # A recorded 0 would match again once a removed node's version is dropped
+                versions[node] = next(self.counter)
+        self.entries[key] = (result, tuple((node, versions[node]) for node in expanded))
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def clear(self):
+        self.entries.clear()
+        self.versions.clear()  # No entry refers to them any more; the counter keeps new versions distinct
+
+    def get_stats(self):
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return dict(self.stats, entries=len(self.entries), hit_rate=self.stats["hits"] / lookups if lookups else 0.0)
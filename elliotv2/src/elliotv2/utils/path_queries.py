@@ -0,0 +1,184 @@
+import time
+import heapq
+import itertools
+
+# Path searches over any graph exposed as a `neighbors(node) -> iterable` callable.
+# Callers decide what a neighbor is (relationship filters, lazy loading), and every
+# search is bounded by depth and an optional perf_counter() deadline.
+
+_DONE = object()
+
+
+def _expired(deadline):
+    return deadline is not None and time.perf_counter() > deadline
+
+
+def iter_simple_paths(neighbors, source, target, max_depth=None, deadline=None):
+    """
+    Yield simple paths from `source` to `target` one at a time (iterative DFS).
+    Paths have at most `max_depth` edges; the search stops quietly at `deadline`.
+    """
+    if source == target:
+        return
+    path = [source]
+    on_path = {source}
+    stack = [iter(neighbors(source))]
+    steps = 0
+    while stack:
+        steps += 1
+        if steps % 256 == 0 and _expired(deadline):
+            return
+        neighbor = next(stack[-1], _DONE)
+        if neighbor is _DONE:
+            stack.pop()
+            on_path.discard(path.pop())
+        elif neighbor in on_path:
+            continue
+        elif neighbor == target:
+            yield path + [target]
+        elif max_depth is None or len(path) < max_depth:
+            path.append(neighbor)
+            on_path.add(neighbor)
+            stack.append(iter(neighbors(neighbor)))
+
+
+def bidirectional_shortest_path(neighbors, source, target, max_depth=None, deadline=None):
+    """
+    Shortest path via BFS from both ends, always expanding the smaller frontier.
+    Returns the path as a list, or None if there is none within `max_depth` edges.
+    """
+    if source == target:
+        return [source]
+    forward_parents = {source: None}
+    backward_parents = {target: None}
+    forward, backward = [source], [target]
+    depth = 0
+    while forward and backward:
+        if (max_depth is not None and depth >= max_depth) or _expired(deadline):
+            return None
+        depth += 1
+        if len(forward) <= len(backward):
+            frontier, parents, others = forward, forward_parents, backward_parents
+        else:
+            frontier, parents, others = backward, backward_parents, forward_parents
+        next_frontier = []
+        for node in frontier:
+            for neighbor in neighbors(node):
+                if neighbor not in parents:
+                    parents[neighbor] = node
+                    next_frontier.append(neighbor)
+                if neighbor in others:
+                    return _join(forward_parents, backward_parents, neighbor)
+        if frontier is forward:
+            forward = next_frontier
+        else:
+            backward = next_frontier
+    return None
+
+
+def _join(forward_parents, backward_parents, meeting):
+    path = []
+    node = meeting
+    while node is not None:
+        path.append(node)
+        node = forward_parents[node]
+    path.reverse()
+    node = backward_parents[meeting]
+    while node is not None:
+        path.append(node)
+        node = backward_parents[node]
+    return path
+
+
+def iter_k_shortest_paths(neighbors, source, target, k, max_depth=None, deadline=None):
+    """
+    Yield up to `k` loopless paths in order of increasing length (Yen's algorithm,
+    with bidirectional BFS for the spur searches).
+    """
+    first = bidirectional_shortest_path(neighbors, source, target, max_depth, deadline)
+    if first is None or k < 1:
+        return
+    found = [first]
+    yield first
+    candidates = []  # heap of (length, tie-breaker, path)
+    queued = {tuple(first)}
+    counter = itertools.count()
+    while len(found) < k:
+        previous = found[-1]
+        for index in range(len(previous) - 1):
+            if _expired(deadline):
+                return
+            spur, root = previous[index], previous[:index + 1]
+            banned_nodes = set(root[:-1])
+            banned_edges = set()
+            for path in found:
+                if len(path) > index + 1 and path[:index + 1] == root:
+                    banned_edges.add((path[index], path[index + 1]))
+                    banned_edges.add((path[index + 1], path[index]))
+
+            def restricted(node, banned_nodes=banned_nodes, banned_edges=banned_edges):
+                return [
+                    neighbor for neighbor in neighbors(node)
+                    if neighbor not in banned_nodes and (node, neighbor) not in banned_edges
+                ]
+
+            remaining = max_depth - index if max_depth is not None else None
+            spur_path = bidirectional_shortest_path(restricted, spur, target, remaining, deadline)
+            if spur_path is None:
+                continue
+            candidate = root[:-1] + spur_path
+            if tuple(candidate) not in queued:
+                queued.add(tuple(candidate))
+                heapq.heappush(candidates, (len(candidate), next(counter), candidate))
+        if not candidates:
+            return
+        path = heapq.heappop(candidates)[2]
+        found.append(path)
+        yield path
+
+
+def bfs_distances(neighbors, source, depth):
+    """Hop distance from `source` to every node within `depth` hops, in BFS order."""
+    distances = {source: 0}
+    frontier = [source]
+    for level in range(1, depth + 1):
+        next_frontier = []
+        for node in frontier:
+            for neighbor in neighbors(node):
+                if neighbor not in distances:
+                    distances[neighbor] = level
+                    next_frontier.append(neighbor)
+        if not next_frontier:
+            break
+        frontier = next_frontier
+    return distances
+
+
+def batched_bfs(neighbors, sources, depth):
+    """
+    BFS from several sources in one pass that shares adjacency expansion: each node's
+    neighbors are fetched (filtered, faulted in) at most once for the whole batch.
+    Returns {source: (nodes within depth in BFS order, nodes expanded at distance < depth)}.
+    """
+    adjacency = {}
+    results = {}
+    for source in dict.fromkeys(sources):
+        seen = {source: None}
+        frontier = [source]
+        expanded = []
+        for _ in range(depth):
+            expanded.extend(frontier)
+            next_frontier = []
+            for node in frontier:
+                found = adjacency.get(node)
+                if found is None:
+                    found = adjacency[node] = list(neighbors(node))
+                for neighbor in found:
+                    if neighbor not in seen:
+                        seen[neighbor] = None
+                        next_frontier.append(neighbor)
+            if not next_frontier:
+                break
+            frontier = next_frontier
+        results[source] = (list(seen), expanded)
+    return results
@@ -0,0 +1,119 @@
+import time
+import asyncio
+
+from utils.metrics import REGISTRY
+
+_DONE = object()
+
+
+async def aiterate(source):
+    """Iterate a sync or async iterable asynchronously."""
+    if hasattr(source, "__aiter__"):
+        async for item in source:
+            yield item
+    else:
+        for item in source:
+            yield item
+            await asyncio.sleep(0)
+
+
+class BatchPipeline:
+    """
+    Staged streaming pipeline over micro-batches.
+
+    Items from an (async) iterator are grouped into batches of up to
+    `batch_size`, or whatever has arrived `linger` seconds after a batch's first
+    item. Each stage is a function batch -> batch for the next stage, called
+    once per batch so it can use a region's bulk API. Stages are connected by
+    queues holding at most `max_pending` batches: a slow stage blocks the stages
+    before it and finally the source, so memory stays bounded.
+
+    Stage functions run on the event loop thread one at a time (the regions are
+    not thread-safe); a failing batch is logged, counted and dropped.
+    """
+
+    def __init__(self, stages, batch_size=64, linger=0.05, max_pending=2, logger=None):
+        self.stages = list(stages)  # (name, function) pairs
+        self.batch_size = batch_size
+        self.linger = linger
+        self.max_pending = max_pending
+        self.logger = logger
+        self.stats = {name: {"batches": 0, "items": 0, "seconds": 0.0, "errors": 0} for name, _ in self.stages}
+        self.timers = {
+            name: REGISTRY.histogram("elliot_pipeline_stage_seconds", "Pipeline stage latency per batch", stage=name)
+            for name, _ in self.stages
+        }
+
+    async def _produce(self, source, items):
+        try:
+            async for item in aiterate(source):
+                await items.put(item)
+        finally:
+            await items.put(_DONE)
+
+    async def _batch(self, items, output):
+        """Group items into batches of batch_size, flushing early once the first item has waited `linger` seconds."""
+        loop = asyncio.get_running_loop()
+        done = False
+        while not done:
+            item = await items.get()
+            if item is _DONE:
+                break
+            batch = [item]
+            deadline = loop.time() + self.linger
+            while len(batch) < self.batch_size:
+                try:
+                    item = items.get_nowait()
+                except asyncio.QueueEmpty:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(items.get(), remaining)
+                    except asyncio.TimeoutError:
+                        break
+                if item is _DONE:
+                    done = True
+                    break
+                batch.append(item)
+            await output.put(batch)
+        await output.put(_DONE)
+
+    async def _stage(self, name, function, queue, output):
+        stats = self.stats[name]
+        while True:
+            batch = await queue.get()
+            if batch is _DONE:
+                break
+            start = time.perf_counter()
+            try:
+                result = function(batch)
+            except Exception as e:
+                stats["errors"] += 1
+                if self.logger:
+                    self.logger.log_error("Orchestrator Pipeline", "Stage %s failed on %d items: %s", name, len(batch), e,
+                                          operation=name)
+                continue
+            finally:
+                elapsed = time.perf_counter() - start
+                stats["seconds"] += elapsed
+                self.timers[name].observe(elapsed)
+            stats["batches"] += 1
+            stats["items"] += len(batch)
+            if output is not None and result:
+                await output.put(list(result))
+            await asyncio.sleep(0)  # Let the upstream stages refill while this batch moves on
+        if output is not None:
+            await output.put(_DONE)
+
+    async def run(self, source):
+        """Push every item of `source` through the stages; returns per-stage stats."""
+        items = asyncio.Queue(self.batch_size * self.max_pending)
+        queues = [asyncio.Queue(self.max_pending) for _ in self.stages]
+        workers = [self._produce(source, items), self._batch(items, queues[0])]
+        for index, (name, function) in enumerate(self.stages):
+            output = queues[index + 1] if index + 1 < len(queues) else None
+            workers.append(self._stage(name, function, queues[index], output))
+        start = time.perf_counter()
+        await asyncio.gather(*workers)
+        return {"seconds": round(time.perf_counter() - start, 6), "stages": self.stats}
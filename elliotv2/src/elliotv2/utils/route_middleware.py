@@ -0,0 +1,360 @@
+import io
+import os
+import sys
+import json
+import datetime
+import time
+import pstats
+import random
+import cProfile
+import itertools
+import threading
+import functools
+import contextvars
+import tracemalloc
+from collections import deque
+
+from utils.metrics import REGISTRY
+
+
+def describe_shape(value, depth=2, max_items=3):
+    """Short type/size description of a value, e.g. list[1000]<dict[3]{id: int, ...}>, without its contents."""
+    if isinstance(value, (str, bytes, bytearray)):
+        return f"{type(value).__name__}[{len(value)}]"
+    if hasattr(value, "shape") and hasattr(value, "dtype"):  # numpy arrays
+        return f"{type(value).__name__}{tuple(value.shape)} {value.dtype}"
+    if isinstance(value, dict):
+        if depth <= 0 or not value:
+            return f"dict[{len(value)}]"
+        items = ", ".join(
+            f"{key}: {describe_shape(item, depth - 1, max_items)}"
+            for key, item in itertools.islice(value.items(), max_items)
+        )
+        more = ", ..." if len(value) > max_items else ""
+        return f"dict[{len(value)}]{{{items}{more}}}"
+    if isinstance(value, (list, tuple, set, frozenset, deque)):
+        if depth <= 0 or not value:
+            return f"{type(value).__name__}[{len(value)}]"
+        first = next(iter(value))
+        return f"{type(value).__name__}[{len(value)}]<{describe_shape(first, depth - 1, max_items)}>"
+    return type(value).__name__
+
+
+def describe_args(args, kwargs):
+    """Shape of a call's arguments, e.g. (str[8], list[500]<int>, depth=int)."""
+    parts = [describe_shape(arg) for arg in args]
+    parts.extend(f"{key}={describe_shape(value)}" for key, value in kwargs.items())
+    return f"({', '.join(parts)})"
+
+
+def approximate_size(value, max_items=1000, depth=3):
+    """Approximate deep size in bytes; large collections are sampled and scaled up."""
+    size = sys.getsizeof(value, 0)
+    if depth <= 0 or isinstance(value, (str, bytes, bytearray)):
+        return size
+    if hasattr(value, "nbytes"):
+        return size + int(value.nbytes)
+    if isinstance(value, dict):
+        items = list(itertools.islice(value.items(), max_items))
+        sampled = sum(approximate_size(k, max_items, depth - 1) + approximate_size(v, max_items, depth - 1) for k, v in items)
+    elif isinstance(value, (list, tuple, set, frozenset, deque)):
+        items = list(itertools.islice(value, max_items))
+        sampled = sum(approximate_size(item, max_items, depth - 1) for item in items)
+    else:
+        return size
+    if items and len(value) > len(items):
+        sampled = sampled * len(value) // len(items)
+    return size + sampled
+
+
+class RouteCall:
+    """One routed call as seen by middleware; middleware may add entries to `report`."""
+
+    __slots__ = ("region", "method", "args", "kwargs", "start", "duration", "report", "reportable")
+
+    def __init__(self, region, method, args, kwargs):
+        self.region = region
+        self.method = method
+        self.args = args
+        self.kwargs = kwargs
+        self.start = time.perf_counter()
+        self.duration = None
+        self.report = {}
+        self.reportable = False
+
+
+# Middleware
+#
+# A middleware is a callable (call, next_handler) -> result; it must call
+# next_handler() exactly once and return its result.
+
+class TimingMiddleware:
+    """Report calls slower than the chain's slow_threshold."""
+
+    def __init__(self, chain, **kwargs):
+        self.chain = chain
+
+    def __call__(self, call, next_handler):
+        call.reportable = True
+        return next_handler()
+
+
+class ArgSizeMiddleware:
+    """Account approximate argument bytes per region method (elliot_route_task_arg_bytes)."""
+
+    def __init__(self, chain, **kwargs):
+        self.chain = chain
+        self.histograms = {}
+
+    def __call__(self, call, next_handler):
+        size = approximate_size(call.args) + approximate_size(call.kwargs)
+        histogram = self.histograms.get((call.region, call.method))
+        if histogram is None:
+            histogram = self.histograms[(call.region, call.method)] = self.chain.metrics.histogram(
+                "elliot_route_task_arg_bytes", "Approximate argument size of routed calls in bytes",
+                bounds=(1, 1e12), region=call.region, method=call.method,
+            )
+        histogram.observe(size)
+        call.report["arg_bytes"] = size
+        return next_handler()
+
+
+class _Sampler:
+    """Decide which calls to capture: a random `sample_rate` fraction, plus the next call after an uncaptured slow one."""
+
+    def __init__(self, chain, sample_rate):
+        self.chain = chain
+        self.sample_rate = sample_rate
+        self.armed = set()
+
+    def should_capture(self, call):
+        key = (call.region, call.method)
+        if key in self.armed:
+            self.armed.discard(key)
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def missed(self, call, duration):
+        if duration >= self.chain.slow_threshold:
+            self.armed.add((call.region, call.method))
+
+
+class ProfileMiddleware:
+    """cProfile sampled calls; the top functions by cumulative time go into slow-call reports."""
+
+    active = threading.Lock()  # cProfile allows one active profiler per process
+
+    def __init__(self, chain, **kwargs):
+        self.chain = chain
+        self.sampler = _Sampler(chain, kwargs.get("profile_sample_rate", 0.01))
+        self.top = kwargs.get("profile_top", 15)
+
+    def __call__(self, call, next_handler):
+        if not self.sampler.should_capture(call) or not self.active.acquire(blocking=False):
+            start = time.perf_counter()
+            result = next_handler()
+            self.sampler.missed(call, time.perf_counter() - start)
+            return result
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+            try:
+                return next_handler()
+            finally:
+                profiler.disable()
+                output = io.StringIO()
+                pstats.Stats(profiler, stream=output).sort_stats("cumulative").print_stats(self.top)
+                call.report["profile"] = output.getvalue()
+                call.reportable = True
+        finally:
+            self.active.release()
+
+
+class MemoryMiddleware:
+    """tracemalloc sampled calls; peak traced memory and the top allocation sites go into slow-call reports."""
+
+    active = threading.Lock()
+
+    def __init__(self, chain, **kwargs):
+        self.chain = chain
+        self.sampler = _Sampler(chain, kwargs.get("memory_sample_rate", 0.01))
+        self.top = kwargs.get("memory_top", 10)
+
+    def __call__(self, call, next_handler):
+        if tracemalloc.is_tracing() or not self.sampler.should_capture(call) or not self.active.acquire(blocking=False):
+            start = time.perf_counter()
+            result = next_handler()
+            self.sampler.missed(call, time.perf_counter() - start)
+            return result
+        try:
+            tracemalloc.start()
+            try:
+                return next_handler()
+            finally:
+                snapshot = tracemalloc.take_snapshot()
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                call.report["memory_peak_bytes"] = peak
+                call.report["allocations"] = [str(stat) for stat in snapshot.statistics("lineno")[:self.top]]
+                call.reportable = True
+        finally:
+            self.active.release()
+
+
+_current_span = contextvars.ContextVar("route_span", default=None)
+_span_ids = itertools.count(1)
+
+
+class TraceMiddleware:
+    """
+    Parent/child spans for nested routed calls: a call routed while another is
+    running (on the same thread or task) becomes its child. Finished spans are kept
+    in the chain's span buffer and logged at INFO with trace_id/span_id/parent_id.
+    """
+
+    def __init__(self, chain, **kwargs):
+        self.chain = chain
+
+    def __call__(self, call, next_handler):
+        parent = _current_span.get()
+        span_id = next(_span_ids)
+        span = {
+            "trace_id": parent["trace_id"] if parent else span_id,
+            "span_id": span_id,
+            "parent_id": parent["span_id"] if parent else None,
+            "region": call.region,
+            "method": call.method,
+            "start": time.time(),
+        }
+        token = _current_span.set(span)
+        start = time.perf_counter()
+        status = "ok"
+        try:
+            result = next_handler()
+            if isinstance(result, str) and result.startswith("Error"):
+                status = "error"
+            return result
+        except Exception:
+            status = "error"
+            raise
+        finally:
+            _current_span.reset(token)
+            span["duration"] = time.perf_counter() - start
+            span["status"] = status
+            self.chain.spans.append(span)
+            self.chain.logger.log_info(
+                call.region, "Span %s.%s", call.region, call.method, operation=call.method,
+                duration=round(span["duration"], 6), trace_id=span["trace_id"], span_id=span_id,
+                parent_id=span["parent_id"], status=status,
+            )
+
+
+MIDDLEWARE = {
+    "trace": TraceMiddleware,
+    "timing": TimingMiddleware,
+    "arg_size": ArgSizeMiddleware,
+    "memory": MemoryMiddleware,
+    "profile": ProfileMiddleware,
+}
+
+
+def register_middleware(name, factory):
+    """Make a middleware factory (chain, **config) -> callable available to config rules under `name`."""
+    MIDDLEWARE[name] = factory
+
+
+class MiddlewareChain:
+    """
+    Opt-in middleware around Orchestrator.route_task.
+
+    `rules` maps "Region.method", "Region" or "*" to a list of middleware names
+    (outermost first); the most specific rule wins. Calls with no matching rule
+    never reach the chain. A call that takes `slow_threshold` seconds or more
+    and was timed or captured by a middleware produces a slow-call report naming
+    the region method and the shape of its arguments; reports are logged as
+    warnings, kept in memory and appended to `report_file` (JSONL) when set.
+    """
+
+    def __init__(self, logger, rules, metrics=REGISTRY, **kwargs):
+        self.logger = logger
+        self.rules = dict(rules)
+        self.metrics = metrics
+        self.config = kwargs
+        self.slow_threshold = kwargs.get("slow_threshold", 0.5)
+        self.report_file = kwargs.get("report_file")
+        if self.report_file and os.path.dirname(self.report_file):
+            os.makedirs(os.path.dirname(self.report_file), exist_ok=True)
+        self.reports = deque(maxlen=kwargs.get("max_reports", 100))
+        self.spans = deque(maxlen=kwargs.get("max_spans", 1000))
+        self.handlers = {}  # (region, method) -> middleware tuple, or None when no rule matches
+        self.instances = {}  # middleware name -> instance, shared across methods
+        self.lock = threading.Lock()
+
+    def _middleware(self, name):
+        instance = self.instances.get(name)
+        if instance is None:
+            instance = self.instances[name] = MIDDLEWARE[name](self, **self.config)
+        return instance
+
+    def handlers_for(self, region, method):
+        key = (region, method)
+        try:
+            return self.handlers[key]
+        except KeyError:
+            pass
+        names = self.rules.get(f"{region}.{method}", self.rules.get(region, self.rules.get("*")))
+        with self.lock:
+            handlers = self.handlers[key] = tuple(self._middleware(name) for name in names) if names else None
+        return handlers
+
+    def applies(self, region, method):
+        return self.handlers_for(region, method) is not None
+
+    def run(self, region, method, args, kwargs, dispatch):
+        """Run dispatch(region, method, args, kwargs) through the middleware configured for the method."""
+        call = RouteCall(region, method, args, kwargs)
+        handler = functools.partial(dispatch, region, method, args, kwargs)
+        for middleware in reversed(self.handlers_for(region, method)):
+            handler = functools.partial(middleware, call, handler)
+        try:
+            return handler()
+        finally:
+            call.duration = time.perf_counter() - call.start
+            if call.reportable and call.duration >= self.slow_threshold:
+                self.report(call)
+
+    def report(self, call):
+        shape = describe_args(call.args, call.kwargs)
+        report = {
+            "timestamp": datetime.datetime.now().isoformat(), "region": call.region, "method": call.method,
+            "duration": round(call.duration, 6), "args": shape, **call.report,
+        }
+        self.reports.append(report)
+        self.logger.log_warning(
+            call.region, "Slow call %s.%s%s took %.3fs", call.region, call.method, shape, call.duration,
+            operation=call.method, duration=report["duration"],
+        )
+        if self.report_file:
+            with self.lock, open(self.report_file, "a", encoding="utf-8") as file:
+                file.write(json.dumps(report, default=str) + "\n")
+
+    def recent_reports(self, limit=20):
+        return list(self.reports)[-limit:]
+
+    def recent_spans(self, limit=100):
+        return list(self.spans)[-limit:]
+
+
+def build_middleware(logger, config, metrics=REGISTRY):
+    """MiddlewareChain from the orchestrator.middleware config, or None when disabled or without rules."""
+    config = dict(config or {})
+    if not config.get("enabled", False) or not config.get("rules"):
+        return None
+    rules = {}
+    for target, names in config.pop("rules").items():
+        unknown = [name for name in names if name not in MIDDLEWARE]
+        if unknown:
+            logger.log_error("Orchestrator", "Unknown route middleware for %s: %s", target, unknown)
+        rules[target] = [name for name in names if name in MIDDLEWARE]
+    config.pop("enabled", None)
+    return MiddlewareChain(logger, rules, metrics, **config)
@@ -0,0 +1,195 @@
+import os
+import time
+import types
+import inspect
+import weakref
+
+from utils.config import load_config
+
+# Used when no routing rules file is available; mirrors the original hard-coded routing.
+DEFAULT_RULES = {
+    "default_region": "Default",
+    "rules": [
+        {"region": "Amygdala", "tags": ["emotion"]},
+        {"region": "Hippocampus", "tags": ["factual"]},
+    ],
+}
+
+
+class RoutingRule:
+    """A single declarative routing rule: all configured conditions must match."""
+
+    def __init__(self, order, region, tags=None, task_types=None, metadata=None):
+        self.order = order
+        self.region = region
+        self.tags = set(tags or [])
+        self.task_types = set(task_types or [])
+        self.metadata = metadata or {}
+
+    def matches(self, task, tags):
+        if self.tags and not self.tags.intersection(tags):
+            return False
+        if self.task_types and task.get("type") not in self.task_types:
+            return False
+        metadata = task.get("metadata", {})
+        for key, expected in self.metadata.items():
+            if not self._check(metadata.get(key), expected):
+                return False
+        return True
+
+    @staticmethod
+    def _check(value, expected):
+        """Evaluate one metadata predicate: a literal, or a dict of in/min/max/exists operators."""
+        if not isinstance(expected, dict):
+            return value == expected
+        if "exists" in expected and (value is not None) != expected["exists"]:
+            return False
+        if "in" in expected and value not in expected["in"]:
+            return False
+        try:
+            if "min" in expected and (value is None or value < expected["min"]):
+                return False
+            if "max" in expected and (value is None or value > expected["max"]):
+                return False
+        except TypeError:
+            return False
+        return True
+
+
+class RoutingTable:
+    """
+    Declarative task -> region routing.
+
+    Rules are compiled into tag and task-type indexes so a lookup only evaluates
+    the rules that could possibly match, in their configured order.
+    """
+
+    def __init__(self, rules=None, default_region="Default"):
+        self.default_region = default_region
+        self.rules = [
+            RoutingRule(
+                order,
+                rule["region"],
+                tags=rule.get("tags"),
+                task_types=rule.get("task_types"),
+                metadata=rule.get("metadata"),
+            )
+            for order, rule in enumerate(rules or [])
+        ]
+        self.stats = {"lookups": 0, "hits": 0, "misses": 0, "eval_time": 0.0, "by_region": {}}
+        self._compile()
+
+    @classmethod
+    def from_yaml(cls, path="config/routing.yaml"):
+        """Load routing rules from YAML, falling back to the built-in defaults if the file is missing."""
+        config = DEFAULT_RULES
+        if path and os.path.exists(path):
+            config = load_config(path) or DEFAULT_RULES
+        return cls(config.get("rules", []), config.get("default_region", "Default"))
+
+    def _compile(self):
+        self.tag_index = {}  # tag -> rules that require it
+        self.type_index = {}  # task type -> rules that require it (and no tags)
+        self.unindexed = []  # rules with only metadata predicates
+        for rule in self.rules:
+            if rule.tags:
+                for tag in rule.tags:
+                    self.tag_index.setdefault(tag, []).append(rule)
+            elif rule.task_types:
+                for task_type in rule.task_types:
+                    self.type_index.setdefault(task_type, []).append(rule)
+            else:
+                self.unindexed.append(rule)
+
+    def candidates(self, task, tags):
+        candidates = list(self.unindexed)
+        for tag in tags:
+            candidates.extend(self.tag_index.get(tag, ()))
+        candidates.extend(self.type_index.get(task.get("type"), ()))
+        return candidates
+
+    def resolve(self, task):
+        """Return the region for a task, or the default region if no rule matches."""
+        start = time.perf_counter()
+        tags = task.get("metadata", {}).get("tags", [])
+        if isinstance(tags, str):
+            tags = [tags]
+        region = None
+        for rule in sorted(self.candidates(task, tags), key=lambda r: r.order):
+            if rule.matches(task, tags):
+                region = rule.region
+                break
+
+        self.stats["lookups"] += 1
+        self.stats["eval_time"] += time.perf_counter() - start
+        if region is None:
+            self.stats["misses"] += 1
+            region = self.default_region
+        else:
+            self.stats["hits"] += 1
+        self.stats["by_region"][region] = self.stats["by_region"].get(region, 0) + 1
+        return region
+
+    def get_stats(self):
+        stats = dict(self.stats, by_region=dict(self.stats["by_region"]))
+        stats["avg_eval_time"] = stats["eval_time"] / stats["lookups"] if stats["lookups"] else 0.0
+        return stats
+
+
+class MethodRegistry:
+    """
+    Caches method lookups per registered target (a region name or id(instance)) so calls skip getattr/hasattr.
+
+    Only plain functions defined on the class are cached, found with inspect.getattr_static so
+    registering never runs properties (on the Orchestrator those build lazy regions). Targets are
+    held weakly and dropped when the instance is garbage collected.
+    """
+
+    def __init__(self):
+        self.targets = {}  # key -> (instance weakref, {method name: function})
+
+    def register(self, key, instance):
+        """Cache the public methods of `instance` under `key`."""
+        functions = {}
+        overrides = getattr(instance, "__dict__", {})  # Per-instance replacements are resolved live, unbound
+        for name in dir(type(instance)):
+            if name.startswith("_") or name in overrides:
+                continue
+            attr = inspect.getattr_static(type(instance), name, None)
+            if isinstance(attr, types.FunctionType):
+                functions[name] = attr
+        try:
+            ref = weakref.ref(instance)
+        except TypeError:  # No __weakref__ slot: hold it strongly until unregistered
+            ref = lambda: instance
+        else:
+            weakref.finalize(instance, self._drop, key, ref)
+        self.targets[key] = (ref, functions)
+        return functions
+
+    def _drop(self, key, ref):
+        if self.targets.get(key, (None,))[0] is ref:  # The key may have been re-registered to a new instance
+            del self.targets[key]
+
+    def unregister(self, key):
+        self.targets.pop(key, None)
+
+    def is_registered(self, key):
+        return key in self.targets
+
+    def resolve(self, key, method):
+        """Return a bound handle for `method`, or None if the target or method is unknown."""
+        entry = self.targets.get(key)
+        if entry is None:
+            return None
+        ref, functions = entry
+        instance = ref()
+        if instance is None:
+            return None
+        function = functions.get(method)
+        if function is not None:
+            return types.MethodType(function, instance)
+        if method.startswith("_") or isinstance(inspect.getattr_static(instance, method, None), (property, type(None))):
+            return None
+        attr = getattr(instance, method)  # Callables that aren't plain functions (staticmethods, callable attributes)
+        return attr if callable(attr) else None
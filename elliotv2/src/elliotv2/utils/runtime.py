@@ -0,0 +1,230 @@
+import time
+import signal
+import asyncio
+import threading
+from collections import deque
+
+from utils.metrics import REGISTRY
+
+
+class Timer:
+    __slots__ = ("deadline", "callback", "args", "cancelled")
+
+    def __init__(self, deadline, callback, args):
+        self.deadline = deadline
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+
+class TimerWheel:
+    """
+    Hashed timing wheel on the monotonic clock.
+
+    A timer lands in slot (deadline // tick) % slots; advancing to `now` only
+    visits the slots for ticks that passed since the last advance (at most one
+    revolution), so scheduling, cancelling and expiry don't depend on how many
+    timers are pending. Timers more than one revolution out stay in their slot
+    until their deadline comes round.
+    """
+
+    def __init__(self, tick=0.05, slots=256):
+        self.tick = tick
+        self.slots = [[] for _ in range(slots)]
+        self.active = set()
+        self.current = int(time.monotonic() // tick)
+
+    def schedule(self, delay, callback, *args):
+        """Call callback(*args) once `delay` seconds from now; returns a Timer for cancel()."""
+        timer = Timer(time.monotonic() + max(delay, 0.0), callback, args)
+        self.slots[int(timer.deadline // self.tick) % len(self.slots)].append(timer)
+        self.active.add(timer)
+        return timer
+
+    def cancel(self, timer):
+        timer.cancelled = True
+        self.active.discard(timer)
+
+    def next_deadline(self):
+        """Earliest pending deadline, or None when no timers are pending."""
+        return min((timer.deadline for timer in self.active), default=None)
+
+    def expire(self, now=None):
+        """Remove and return the timers due at `now`, earliest first."""
+        now = time.monotonic() if now is None else now
+        target = int(now // self.tick)
+        if target < self.current:
+            return []
+        count = len(self.slots)
+        due = []
+        for tick in range(max(self.current, target - count + 1), target + 1):
+            slot = self.slots[tick % count]
+            if not slot:
+                continue
+            keep = []
+            for timer in slot:
+                if timer.cancelled:
+                    continue
+                if timer.deadline <= now:
+                    due.append(timer)
+                else:
+                    keep.append(timer)
+            slot[:] = keep
+        self.current = target
+        for timer in due:
+            self.active.discard(timer)
+        due.sort(key=lambda timer: timer.deadline)
+        return due
+
+
+class OrchestratorRuntime:
+    """
+    Event-driven asyncio loop for the Orchestrator.
+
+    Inputs pushed with submit() (from any thread) and tasks announced with
+    notify() wake the loop immediately; periodic jobs run from a timer wheel.
+    When nothing is queued and no timer is due the loop sleeps until the next
+    deadline, so an idle process does no work.
+
+    All region calls run on the loop thread, one at a time, like the old
+    polling loop; inputs and tasks are handled in batches of `batch_size` so
+    timers still fire under load.
+    """
+
+    def __init__(self, orchestrator, **kwargs):
+        self.orchestrator = orchestrator
+        self.logger = orchestrator.logger
+        self.batch_size = kwargs.get("batch_size", 64)
+        self.wheel = TimerWheel(kwargs.get("timer_tick", 0.05), kwargs.get("timer_slots", 256))
+        self.inputs = deque()  # (enqueued at, input)
+        self.jobs = {}  # name -> (interval, job, timer)
+        self.loop = None
+        self.thread = None
+        self.wakeup = None
+        self.stopping = False
+        self.stats = {"inputs": 0, "tasks": 0, "job_runs": 0, "wakeups": 0, "errors": 0}
+        self.input_latency = REGISTRY.histogram(
+            "elliot_runtime_input_latency_seconds", "Time from submit() until an input was handled"
+        )
+
+    # Producers (thread-safe)
+
+    def submit(self, input_data):
+        """Queue an input for handle_inputs and wake the loop."""
+        self.inputs.append((time.monotonic(), input_data))
+        self.notify()
+
+    def notify(self):
+        """Wake the loop (e.g. after a task was queued)."""
+        loop, wakeup = self.loop, self.wakeup
+        if loop is None or wakeup is None:
+            return
+        if threading.current_thread() is self.thread:
+            wakeup.set()
+        else:
+            try:
+                loop.call_soon_threadsafe(wakeup.set)
+            except RuntimeError:  # Loop already closed
+                pass
+
+    # Periodic jobs
+
+    def every(self, name, interval, job, delay=None):
+        """
+        Run job() every `interval` seconds (first run after `delay`, default one interval).
+        If job returns a number, the next run is that many seconds away instead (e.g. to resume unfinished work soon).
+        """
+        self.cancel(name)
+        timer = self.wheel.schedule(interval if delay is None else delay, self._run_job, name)
+        self.jobs[name] = (interval, job, timer)
+        self.notify()
+        return name
+
+    def cancel(self, name):
+        entry = self.jobs.pop(name, None)
+        if entry is not None:
+            self.wheel.cancel(entry[2])
+
+    def _run_job(self, name):
+        entry = self.jobs.get(name)
+        if entry is None:
+            return
+        interval, job, _ = entry
+        next_delay = interval
+        try:
+            result = job()
+            if isinstance(result, (int, float)) and not isinstance(result, bool):
+                next_delay = result
+        except Exception as e:
+            self.stats["errors"] += 1
+            self.logger.log_error("Orchestrator Runtime", "Job %s failed: %s", name, e, operation=name)
+        self.stats["job_runs"] += 1
+        if name in self.jobs:
+            self.jobs[name] = (interval, job, self.wheel.schedule(next_delay, self._run_job, name))
+
+    # Loop
+
+    def _handle_inputs(self):
+        if not self.inputs:
+            return
+        batch = [self.inputs.popleft() for _ in range(min(len(self.inputs), self.batch_size))]
+        try:
+            self.orchestrator.handle_inputs([input_data for _, input_data in batch])
+        except Exception as e:
+            self.stats["errors"] += 1
+            self.logger.log_error("Orchestrator Runtime", "Failed to handle %d inputs: %s", len(batch), e)
+        now = time.monotonic()
+        for enqueued, _ in batch:
+            self.input_latency.observe(now - enqueued)
+        self.stats["inputs"] += len(batch)
+
+    def _handle_tasks(self):
+        for _ in range(self.batch_size):
+            if not self.orchestrator.has_pending_tasks():
+                return
+            self.orchestrator.process_next_task()
+            self.stats["tasks"] += 1
+
+    def _work_pending(self):
+        return bool(self.inputs) or self.orchestrator.has_pending_tasks()
+
+    async def run(self):
+        """Run until stop() is called."""
+        self.loop = asyncio.get_running_loop()
+        self.thread = threading.current_thread()
+        self.wakeup = asyncio.Event()
+        self.stopping = False
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                self.loop.add_signal_handler(sig, self.stop)
+            except (NotImplementedError, RuntimeError, ValueError):  # Windows, or not the main thread
+                pass
+        while not self.stopping:
+            for timer in self.wheel.expire():
+                timer.callback(*timer.args)
+            self._handle_inputs()
+            self._handle_tasks()
+            if self._work_pending():
+                await asyncio.sleep(0)  # Let other coroutines and thread callbacks in between batches
+                continue
+            deadline = self.wheel.next_deadline()
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0.0)
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            self.wakeup.clear()
+            self.stats["wakeups"] += 1
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                self.loop.remove_signal_handler(sig)
+            except (NotImplementedError, RuntimeError, ValueError):
+                pass
+
+    def stop(self):
+        """Stop the loop after the current batch."""
+        self.stopping = True
+        self.notify()
+
+    def get_stats(self):
+        return dict(self.stats, queued_inputs=len(self.inputs), jobs=sorted(self.jobs))
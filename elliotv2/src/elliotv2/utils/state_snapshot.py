@@ -0,0 +1,113 @@
+import os
+import time
+import pickle
+
+
+class StateSnapshotStore:
+    """
+    Snapshot + append-only journal persistence for in-process state.
+
+    A snapshot holds the full state at a point in time; every change made after
+    it is appended to the journal as an (op, args) record. Restoring loads the
+    snapshot and replays the journal. Both files carry a generation number so a
+    journal left over from before the latest snapshot is never replayed twice.
+    """
+
+    def __init__(self, state_dir, snapshot_every=500, snapshot_interval=300):
+        self.state_dir = state_dir
+        self.snapshot_path = os.path.join(state_dir, "state.snapshot")
+        self.journal_path = os.path.join(state_dir, "state.journal")
+        self.snapshot_every = snapshot_every  # Journal records before a new snapshot is due
+        self.snapshot_interval = snapshot_interval  # Seconds before a new snapshot is due
+        self.generation = 0
+        self.pending = 0
+        self.last_snapshot_time = time.time()
+        self.journal = None
+        self.journal_valid = False  # Whether the journal on disk belongs to the loaded snapshot
+        self.journal_end = 0  # Offset just past the last complete journal record
+        os.makedirs(state_dir, exist_ok=True)
+
+    @property
+    def active(self):
+        return self.journal is not None
+
+    def load(self):
+        """
+        Load the latest snapshot and the journal records written after it.
+        Returns:
+            tuple: (state dict or None, list of (op, args) records).
+        """
+        state = None
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, "rb") as file:
+                snapshot = pickle.load(file)
+            self.generation = snapshot["generation"]
+            state = snapshot["state"]
+
+        records = []
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, "rb") as file:
+                try:
+                    header = pickle.load(file)
+                except (EOFError, pickle.UnpicklingError):
+                    header = None
+                self.journal_valid = header == ("generation", self.generation)
+                if self.journal_valid:
+                    self.journal_end = file.tell()
+                    while True:
+                        try:
+                            records.append(pickle.load(file))
+                        except (EOFError, pickle.UnpicklingError, ValueError):
+                            break  # End of journal, or a record cut short by a crash
+                        self.journal_end = file.tell()
+        self.pending = len(records)
+        return state, records
+
+    def open_journal(self):
+        """Start appending to the journal for the current generation."""
+        self.close()
+        if self.journal_valid and os.path.exists(self.journal_path):
+            self.journal = open(self.journal_path, "ab")
+            self.journal.truncate(self.journal_end)  # Drop a partially written trailing record
+        else:
+            self.journal = open(self.journal_path, "wb")
+            self._write(("generation", self.generation))
+            self.journal_valid = True
+
+    def append(self, op, *args):
+        """Append one change record to the journal."""
+        if self.journal is None:
+            return
+        self._write((op, args))
+        self.pending += 1
+
+    def _write(self, record):
+        pickle.dump(record, self.journal, protocol=pickle.HIGHEST_PROTOCOL)
+        self.journal.flush()
+
+    def snapshot_due(self):
+        return self.pending >= self.snapshot_every or (
+            self.pending and time.time() - self.last_snapshot_time >= self.snapshot_interval
+        )
+
+    def write_snapshot(self, state):
+        """Atomically replace the snapshot with `state` and start a new, empty journal."""
+        self.generation += 1
+        tmp_path = self.snapshot_path + ".tmp"
+        with open(tmp_path, "wb") as file:
+            pickle.dump({"generation": self.generation, "state": state}, file, protocol=pickle.HIGHEST_PROTOCOL)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+
+        self.close()
+        self.journal = open(self.journal_path, "wb")
+        self._write(("generation", self.generation))
+        self.journal_valid = True
+        self.pending = 0
+        self.last_snapshot_time = time.time()
+
+    def close(self):
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
@@ -0,0 +1,153 @@
+import os
+import json
+import sqlite3
+import datetime
+from collections import deque
+
+
+def _to_epoch(value):
+    """Convert an ISO string, datetime or number into epoch seconds."""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        value = datetime.datetime.fromisoformat(value)
+    return value.timestamp()
+
+
+class TaskArchive:
+    """
+    Archive for finished tasks.
+
+    The most recent completions stay in a bounded in-memory ring buffer; every
+    completion is also appended to a SQLite table, so history can be paged,
+    filtered by time and aggregated without loading it all into memory.
+    """
+
+    def __init__(self, db_file="data/task_archive.db", recent_size=100):
+        self.db_file = db_file
+        self.recent = deque(maxlen=recent_size)  # Ring buffer of the latest archived tasks
+        self.conn = self.initialize_db(db_file)
+        self._load_recent()
+
+    def initialize_db(self, db_file):
+        directory = os.path.dirname(db_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(db_file, check_same_thread=False)
+        query = """
+        CREATE TABLE IF NOT EXISTS archived_tasks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            task_name TEXT NOT NULL,
+            status TEXT NOT NULL,
+            priority TEXT,
+            retries INTEGER DEFAULT 0,
+            created_at REAL,
+            completed_at REAL NOT NULL,
+            latency REAL,
+            metadata TEXT
+        )
+        """
+        conn.execute(query)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_archived_tasks_completed_at ON archived_tasks (completed_at)")
+        conn.commit()
+        return conn
+
+    def _load_recent(self):
+        rows = self.conn.execute(
+            "SELECT * FROM archived_tasks ORDER BY id DESC LIMIT ?", (self.recent.maxlen,)
+        ).fetchall()
+        for row in reversed(rows):
+            self.recent.append(self._row_to_task(row))
+
+    @staticmethod
+    def _row_to_task(row):
+        return {
+            "task_name": row[1],
+            "status": row[2],
+            "metadata": json.loads(row[8]) if row[8] else {},
+            "retries": row[4],
+            "completed_at": datetime.datetime.fromtimestamp(row[6]).isoformat(),
+            "latency": row[7],
+        }
+
+    def archive(self, task, status="success"):
+        """Append a finished task to the archive."""
+        metadata = task.get("metadata", {})
+        completed_at = datetime.datetime.now()
+        try:
+            created_at = _to_epoch(metadata.get("timestamp"))
+        except (TypeError, ValueError):
+            created_at = None
+        latency = completed_at.timestamp() - created_at if created_at is not None else None
+        retries = metadata.get("retries", 0)
+
+        query = """
+        INSERT INTO archived_tasks (task_name, status, priority, retries, created_at, completed_at, latency, metadata)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """
+        self.conn.execute(query, (
+            task["task_name"], status, str(metadata.get("priority", "normal")), retries,
+            created_at, completed_at.timestamp(), latency, json.dumps(metadata, default=str),
+        ))
+        self.conn.commit()
+
+        self.recent.append({
+            "task_name": task["task_name"],
+            "status": status,
+            "metadata": metadata,
+            "retries": retries,
+            "completed_at": completed_at.isoformat(),
+            "latency": latency,
+        })
+
+    def _where(self, start=None, end=None, status=None):
+        clauses, params = [], []
+        if start is not None:
+            clauses.append("completed_at >= ?")
+            params.append(_to_epoch(start))
+        if end is not None:
+            clauses.append("completed_at < ?")
+            params.append(_to_epoch(end))
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(status)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def query(self, page=1, page_size=50, start=None, end=None, status=None):
+        """Return one page of archived tasks, newest first, optionally limited to a time range and status."""
+        where, params = self._where(start, end, status)
+        query = f"SELECT * FROM archived_tasks{where} ORDER BY completed_at DESC, id DESC LIMIT ? OFFSET ?"
+        rows = self.conn.execute(query, params + [page_size, (max(page, 1) - 1) * page_size]).fetchall()
+        return [self._row_to_task(row) for row in rows]
+
+    def stats(self, start=None, end=None):
+        """Aggregate success rate, retries and latency over the archive."""
+        where, params = self._where(start, end)
+        query = f"""
+        SELECT COUNT(*),
+               SUM(CASE WHEN status = 'success' THEN 1 ELSE 0 END),
+               SUM(retries), AVG(retries),
+               AVG(latency), MIN(latency), MAX(latency)
+        FROM archived_tasks{where}
+        """
+        total, successes, retries, avg_retries, avg_latency, min_latency, max_latency = \
+            self.conn.execute(query, params).fetchone()
+        return {
+            "total": total,
+            "successes": successes or 0,
+            "failures": total - (successes or 0),
+            "success_rate": (successes or 0) / total if total else 0.0,
+            "total_retries": retries or 0,
+            "avg_retries": avg_retries or 0.0,
+            "avg_latency": avg_latency,
+            "min_latency": min_latency,
+            "max_latency": max_latency,
+        }
+
+    def count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM archived_tasks").fetchone()[0]
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,89 @@
+import bisect
+import datetime
+
+
+def to_epoch(value):
+    """Convert an ISO string, datetime or number to epoch seconds; None if it can't be parsed."""
+    if value is None:
+        return None
+    try:
+        if isinstance(value, (int, float)):
+            return float(value)
+        if isinstance(value, str):
+            value = datetime.datetime.fromisoformat(value)
+        return value.timestamp()
+    except (TypeError, ValueError, AttributeError, OverflowError):
+        return None
+
+
+class TimeIndex:
+    """
+    Buckets items by epoch time so expired items are found with a range lookup.
+
+    Buckets are `bucket_seconds` wide and their keys are kept sorted, so finding
+    everything older than a cutoff touches only the buckets below it (plus the
+    one bucket straddling the cutoff) instead of every item.
+    """
+
+    def __init__(self, bucket_seconds=3600):
+        self.bucket_seconds = bucket_seconds
+        self.buckets = {}  # bucket -> {item: timestamp}
+        self.bucket_keys = []  # sorted bucket numbers
+        self.item_bucket = {}  # item -> bucket
+
+    def __len__(self):
+        return len(self.item_bucket)
+
+    def __contains__(self, item):
+        return item in self.item_bucket
+
+    def add(self, item, timestamp):
+        """Index `item` at `timestamp` (epoch seconds), replacing any earlier entry."""
+        self.discard(item)
+        bucket = int(timestamp // self.bucket_seconds)
+        entries = self.buckets.get(bucket)
+        if entries is None:
+            entries = self.buckets[bucket] = {}
+            bisect.insort(self.bucket_keys, bucket)
+        entries[item] = timestamp
+        self.item_bucket[item] = bucket
+
+    def add_many(self, items):
+        """Index many (item, timestamp) pairs (add() inlined for bulk loads)."""
+        buckets, item_bucket, width = self.buckets, self.item_bucket, self.bucket_seconds
+        for item, timestamp in items:
+            if item in item_bucket:
+                self.discard(item)
+            bucket = int(timestamp // width)
+            entries = buckets.get(bucket)
+            if entries is None:
+                entries = buckets[bucket] = {}
+                bisect.insort(self.bucket_keys, bucket)
+            entries[item] = timestamp
+            item_bucket[item] = bucket
+
+    def discard(self, item):
+        bucket = self.item_bucket.pop(item, None)
+        if bucket is None:
+            return
+        entries = self.buckets[bucket]
+        del entries[item]
+        if not entries:
+            del self.buckets[bucket]
+            del self.bucket_keys[bisect.bisect_left(self.bucket_keys, bucket)]
+
+    def clear(self):
+        self.buckets.clear()
+        self.bucket_keys.clear()
+        self.item_bucket.clear()
+
+    def expired(self, cutoff):
+        """Return items with a timestamp older than `cutoff`, oldest buckets first."""
+        cutoff_bucket = int(cutoff // self.bucket_seconds)
+        items = []
+        for bucket in self.bucket_keys[:bisect.bisect_left(self.bucket_keys, cutoff_bucket)]:
+            items.extend(self.buckets[bucket])
+        boundary = self.buckets.get(cutoff_bucket)
+        if boundary:
+            items.extend(item for item, timestamp in boundary.items() if timestamp < cutoff)
+        return items
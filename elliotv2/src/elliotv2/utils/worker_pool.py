@@ -0,0 +1,305 @@
+import os
+import json
+import zlib
+import datetime
+import importlib
+import itertools
+import functools
+import threading
+import multiprocessing
+from collections.abc import Mapping
+from concurrent.futures import Future
+from multiprocessing.connection import wait
+
+import numpy as np
+
+
+# Tuples, sets, datetimes and dicts with non-string keys are tagged ({"__tuple__": [...]})
+# so a call through the pool reaches the region with the same types as an in-process call.
+_TAGS = {
+    "__tuple__": tuple,
+    "__set__": set,
+    "__frozenset__": frozenset,
+    "__datetime__": datetime.datetime.fromisoformat,
+    "__date__": datetime.date.fromisoformat,
+    "__items__": dict,
+}
+
+
+def _tag(value, where="message"):
+    """
+    Copy of `value` with the types JSON can't keep replaced by tagged dicts.
+    NumPy values become plain numbers/lists and mapping views become dicts; anything
+    else raises a TypeError naming `where` (the region method being called).
+    """
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if isinstance(value, np.generic):
+        return _tag(value.item(), where)
+    if isinstance(value, np.ndarray):
+        return _tag(value.tolist(), where)
+    if isinstance(value, Mapping):
+        if all(isinstance(key, str) for key in value):
+            return {key: _tag(item, where) for key, item in value.items()}
+        return {"__items__": [[_tag(key, where), _tag(item, where)] for key, item in value.items()]}
+    if isinstance(value, list):
+        return [_tag(item, where) for item in value]
+    if isinstance(value, tuple):
+        return {"__tuple__": [_tag(item, where) for item in value]}
+    if isinstance(value, frozenset):
+        return {"__frozenset__": [_tag(item, where) for item in value]}
+    if isinstance(value, set):
+        return {"__set__": [_tag(item, where) for item in value]}
+    if isinstance(value, datetime.datetime):
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, datetime.date):
+        return {"__date__": value.isoformat()}
+    raise TypeError(f"{where}: {type(value).__name__} values can't be sent through the worker pool")
+
+
+def _untag(obj):
+    if len(obj) == 1:
+        (key, value), = obj.items()
+        decode = _TAGS.get(key)
+        if decode is not None:
+            return decode(value)
+    return obj
+
+
+def encode_message(message, where="message"):
+    return json.dumps(_tag(message, where), separators=(",", ":")).encode("utf-8")
+
+
+def decode_message(raw):
+    return json.loads(raw.decode("utf-8"), object_hook=_untag)
+
+
+def _worker_main(conn, region_specs, log_file):
+    """Worker process loop: build regions on first use and serve JSON requests until told to stop."""
+    from utils.logger import ErrorLogger
+
+    logger = ErrorLogger(log_file, max_bytes=None, rotate_interval=None)  # The orchestrator's logger rotates the shared file
+    instances = {}
+    while True:
+        try:
+            raw = conn.recv_bytes()
+        except (EOFError, OSError):
+            break
+        message = decode_message(raw)
+        if message.get("op") == "stop":
+            break
+
+        request_id = message["id"]
+        region = message["region"]
+        try:
+            instance = instances.get(region)
+            if instance is None:
+                spec = region_specs[region]
+                region_class = getattr(importlib.import_module(spec["module"]), spec["class"])
+                instance = instances[region] = region_class(logger=logger, **spec.get("kwargs", {}))
+            method = getattr(instance, message["method"], None)
+            if method is None:
+                raise ValueError(f"Task {message['method']} not found for Agent {region}.")
+            response = {"id": request_id, "ok": True, "result": method(*message["args"], **message["kwargs"])}
+        except Exception as e:
+            response = {"id": request_id, "ok": False, "error": f"{type(e).__name__}: {e}"}
+        try:
+            payload = encode_message(response, f"Result of {region}.{message['method']}")
+        except TypeError as e:
+            payload = encode_message({"id": request_id, "ok": False, "error": f"TypeError: {e}"})
+        conn.send_bytes(payload)
+    for region, instance in instances.items():  # Persist state as Orchestrator.shutdown does for in-process regions
+        for name in ("flush_graph", "close"):
+            method = getattr(instance, name, None)
+            if callable(method):
+                try:
+                    method()
+                except Exception as e:
+                    logger.log_error(region, "Worker failed to %s: %s", name, e, operation=name)
+    conn.close()
+    logger.close()  # Worker processes exit without running atexit handlers
+
+
+class RegionProxy:
+    """Stand-in for a region served by the pool: method calls are forwarded to its worker (attributes are not)."""
+
+    def __init__(self, pool, region):
+        self.pool = pool
+        self.region = region
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return functools.partial(self.pool.call, self.region, name)
+
+    def __repr__(self):
+        return f"<RegionProxy {self.region}>"
+
+
+class WorkerPool:
+    """
+    Runs memory regions in worker processes so CPU-heavy calls don't block the orchestrator.
+
+    Calls are sharded either by target region (one worker owns each region, which
+    keeps in-memory state such as the association graph consistent) or by a hash
+    of the region and first argument, which opens a copy of the region in every
+    worker and only suits regions whose state lives entirely in a shared store.
+    Requests and results travel as JSON over pipes; nothing is pickled. A worker
+    that dies is restarted and its in-flight calls fail with a RuntimeError.
+
+    Workers are started with `spawn` by default: forking a process whose logger,
+    metrics and recall threads are running can leave a child holding a lock.
+    Spawned workers re-import the starting script, so it needs a __main__ guard.
+    """
+
+    def __init__(self, region_specs, num_workers=None, shard_by=None, log_file="logs/system_log.txt", start_method="spawn"):
+        self.region_specs = region_specs  # region -> {"module", "class", "kwargs"}
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.shard_by = shard_by or {}  # region -> "region" or "key"
+        self.log_file = log_file
+        self.context = multiprocessing.get_context(start_method)
+        self.processes = [None] * self.num_workers
+        self.connections = [None] * self.num_workers
+        self.send_locks = [threading.Lock() for _ in range(self.num_workers)]
+        self.pending = {}  # request id -> (future, worker index)
+        self.lock = threading.Lock()
+        self.request_ids = itertools.count()
+        self.restarts = 0
+        self.running = False
+        self.collector = None
+
+    @property
+    def regions(self):
+        return self.region_specs.keys()
+
+    def proxy(self, region):
+        return RegionProxy(self, region)
+
+    def start(self):
+        """Spawn the worker processes and the result collector thread."""
+        for index in range(self.num_workers):
+            self._spawn(index)
+        self.running = True
+        self.collector = threading.Thread(target=self._collect, name="worker-pool-collector", daemon=True)
+        self.collector.start()
+
+    def _spawn(self, index):
+        parent_conn, child_conn = self.context.Pipe()
+        process = self.context.Process(
+            target=_worker_main,
+            args=(child_conn, self.region_specs, self.log_file),
+            name=f"elliot-worker-{index}",
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        self.processes[index] = process
+        self.connections[index] = parent_conn
+
+    def shard_for(self, region, args):
+        """Pick the worker index for a call."""
+        key = region
+        if self.shard_by.get(region) == "key" and args:
+            key = f"{region}:{args[0]}"
+        return zlib.crc32(key.encode("utf-8")) % self.num_workers
+
+    def submit(self, region, method, *args, **kwargs):
+        """Send a call to the owning worker and return a Future for its result."""
+        if region not in self.region_specs:
+            raise ValueError(f"Agent {region} is not served by the worker pool.")
+        future = Future()
+        request_id = next(self.request_ids)
+        payload = encode_message(
+            {"id": request_id, "region": region, "method": method, "args": args, "kwargs": kwargs},
+            f"Arguments to {region}.{method}",
+        )
+        index = self.shard_for(region, args)
+        with self.lock:
+            self.pending[request_id] = (future, index)
+        try:
+            with self.send_locks[index]:
+                self.connections[index].send_bytes(payload)
+        except (OSError, ValueError) as e:
+            with self.lock:
+                self.pending.pop(request_id, None)
+            future.set_exception(RuntimeError(f"Worker {index} unavailable: {e}"))
+        return future
+
+    def call(self, region, method, *args, timeout=None, **kwargs):
+        """Submit a call and wait for its result."""
+        return self.submit(region, method, *args, **kwargs).result(timeout=timeout)
+
+    def _collect(self):
+        while self.running:
+            by_conn = {self.connections[i]: i for i in range(self.num_workers)}
+            by_sentinel = {self.processes[i].sentinel: i for i in range(self.num_workers)}
+            for ready in wait(list(by_conn) + list(by_sentinel), timeout=0.5):
+                if ready in by_conn:
+                    self._receive(ready)
+                elif self.running:
+                    self._restart(by_sentinel[ready])
+
+    def _receive(self, conn):
+        try:
+            response = decode_message(conn.recv_bytes())
+        except (EOFError, OSError):
+            return  # The worker died; its sentinel triggers the restart
+        with self.lock:
+            entry = self.pending.pop(response["id"], None)
+        if entry is None:
+            return
+        future = entry[0]
+        if response["ok"]:
+            future.set_result(response["result"])
+        else:
+            future.set_exception(RuntimeError(response["error"]))
+
+    def _restart(self, index):
+        """Replace a dead worker and fail the calls it was handling."""
+        with self.lock:
+            lost = [rid for rid, (_, worker) in self.pending.items() if worker == index]
+            futures = [self.pending.pop(rid)[0] for rid in lost]
+        exitcode = self.processes[index].exitcode
+        for future in futures:
+            future.set_exception(RuntimeError(f"Worker {index} crashed (exit code {exitcode})."))
+        self.connections[index].close()
+        with self.send_locks[index]:
+            self._spawn(index)
+        self.restarts += 1
+
+    def stats(self):
+        with self.lock:
+            in_flight = len(self.pending)
+        return {
+            "workers": self.num_workers,
+            "alive": sum(1 for p in self.processes if p is not None and p.is_alive()),
+            "in_flight": in_flight,
+            "restarts": self.restarts,
+        }
+
+    def stop(self, timeout=5):
+        """Ask workers to exit, then terminate any that don't."""
+        self.running = False
+        if self.collector is not None:
+            self.collector.join(timeout)
+        for index, conn in enumerate(self.connections):
+            if conn is None:
+                continue
+            try:
+                conn.send_bytes(encode_message({"op": "stop"}))
+            except (OSError, ValueError):
+                pass
+        for process in self.processes:
+            if process is None:
+                continue
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+        for conn in self.connections:
+            if conn is not None:
+                conn.close()
+        with self.lock:
+            futures = [future for future, _ in self.pending.values()]
+            self.pending.clear()
+        for future in futures:
+            future.set_exception(RuntimeError("Worker pool stopped."))